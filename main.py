@@ -1,10 +1,12 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from src.web.auth.auth_middlewares import AuthMiddleware
 from src.infrastructure.config.application_container import AplicationContainer
 from starlette.middleware.cors import CORSMiddleware
 import src.web.auth.auth_router as auth_router
-# import src.web.stock.stock_router as stock_router
-# import src.web.stock.stock_ws as stock_ws
+import src.web.stock.stock_router as stock_router
+import src.web.stock.stock_ws as stock_ws
+import src.web.portfolio.portfolio_router as portfolio_router
 from src.infrastructure.utils.class_object import singleton
 
 
@@ -20,7 +22,7 @@ class AppCreator:
         db.create_database()
 
         # set app default
-        self.app = FastAPI()
+        self.app = FastAPI(lifespan=self.lifespan)
 
         # set cors
         if self.settings.CORS_ORIGINS:
@@ -40,9 +42,35 @@ class AppCreator:
         def root():
             return "service is working"
         
-        # self.app.include_router(stock_router.router)
-        # self.app.include_router(stock_ws.router)
+        self.app.include_router(stock_router.router)
+        self.app.include_router(stock_ws.router)
         self.app.include_router(auth_router.router)
+        self.app.include_router(portfolio_router.router)
+
+    @asynccontextmanager
+    async def lifespan(self, app: FastAPI):
+        # open the pooled http clients once and share them for the app lifetime
+        stock_api = self.container.stock_api()
+        historic_stock_api = self.container.historic_stock_api()
+        # the trade feed pushes prices to the hub; disabled it falls back to polling
+        stock_price_ingest = self.container.stock_price_ingest()
+        # with several workers or nodes the broker elects one producer per symbol
+        quote_broker = self.container.quote_broker()
+        symbol_shard_coordinator = self.container.symbol_shard_coordinator()
+        await stock_api.start()
+        await historic_stock_api.start()
+        await quote_broker.start()
+        await stock_price_ingest.start()
+        await symbol_shard_coordinator.start()
+        try:
+            yield
+        finally:
+            await symbol_shard_coordinator.stop()
+            await self.container.poll_scheduler().stop()
+            await stock_price_ingest.stop()
+            await quote_broker.stop()
+            await stock_api.close()
+            await historic_stock_api.close()
 
 
 app_creator = AppCreator()
@@ -0,0 +1,30 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from src.domain.entities.portfolio_entities import PositionEntity, Transaction
+
+class PortfolioValuationRequest(BaseModel):
+    transactions: List[Transaction] = Field(min_length=1)
+    group_by: str = "day"
+    to_timestamp: Optional[int] = None
+
+class LedgerTransactionsRequest(BaseModel):
+    transactions: List[Transaction] = Field(min_length=1)
+
+class LedgerImportResponse(BaseModel):
+    imported: int
+
+class PositionsResponse(BaseModel):
+    positions: List[PositionEntity]
+    errors: Dict[str, str]
+
+class PortfolioValuationResponse(BaseModel):
+    group_by: str
+    timestamp: List[int]
+    market_value: List[float]
+    cost_basis: List[float]
+    realized_pnl: List[float]
+    unrealized_pnl: List[float]
+    returns: List[float]
+    time_weighted_return: List[float]
+    positions: List[PositionEntity]
+    errors: Dict[str, str]
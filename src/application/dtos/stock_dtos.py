@@ -0,0 +1,37 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from src.domain.entities.stock_entities import StockQuote
+
+class BatchQuotesRequest(BaseModel):
+    symbols: List[str]
+
+class BatchQuotesResponse(BaseModel):
+    quotes: Dict[str, StockQuote]
+    errors: Dict[str, str]
+
+class BarSeriesResponse(BaseModel):
+    symbol: str
+    group_by: str
+    multiplier: int
+    timestamp: List[int]
+    open: List[float]
+    high: List[float]
+    low: List[float]
+    close: List[float]
+    volume: List[float]
+
+class HistoricMatrixResponse(BaseModel):
+    group_by: str
+    multiplier: int
+    column: str
+    symbols: List[str]
+    timestamp: List[int]
+    values: List[List[Optional[float]]]
+    errors: Dict[str, str]
+
+class IndicatorsResponse(BaseModel):
+    symbol: str
+    group_by: str
+    multiplier: int
+    timestamp: List[int]
+    indicators: Dict[str, List[Optional[float]]]
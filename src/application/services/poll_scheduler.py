@@ -0,0 +1,205 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from src.infrastructure.utils.logger import setup_logger
+from src.infrastructure.utils.market_calendar import MarketCalendar, MarketSession
+
+logger = setup_logger("PollScheduler")
+
+PollHandler = Callable[[str], Awaitable[None]]
+
+# movimiento medio entre polls (0.1%) para el que se usa el intervalo base
+REFERENCE_VOLATILITY = 0.001
+VOLATILITY_ALPHA = 0.2
+EXTENDED_HOURS_FACTOR = 2.0
+
+
+class PollScheduler:
+    """
+    Planificador único para el polling de todos los símbolos. \n
+    Un heap ordenado por próxima ejecución y una sola tarea que lo despacha
+    sustituyen a una corrutina dormida por símbolo. El intervalo de cada
+    símbolo sale de la sesión de mercado, de cuántos clientes lo miran y de
+    su volatilidad observada, acotado entre `min_interval` y `max_interval`;
+    con el mercado cerrado se usa `closed_interval`, sin pasar de la
+    próxima apertura.
+    """
+
+    def __init__(
+        self,
+        calendar: MarketCalendar,
+        base_interval: float = 30.0,
+        min_interval: float = 5.0,
+        max_interval: float = 120.0,
+        closed_interval: float = 900.0,
+        max_concurrency: int = 20
+    ):
+        self.calendar = calendar
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.closed_interval = closed_interval
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._handler: Optional[PollHandler] = None
+
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._sequence = itertools.count()
+        self._generations: Dict[str, int] = {}
+        self._subscribers: Dict[str, int] = {}
+        self._last_prices: Dict[str, float] = {}
+        self._volatility: Dict[str, float] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._changed = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+
+        self.polls = 0
+        self.max_lag = 0.0
+
+
+    def set_handler(self, handler: PollHandler):
+        self._handler = handler
+
+
+    def add(self, symbol: str):
+        """
+        Schedules `symbol` right away, replacing any pending run
+        """
+        self._generations[symbol] = self._generations.get(symbol, 0) + 1
+        self._push(symbol, 0)
+        self._ensure_runner()
+
+
+    def remove(self, symbol: str):
+        # las entradas del heap con una generación vieja se descartan al salir
+        self._generations.pop(symbol, None)
+        self._subscribers.pop(symbol, None)
+        self._last_prices.pop(symbol, None)
+        self._volatility.pop(symbol, None)
+        running = self._running.pop(symbol, None)
+        if running is not None and running is not asyncio.current_task():
+            running.cancel()
+
+
+    def set_subscribers(self, symbol: str, subscribers: int):
+        self._subscribers[symbol] = subscribers
+
+
+    def observe(self, symbol: str, price: float):
+        """
+        Updates the exponentially weighted mean of the absolute log
+        returns of `symbol` between polls
+        """
+        last_price = self._last_prices.get(symbol)
+        self._last_prices[symbol] = price
+        if not last_price or price <= 0:
+            return
+        change = abs(math.log(price / last_price))
+        volatility = self._volatility.get(symbol)
+        self._volatility[symbol] = change if volatility is None else (
+            VOLATILITY_ALPHA * change + (1 - VOLATILITY_ALPHA) * volatility
+        )
+
+
+    def interval(self, symbol: str, now: Optional[datetime] = None) -> float:
+        """
+        Returns the seconds until the next poll of `symbol`
+        """
+        now = now or datetime.now(timezone.utc)
+        session = self.calendar.session(now)
+        if session is MarketSession.CLOSED:
+            # despierta a la apertura aunque falte menos que `closed_interval`
+            until_open = (self.calendar.next_open(now) - now).total_seconds()
+            return min(self.closed_interval, max(0.0, until_open))
+
+        interval = self.base_interval
+        if session is not MarketSession.REGULAR:
+            interval *= EXTENDED_HOURS_FACTOR
+
+        # x1 con un cliente, /2 con 10, /4 con 1000
+        interval /= 1 + math.log10(max(1, self._subscribers.get(symbol, 1)))
+
+        volatility = self._volatility.get(symbol)
+        if volatility:
+            interval *= min(2.0, max(0.5, REFERENCE_VOLATILITY / volatility))
+
+        return min(self.max_interval, max(self.min_interval, interval))
+
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            self._runner = None
+        for task in self._running.values():
+            task.cancel()
+        self._running.clear()
+
+
+    def _push(self, symbol: str, delay: float):
+        heapq.heappush(self._heap, (
+            time.monotonic() + delay,
+            next(self._sequence),
+            symbol,
+            self._generations[symbol]
+        ))
+        self._changed.set()
+
+
+    def _ensure_runner(self):
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+
+    async def _run(self):
+        while True:
+            self._changed.clear()
+            if not self._heap:
+                await self._changed.wait()
+                continue
+
+            due, _, symbol, generation = self._heap[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                # un símbolo nuevo puede adelantarse a la cabeza del heap
+                try:
+                    await asyncio.wait_for(self._changed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            if self._generations.get(symbol) != generation or symbol in self._running:
+                continue
+            self.max_lag = max(self.max_lag, -delay)
+            self._running[symbol] = asyncio.create_task(self._execute(symbol, generation))
+
+
+    async def _execute(self, symbol: str, generation: int):
+        try:
+            async with self._semaphore:
+                if self._handler is not None and self._generations.get(symbol) == generation:
+                    self.polls += 1
+                    await self._handler(symbol)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Poll of %s failed: %s", symbol, e)
+        finally:
+            if self._running.get(symbol) is asyncio.current_task():
+                del self._running[symbol]
+            if self._generations.get(symbol) == generation:
+                self._push(symbol, self.interval(symbol))
+
+
+    @property
+    def metrics(self) -> Dict[str, object]:
+        return {
+            "symbols": len(self._generations),
+            "running": len(self._running),
+            "polls": self.polls,
+            "max_lag_ms": int(self.max_lag * 1000),
+            "session": self.calendar.session().value,
+        }
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from typing import BinaryIO, List, Optional
+from fastapi import HTTPException
+from src.application.dtos.portfolio_dtos import PortfolioValuationResponse, PositionsResponse
+from src.application.services.stock_service import StockService
+from src.domain.entities.portfolio_entities import LedgerSnapshot, PositionEntity, Transaction
+from src.domain.repositories.i_ledger_repository import ILedgerRepository
+from src.infrastructure.utils.broker_csv import read_broker_csv
+from src.infrastructure.utils.portfolio_valuation import apply_transactions, value_portfolio
+
+
+class PortfolioService:
+    """
+    Valoración de carteras sobre la matriz de cierres cacheada de sus
+    símbolos: un solo cálculo vectorizado para todas las posiciones. \n
+    El ledger de cada usuario guarda sus transacciones; las posiciones
+    actuales parten de la última foto y solo aplican lo posterior a ella.
+    """
+
+    def __init__(
+        self,
+        stock_service: StockService,
+        ledger_repository: ILedgerRepository,
+        max_symbols: int = 200,
+        snapshot_interval: int = 500
+    ):
+        self._stock_service = stock_service
+        self._ledger_repository = ledger_repository
+        self._max_symbols = max_symbols
+        self._snapshot_interval = snapshot_interval
+
+
+    async def add_transactions(self, user_id: str, transactions: List[Transaction]) -> int:
+        return await asyncio.to_thread(self._ledger_repository.add_transactions, user_id, transactions)
+
+
+    async def import_csv(self, user_id: str, file: BinaryIO) -> int:
+        """
+        Imports a broker CSV export into the ledger of a user, streaming the
+        rows into batched inserts. An invalid row rejects the whole file
+        """
+        try:
+            return await asyncio.to_thread(
+                self._ledger_repository.add_transactions,
+                user_id,
+                read_broker_csv(file)
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+
+    async def get_positions(self, user_id: str) -> PositionsResponse:
+        """
+        Current holdings and P&L of a user valued at the latest quotes \n
+        Replays only the transactions stored after the last snapshot and
+        takes a new snapshot once `snapshot_interval` of them pile up
+        """
+        snapshot = await asyncio.to_thread(self._ledger_repository.get_snapshot, user_id)
+        positions = {position.symbol: position for position in snapshot.positions} if snapshot else {}
+        entries = await asyncio.to_thread(
+            self._ledger_repository.get_entries,
+            user_id,
+            snapshot.last_transaction_id if snapshot else 0
+        )
+        apply_transactions(positions, entries)
+
+        if len(entries) >= self._snapshot_interval:
+            await asyncio.to_thread(
+                self._ledger_repository.save_snapshot,
+                user_id,
+                LedgerSnapshot(
+                    last_transaction_id=max(entry.id for entry in entries),
+                    timestamp=entries[-1].timestamp,
+                    positions=list(positions.values())
+                )
+            )
+
+        held = [symbol for symbol, position in positions.items() if position.quantity > 0]
+        quotes = await self._stock_service.get_current_stock_prices(held) if held else None
+        response = PositionsResponse(positions=[], errors=dict(quotes.errors) if quotes else {})
+        for symbol, position in sorted(positions.items()):
+            quote = quotes.quotes.get(symbol) if quotes else None
+            # una posición cerrada vale cero aunque no haya cotización
+            market_value = position.quantity * quote.price if quote else (0.0 if not position.quantity else None)
+            response.positions.append(PositionEntity(
+                symbol=symbol,
+                quantity=position.quantity,
+                cost_basis=position.cost_basis,
+                market_value=market_value,
+                realized_pnl=position.realized_pnl,
+                unrealized_pnl=None if market_value is None else market_value - position.cost_basis
+            ))
+        return response
+
+
+    async def value_transactions(
+        self,
+        transactions: List[Transaction],
+        group_by: str = "day",
+        to_timestamp: Optional[int] = None
+    ) -> PortfolioValuationResponse:
+        """
+        Values a portfolio from its first transaction until `to_timestamp`
+        (now by default), one point per `group_by` bar \n
+        Returns the value, cost basis, P&L and returns series plus the
+        positions at the last bar
+        """
+        symbols = list(dict.fromkeys(item.symbol.strip().upper() for item in transactions))
+        if len(symbols) > self._max_symbols:
+            raise HTTPException(status_code=400, detail=f"Too many symbols, max {self._max_symbols}")
+
+        from_timestamp = min(item.timestamp for item in transactions)
+        to_timestamp = to_timestamp or int(time.time() * 1000)
+        prices = await self._stock_service.get_historic_matrix(
+            symbols,
+            from_timestamp,
+            to_timestamp,
+            group_by
+        )
+        valuation = value_portfolio(transactions, prices)
+
+        return PortfolioValuationResponse(
+            group_by=group_by,
+            timestamp=valuation.timestamp.tolist(),
+            market_value=valuation.market_value.tolist(),
+            cost_basis=valuation.cost_basis.tolist(),
+            realized_pnl=valuation.realized_pnl.tolist(),
+            unrealized_pnl=valuation.unrealized_pnl.tolist(),
+            returns=valuation.returns.tolist(),
+            time_weighted_return=valuation.time_weighted_return.tolist(),
+            positions=valuation.positions,
+            errors=prices.errors
+        )
@@ -0,0 +1,261 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from src.application.services.poll_scheduler import PollScheduler
+from src.application.services.stock_price_ingest import StockPriceIngest
+from src.domain.brokers.i_quote_broker import IQuoteBroker
+from src.domain.entities.stock_entities import StockQuote
+from src.domain.repositories.i_stock_repository import IStockRepository
+from src.infrastructure.data_sources.broker.in_process_quote_broker import InProcessQuoteBroker
+from src.infrastructure.data_sources.http.rate_limiter import RequestPriority, request_priority
+from src.infrastructure.utils.logger import setup_logger
+from src.infrastructure.utils.market_calendar import MarketCalendar
+
+logger = setup_logger("StockPriceHub")
+
+StockPriceSubscriber = Callable[[str, StockQuote], Awaitable[None]]
+
+
+class StockPriceHub:
+    """
+    Hub de suscripciones compartido por todo el proceso. \n
+    Programa en el `poll_scheduler` un único polling por símbolo con
+    suscriptores, reparte cada actualización a todos ellos y lo retira cuando
+    se va el último. \n
+    Si hay un feed de trades activo los precios llegan por push y el polling
+    solo consulta la API cuando el feed lleva un intervalo sin datos. \n
+    Los precios pasan siempre por el `quote_broker`: con varios workers o nodos
+    solo el que tiene el lease del símbolo lo consulta y publica, y cada uno
+    reparte lo recibido entre sus sockets locales. Con sharding (`assign`) el
+    nodo consulta los símbolos que le asigna el anillo en vez de pedir leases.
+    """
+
+    def __init__(
+        self,
+        stock_repository: IStockRepository,
+        poll_interval: float = 30.0,
+        stock_price_ingest: Optional[StockPriceIngest] = None,
+        quote_broker: Optional[IQuoteBroker] = None,
+        producer_lease: Optional[float] = None,
+        producer_lease_min: float = 15.0,
+        producer_lease_max: float = 120.0,
+        poll_scheduler: Optional[PollScheduler] = None
+    ):
+        self._stock_repository = stock_repository
+        self.poll_interval = poll_interval
+        self._quote_broker = quote_broker or InProcessQuoteBroker()
+        self.producer_lease = producer_lease
+        self.producer_lease_min = producer_lease_min
+        self.producer_lease_max = producer_lease_max
+        self._poll_scheduler = poll_scheduler or PollScheduler(MarketCalendar(), base_interval=poll_interval)
+        self._poll_scheduler.set_handler(self._poll)
+        self._producing: Set[str] = set()
+        self._assigned: Optional[Set[str]] = None
+        self._demand_listener: Optional[Callable[[], None]] = None
+        self._stock_price_ingest = stock_price_ingest
+        if stock_price_ingest is not None:
+            stock_price_ingest.set_publisher(self.publish)
+        self._subscribers: Dict[str, Set[StockPriceSubscriber]] = {}
+        self._pollers: Set[str] = set()
+        self._last_quotes: Dict[str, StockQuote] = {}
+
+        self.polls = 0
+        self.followed_polls = 0
+        self.skipped_polls = 0
+        self.pushed = 0
+        self.deliveries = 0
+        self.failed_deliveries = 0
+
+
+    @property
+    def local_symbols(self) -> List[str]:
+        return sorted(self._subscribers)
+
+
+    def set_demand_listener(self, listener: Callable[[], None]):
+        """
+        Registers a callback run whenever `local_symbols` changes
+        """
+        self._demand_listener = listener
+
+
+    async def assign(self, symbols: Iterable[str]):
+        """
+        Switches to sharded production: this node polls exactly `symbols`,
+        whether or not it has local subscribers for them
+        """
+        self._assigned = set(symbols)
+        await self._sync_pollers()
+
+
+    async def subscribe(self, symbol: str, subscriber: StockPriceSubscriber):
+        symbol = symbol.upper()
+        subscribers = self._subscribers.get(symbol)
+
+        if subscribers is None:
+            self._subscribers[symbol] = {subscriber}
+            self._poll_scheduler.set_subscribers(symbol, 1)
+            await self._quote_broker.subscribe(symbol, self._on_quote)
+            await self._sync_pollers()
+            self._demand_changed()
+        else:
+            subscribers.add(subscriber)
+            self._poll_scheduler.set_subscribers(symbol, len(subscribers))
+            if symbol in self._last_quotes:
+                # el nuevo suscriptor recibe el último precio sin esperar al próximo tick
+                await self._deliver(symbol, subscriber, self._last_quotes[symbol])
+
+
+    async def unsubscribe(self, symbol: str, subscriber: StockPriceSubscriber):
+        symbol = symbol.upper()
+        subscribers = self._subscribers.get(symbol)
+        if subscribers is None:
+            return
+
+        subscribers.discard(subscriber)
+        self._poll_scheduler.set_subscribers(symbol, len(subscribers))
+        if not subscribers:
+            self._subscribers.pop(symbol, None)
+            self._last_quotes.pop(symbol, None)
+            await self._quote_broker.unsubscribe(symbol, self._on_quote)
+            await self._sync_pollers()
+            self._demand_changed()
+
+
+    async def publish(self, symbol: str, quote: StockQuote):
+        """
+        Publishes a quote pushed by the trade feed through the broker \n
+        Only the producer of `symbol` publishes, other quotes are ignored
+        """
+        if symbol not in self._producing:
+            return
+        self.pushed += 1
+        await self._quote_broker.publish(symbol, quote)
+
+
+    async def _on_quote(self, symbol: str, quote: StockQuote):
+        if symbol not in self._subscribers:
+            return
+        self._last_quotes[symbol] = quote
+        await self._publish(symbol, quote)
+
+
+    def _demand_changed(self):
+        if self._demand_listener is not None:
+            self._demand_listener()
+
+
+    def _wanted(self) -> Set[str]:
+        # sin sharding cada nodo intenta producir lo que piden sus clientes
+        # y el lease decide; con sharding produce lo que le asigna el anillo
+        return set(self._subscribers) if self._assigned is None else self._assigned
+
+
+    async def _sync_pollers(self):
+        wanted = self._wanted()
+        for symbol in wanted - self._pollers:
+            self._pollers.add(symbol)
+            self._poll_scheduler.add(symbol)
+            logger.info("Polling started for %s", symbol)
+            if self._stock_price_ingest is not None:
+                await self._stock_price_ingest.subscribe(symbol)
+
+        for symbol in self._pollers - wanted:
+            await self._stop(symbol)
+
+
+    async def _stop(self, symbol: str):
+        self._producing.discard(symbol)
+        self._pollers.discard(symbol)
+        self._poll_scheduler.remove(symbol)
+        logger.info("Polling stopped for %s", symbol)
+
+        await self._quote_broker.release_producer(symbol)
+        if self._stock_price_ingest is not None:
+            await self._stock_price_ingest.unsubscribe(symbol)
+
+
+    async def _is_producer(self, symbol: str) -> bool:
+        if self._assigned is not None:
+            return symbol in self._assigned
+        return await self._quote_broker.acquire_producer(symbol, self._producer_lease(symbol))
+
+
+    def _producer_lease(self, symbol: str) -> float:
+        if self.producer_lease:
+            return self.producer_lease
+        # el lease sobrevive a un par de polls perdidos antes de cambiar de productor;
+        # acotado porque justo antes de la apertura el intervalo tiende a cero y
+        # con el mercado cerrado un nodo caído retendría el símbolo demasiado
+        lease = self._poll_scheduler.interval(symbol) * 3
+        return min(max(lease, self.producer_lease_min), self.producer_lease_max)
+
+
+    async def _poll(self, symbol: str):
+        if not await self._is_producer(symbol):
+            # otro nodo produce el símbolo: aquí solo se reparte
+            self._producing.discard(symbol)
+            self.followed_polls += 1
+        elif self._is_pushed(symbol):
+            # el feed ya trae el precio: el polling queda como respaldo
+            self._producing.add(symbol)
+            self.skipped_polls += 1
+        else:
+            self._producing.add(symbol)
+            quote = await self._fetch(symbol)
+            if quote is not None:
+                self._poll_scheduler.observe(symbol, quote.price)
+                await self._quote_broker.publish(symbol, quote)
+
+
+    def _is_pushed(self, symbol: str) -> bool:
+        return (
+            self._stock_price_ingest is not None and
+            self._stock_price_ingest.is_fresh(symbol, self._poll_scheduler.interval(symbol))
+        )
+
+
+    async def _fetch(self, symbol: str) -> Optional[StockQuote]:
+        self.polls += 1
+        try:
+            # el polling cede el paso a las llamadas interactivas; la cotización
+            # se pide siempre arriba (el caché podría devolver la de la vuelta
+            # anterior) y queda cacheada para las lecturas interactivas
+            with request_priority(RequestPriority.BACKGROUND):
+                return await self._stock_repository.refresh_current_stock_price(symbol)
+        except Exception as e:
+            logger.warning("Polling %s failed: %s", symbol, e)
+            return None
+
+
+    async def _publish(self, symbol: str, quote: StockQuote):
+        subscribers = list(self._subscribers.get(symbol, ()))
+        await asyncio.gather(*[
+            self._deliver(symbol, subscriber, quote) for subscriber in subscribers
+        ])
+
+
+    async def _deliver(self, symbol: str, subscriber: StockPriceSubscriber, quote: StockQuote):
+        try:
+            await subscriber(symbol, quote)
+            self.deliveries += 1
+        except Exception as e:
+            # un suscriptor roto (socket cerrado) se da de baja
+            self.failed_deliveries += 1
+            logger.info("Dropping subscriber of %s: %s", symbol, e)
+            await self.unsubscribe(symbol, subscriber)
+
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "symbols": len(self._subscribers),
+            "pollers": len(self._pollers),
+            "producing": len(self._producing),
+            "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            "polls": self.polls,
+            "followed_polls": self.followed_polls,
+            "skipped_polls": self.skipped_polls,
+            "pushed": self.pushed,
+            "deliveries": self.deliveries,
+            "failed_deliveries": self.failed_deliveries,
+        }
@@ -0,0 +1,197 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional, Set
+from src.domain.entities.stock_entities import StockBar, StockQuote
+from src.infrastructure.data_sources.ws.trade_feed_client import TradeFeedClient
+from src.infrastructure.utils.logger import setup_logger
+
+logger = setup_logger("StockPriceIngest")
+
+StockPricePublisher = Callable[[str, StockQuote], Awaitable[None]]
+
+BAR_MILLISECONDS = 60_000
+
+
+@dataclass(slots=True)
+class TradeState:
+    """
+    Estado acumulado de los trades de un símbolo: último precio, OHLC de la
+    sesión (desde la suscripción) y la barra del minuto en curso
+    """
+    price: float
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    volume: float
+    bar_start: int
+    bar_open: float
+    bar_high: float
+    bar_low: float
+    bar_volume: float
+    received_at: float
+
+    def fold(self, price: float, volume: float, timestamp: int):
+        self.price = price
+        self.timestamp = max(self.timestamp, timestamp)
+        self.high = max(self.high, price)
+        self.low = min(self.low, price)
+        self.volume += volume
+        self.received_at = time.monotonic()
+
+        bar_start = timestamp - timestamp % BAR_MILLISECONDS
+        if bar_start > self.bar_start:
+            self.bar_start = bar_start
+            self.bar_open = self.bar_high = self.bar_low = price
+            self.bar_volume = volume
+        else:
+            self.bar_high = max(self.bar_high, price)
+            self.bar_low = min(self.bar_low, price)
+            self.bar_volume += volume
+
+    def to_quote(self) -> StockQuote:
+        return StockQuote(
+            price=self.price,
+            timestamp=datetime.fromtimestamp(self.timestamp / 1000)
+        )
+
+    def to_bar(self) -> StockBar:
+        return StockBar(
+            timestamp=self.bar_start,
+            open=self.bar_open,
+            high=self.bar_high,
+            low=self.bar_low,
+            close=self.price,
+            volume=self.bar_volume
+        )
+
+    @classmethod
+    def first(cls, price: float, volume: float, timestamp: int) -> "TradeState":
+        return cls(
+            price=price,
+            timestamp=timestamp,
+            open=price,
+            high=price,
+            low=price,
+            volume=volume,
+            bar_start=timestamp - timestamp % BAR_MILLISECONDS,
+            bar_open=price,
+            bar_high=price,
+            bar_low=price,
+            bar_volume=volume,
+            received_at=time.monotonic()
+        )
+
+
+class StockPriceIngest:
+    """
+    Ingesta push de precios desde un feed de trades. \n
+    Pliega cada trade en el `TradeState` del símbolo y publica como mucho
+    una actualización por símbolo cada `publish_interval` segundos. \n
+    Con `enabled=False` no abre conexión y el hub sigue haciendo polling.
+    """
+
+    def __init__(
+        self,
+        trade_feed: TradeFeedClient,
+        enabled: bool = False,
+        publish_interval: float = 0.5
+    ):
+        self._trade_feed = trade_feed
+        self.enabled = enabled
+        self.publish_interval = publish_interval
+        self._states: Dict[str, TradeState] = {}
+        self._dirty: Set[str] = set()
+        self._publisher: Optional[StockPricePublisher] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._trade_feed.set_trade_handler(self._on_trade)
+
+        self.published = 0
+
+
+    def set_publisher(self, publisher: StockPricePublisher):
+        self._publisher = publisher
+
+
+    async def start(self):
+        if not self.enabled:
+            return
+        await self._trade_feed.start()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+
+    async def stop(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self._trade_feed.stop()
+
+
+    async def subscribe(self, symbol: str):
+        if self.enabled:
+            await self._trade_feed.subscribe(symbol)
+
+
+    async def unsubscribe(self, symbol: str):
+        if self.enabled:
+            await self._trade_feed.unsubscribe(symbol)
+            self._states.pop(symbol, None)
+            self._dirty.discard(symbol)
+
+
+    def snapshot(self, symbol: str) -> Optional[TradeState]:
+        return self._states.get(symbol)
+
+
+    def is_fresh(self, symbol: str, max_age: float) -> bool:
+        """
+        Returns `True` if the feed delivered a trade of `symbol` in the
+        last `max_age` seconds, so polling it is not needed
+        """
+        state = self._states.get(symbol)
+        return (
+            self.enabled and
+            self._trade_feed.connected and
+            state is not None and
+            time.monotonic() - state.received_at <= max_age
+        )
+
+
+    async def _on_trade(self, symbol: str, price: float, volume: float, timestamp: int):
+        state = self._states.get(symbol)
+        if state is None:
+            self._states[symbol] = TradeState.first(price, volume, timestamp)
+        else:
+            state.fold(price, volume, timestamp)
+        self._dirty.add(symbol)
+
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.publish_interval)
+            if not self._dirty or self._publisher is None:
+                continue
+
+            dirty, self._dirty = self._dirty, set()
+            for symbol in dirty:
+                state = self._states.get(symbol)
+                if state is None:
+                    continue
+                try:
+                    await self._publisher(symbol, state.to_quote())
+                    self.published += 1
+                except Exception as e:
+                    logger.warning("Publishing %s failed: %s", symbol, e)
+
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "enabled": int(self.enabled),
+            "symbols": len(self._states),
+            "published": self.published,
+            **{f"feed_{key}": value for key, value in self._trade_feed.metrics.items()},
+        }
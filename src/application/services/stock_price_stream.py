@@ -0,0 +1,192 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from src.application.services.stock_price_hub import StockPriceHub
+from src.domain.entities.stock_entities import StockQuote
+from src.infrastructure.data_sources.ws.websocket_sender import WebSocketSender
+from src.infrastructure.utils.indicators import IncrementalIndicators
+from src.infrastructure.utils.logger import setup_logger
+
+logger = setup_logger("StockPriceStream")
+
+IndicatorLoader = Callable[[str], Awaitable[IncrementalIndicators]]
+
+# los quotes no traen volumen: un VWAP en vivo quedaría congelado en el histórico
+LIVE_EXCLUDED_INDICATORS = ("vwap",)
+
+
+class StockPriceStream:
+    """
+    Multiplexa muchas suscripciones de precios sobre un solo websocket. \n
+    Las actualizaciones que llegan del hub se acumulan y se envían en un
+    único frame cada `batch_interval` segundos, con el último precio de
+    cada símbolo. Mientras el cliente no vacíe su cola de envío no se arma
+    un frame nuevo, así que uno lento recibe menos frames pero al día. \n
+    Los símbolos suscritos con indicadores mantienen un `IncrementalIndicators`
+    que cada precio actualiza en O(1); sus valores viajan en un frame
+    `indicators` junto al de quotes. El tracker se siembra en segundo plano
+    y el primer frame de indicadores sale cuando está listo.
+    """
+
+    def __init__(
+        self,
+        sender: WebSocketSender,
+        stock_price_hub: StockPriceHub,
+        batch_interval: float = 1.0,
+        max_symbols: int = 200,
+        indicator_loader: Optional[IndicatorLoader] = None
+    ):
+        self._sender = sender
+        self._stock_price_hub = stock_price_hub
+        self.batch_interval = batch_interval
+        self.max_symbols = max_symbols
+        self._symbols: Set[str] = set()
+        self._pending: Dict[str, StockQuote] = {}
+        self._indicator_loader = indicator_loader
+        self._trackers: Dict[str, IncrementalIndicators] = {}
+        self._loading: Dict[str, asyncio.Task] = {}
+        self._pending_indicators: Dict[str, Dict[str, Optional[float]]] = {}
+        self._has_pending = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._closed = False
+
+
+    @property
+    def symbols(self) -> List[str]:
+        return sorted(self._symbols)
+
+
+    @property
+    def indicator_symbols(self) -> List[str]:
+        return sorted(self._trackers.keys() | self._loading.keys())
+
+
+    async def subscribe(self, symbols: Iterable[str], indicators: bool = False) -> List[str]:
+        """
+        Subscribes to `symbols` up to `max_symbols` per connection, with
+        live indicators when `indicators` is set \n
+        Returns the symbols that were rejected because of the limit
+        """
+        rejected: List[str] = []
+        accepted: List[str] = []
+        for symbol in self._normalize(symbols):
+            if symbol in self._symbols:
+                accepted.append(symbol)
+                continue
+            if len(self._symbols) >= self.max_symbols:
+                rejected.append(symbol)
+                continue
+            self._symbols.add(symbol)
+            accepted.append(symbol)
+            await self._stock_price_hub.subscribe(symbol, self._on_quote)
+
+        if indicators and self._indicator_loader is not None:
+            for symbol in accepted:
+                if symbol not in self._trackers and symbol not in self._loading:
+                    # sembrar lee historia: no frena el bucle de recepción del socket
+                    self._loading[symbol] = asyncio.create_task(self._load_tracker(symbol))
+
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+        return rejected
+
+
+    async def unsubscribe(self, symbols: Iterable[str]):
+        for symbol in self._normalize(symbols):
+            if symbol not in self._symbols:
+                continue
+            self._symbols.discard(symbol)
+            self._pending.pop(symbol, None)
+            self._trackers.pop(symbol, None)
+            self._pending_indicators.pop(symbol, None)
+            loading = self._loading.pop(symbol, None)
+            if loading is not None:
+                loading.cancel()
+            await self._stock_price_hub.unsubscribe(symbol, self._on_quote)
+
+
+    def send(self, frame: Any):
+        """
+        Queues a control frame (replies, errors) behind the pending quotes
+        """
+        self._sender.offer(frame)
+
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        await self.unsubscribe(list(self._symbols))
+        if self._flusher is not None and self._flusher is not asyncio.current_task():
+            self._flusher.cancel()
+        await self._sender.close()
+
+
+    async def _load_tracker(self, symbol: str):
+        try:
+            tracker = await self._indicator_loader(symbol)
+        except Exception as e:
+            logger.warning("Could not seed indicators of %s: %s", symbol, e)
+            return
+        finally:
+            if self._loading.get(symbol) is asyncio.current_task():
+                del self._loading[symbol]
+
+        if symbol in self._symbols and not self._closed:
+            self._trackers[symbol] = tracker
+            self._pending_indicators[symbol] = self._live_values(tracker.values())
+            self._has_pending.set()
+
+
+    async def _on_quote(self, symbol: str, quote: StockQuote):
+        # no bloquea al hub: solo guarda el último precio hasta el próximo frame
+        if symbol in self._symbols:
+            self._pending[symbol] = quote
+            tracker = self._trackers.get(symbol)
+            if tracker is not None:
+                self._pending_indicators[symbol] = self._live_values(tracker.update(
+                    int(quote.timestamp.timestamp() * 1000),
+                    quote.price
+                ))
+            self._has_pending.set()
+
+
+    async def _flush_loop(self):
+        try:
+            while not self._closed:
+                await self._has_pending.wait()
+                await asyncio.sleep(self.batch_interval)
+                # con el cliente atrasado los precios se siguen pisando en `_pending`
+                await self._sender.drained()
+
+                pending, self._pending = self._pending, {}
+                indicators, self._pending_indicators = self._pending_indicators, {}
+                self._has_pending.clear()
+
+                if pending:
+                    self._sender.offer({
+                        "type": "quotes",
+                        "data": pending,
+                    }, key="quotes")
+                if indicators:
+                    self._sender.offer({
+                        "type": "indicators",
+                        "data": indicators,
+                    }, key="indicators")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info("Closing price stream: %s", e)
+            await self.close()
+
+
+    @staticmethod
+    def _live_values(values: Dict[str, Optional[float]]) -> Dict[str, Optional[float]]:
+        return {name: value for name, value in values.items() if name not in LIVE_EXCLUDED_INDICATORS}
+
+
+    @staticmethod
+    def _normalize(symbols: Iterable[str]) -> List[str]:
+        return list(dict.fromkeys(
+            symbol.strip().upper() for symbol in symbols
+            if isinstance(symbol, str) and symbol.strip()
+        ))
@@ -1,40 +1,153 @@
 import asyncio
-from datetime import datetime
-from typing import List
-from fastapi import WebSocket
-from src.stocks.models import StockQuote
-from src.stocks.repositories import StockRepository
+import time
+from typing import AsyncIterator, List, Optional
+import numpy as np
+from fastapi import HTTPException, WebSocket
+from src.application.dtos.stock_dtos import BarSeriesResponse, BatchQuotesResponse, IndicatorsResponse
+from src.domain.entities.bar_matrix import BarMatrix
+from src.domain.entities.bar_series import BAR_COLUMNS, BarSeries
+from src.domain.entities.stock_entities import TIMESPAN_MILLISECONDS, StockQuote
+from src.domain.repositories.i_stock_repository import IStockRepository
+from src.application.services.stock_price_hub import StockPriceHub
+from src.application.services.stock_price_stream import StockPriceStream
+from src.infrastructure.data_sources.ws.frame_codecs import FrameCodec
+from src.infrastructure.data_sources.ws.websocket_sender import SendQueueMetrics, SlowClientPolicy, WebSocketSender
+from src.infrastructure.utils.downsampling import DownsampleMethod, downsample_indexes
+from src.infrastructure.utils.indicators import INDICATOR_NAMES, IncrementalIndicators, IndicatorParams, compute_indicators
+
+# historia mínima para sembrar indicadores en vivo: cubre fines de semana y festivos
+INDICATOR_MIN_LOOKBACK = 5 * TIMESPAN_MILLISECONDS["day"]
+# tope al buscar hacia atrás las barras de calentamiento (símbolos recién listados)
+INDICATOR_MAX_LOOKBACK = 3 * 365 * TIMESPAN_MILLISECONDS["day"]
+# y en barras: sin él, con barras de minuto el tope anterior son decenas de chunks
+INDICATOR_MAX_LOOKBACK_BARS = 64
 
 
 class StockService:
 
-    def __init__(self, stock_repository: StockRepository):
+    def __init__(
+        self,
+        stock_repository: IStockRepository,
+        stock_price_hub: StockPriceHub,
+        batch_concurrency: int = 10,
+        stream_batch_interval: float = 1.0,
+        stream_max_symbols: int = 200,
+        send_queue_size: int = 100,
+        send_timeout: float = 5.0,
+        slow_client_policy: str = SlowClientPolicy.DROP,
+        send_queue_metrics: Optional[SendQueueMetrics] = None,
+        indicator_timespan: str = "minute"
+    ):
         self._stock_repository = stock_repository
-        self._polling_running = False
+        self._stock_price_hub = stock_price_hub
+        self._batch_concurrency = batch_concurrency
+        self._stream_batch_interval = stream_batch_interval
+        self._stream_max_symbols = stream_max_symbols
+        self._send_queue_size = send_queue_size
+        self._send_timeout = send_timeout
+        self._slow_client_policy = SlowClientPolicy(slow_client_policy)
+        self._send_queue_metrics = send_queue_metrics
+        self._indicator_timespan = indicator_timespan
+        self._polling_symbol: Optional[str] = None
+        self._sender: Optional[WebSocketSender] = None
 
 
     async def get_current_stock_price(self, symbol: str) -> StockQuote:
         return await self._stock_repository.get_current_stock_price(symbol)
 
 
-    async def start_current_stock_price_polling(self, websocket: WebSocket, symbol: str):
-        if self._polling_running:
+    async def get_current_stock_prices(self, symbols: List[str]) -> BatchQuotesResponse:
+        """
+        Gets the quotes of many symbols with at most `batch_concurrency`
+        upstream calls at once \n
+        A failed symbol is reported in `errors` without failing the batch
+        """
+        unique_symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+        semaphore = asyncio.Semaphore(self._batch_concurrency)
+
+        async def fetch(symbol: str) -> StockQuote:
+            async with semaphore:
+                return await self.get_current_stock_price(symbol)
+
+        results = await asyncio.gather(
+            *[fetch(symbol) for symbol in unique_symbols],
+            return_exceptions=True
+        )
+
+        response = BatchQuotesResponse(quotes={}, errors={})
+        for symbol, result in zip(unique_symbols, results):
+            if isinstance(result, HTTPException):
+                response.errors[symbol] = str(result.detail)
+            elif isinstance(result, Exception):
+                response.errors[symbol] = str(result) or type(result).__name__
+            else:
+                response.quotes[symbol] = result
+        return response
+
+
+    async def start_current_stock_price_polling(
+        self,
+        websocket: WebSocket,
+        symbol: str,
+        codec: Optional[FrameCodec] = None
+    ):
+        """
+        Subscribes the websocket to the shared poller of `symbol` \n
+        Returns once subscribed, updates are pushed by the hub
+        """
+        if self._polling_symbol is not None:
             return
-        
-        self._polling_running = True
 
-        while self._polling_running:
-            updated_data = await self.get_current_stock_price(symbol)
-            updated_data.timestamp = datetime.now()
-            await websocket.send_json({
-                "symbol": symbol,
-                "data": updated_data.to_dict(),
-            })
-            await asyncio.sleep(30)
+        self._polling_symbol = symbol
+        self._sender = self._create_sender(websocket, codec)
+        await self._stock_price_hub.subscribe(symbol, self._send_stock_price)
 
 
     async def stop_current_stock_price_polling(self):
-        self._polling_running = False
+        if self._polling_symbol is None:
+            return
+
+        await self._stock_price_hub.unsubscribe(self._polling_symbol, self._send_stock_price)
+        await self._sender.close()
+        self._polling_symbol = None
+        self._sender = None
+
+
+    def create_price_stream(
+        self,
+        websocket: WebSocket,
+        codec: Optional[FrameCodec] = None
+    ) -> StockPriceStream:
+        """
+        Creates a multiplexed price stream for a websocket, the caller
+        must `close()` it when the connection ends
+        """
+        return StockPriceStream(
+            self._create_sender(websocket, codec),
+            self._stock_price_hub,
+            batch_interval=self._stream_batch_interval,
+            max_symbols=self._stream_max_symbols,
+            indicator_loader=self.create_indicator_tracker
+        )
+
+
+    def _create_sender(self, websocket: WebSocket, codec: Optional[FrameCodec] = None) -> WebSocketSender:
+        return WebSocketSender(
+            websocket,
+            max_queue=self._send_queue_size,
+            send_timeout=self._send_timeout,
+            policy=self._slow_client_policy,
+            totals=self._send_queue_metrics,
+            codec=codec
+        )
+
+
+    async def _send_stock_price(self, symbol: str, quote: StockQuote):
+        # no espera al cliente: si va atrasado el precio pendiente se sustituye
+        self._sender.offer({
+            "symbol": symbol,
+            "data": quote,
+        }, key=symbol)
 
 
     async def get_historic_stock_price(
@@ -42,11 +155,264 @@ class StockService:
         symbol: str,
         from_timestamp: int,
         to_timestamp: int,
-        group_by: str
+        group_by: str,
+        multiplier: int = 1,
+        max_points: Optional[int] = None,
+        downsample: DownsampleMethod = DownsampleMethod.LTTB
     ) -> List[StockQuote]:
-        return await self._stock_repository.get_historic_stock_price(
+        """
+        Get the historic quotes of a stock \n
+        With `max_points` the series is downsampled so the response size
+        does not grow with the range
+        """
+        if max_points is None:
+            return await self._stock_repository.get_historic_stock_price(
+                symbol,
+                from_timestamp,
+                to_timestamp,
+                group_by,
+                multiplier
+            )
+
+        series = await self._get_downsampled_series(
+            symbol, from_timestamp, to_timestamp, group_by, multiplier, max_points, downsample
+        )
+        return series.to_quotes()
+
+
+    async def get_historic_matrix(
+        self,
+        symbols: List[str],
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        multiplier: int = 1,
+        column: str = "close"
+    ) -> BarMatrix:
+        """
+        Gets the historic bars of many symbols with at most
+        `batch_concurrency` loads at once and aligns `column` of all of them
+        on a common timestamp index with forward fill \n
+        A failed symbol is reported in `errors` without failing the matrix
+        """
+        if column not in BAR_COLUMNS or column == "timestamp":
+            raise HTTPException(status_code=400, detail=f"Unknown column {column}")
+
+        unique_symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+        semaphore = asyncio.Semaphore(self._batch_concurrency)
+
+        async def fetch(symbol: str) -> BarSeries:
+            async with semaphore:
+                return await self._stock_repository.get_historic_series(
+                    symbol,
+                    from_timestamp,
+                    to_timestamp,
+                    group_by,
+                    multiplier=multiplier
+                )
+
+        results = await asyncio.gather(
+            *[fetch(symbol) for symbol in unique_symbols],
+            return_exceptions=True
+        )
+
+        series, errors = {}, {}
+        for symbol, result in zip(unique_symbols, results):
+            if isinstance(result, HTTPException):
+                errors[symbol] = str(result.detail)
+            elif isinstance(result, Exception):
+                errors[symbol] = str(result) or type(result).__name__
+            else:
+                series[symbol] = result
+
+        return BarMatrix.align(series, column, errors)
+
+
+    async def stream_historic_series(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        multiplier: int = 1,
+        max_points: Optional[int] = None,
+        downsample: DownsampleMethod = DownsampleMethod.LTTB
+    ) -> AsyncIterator[BarSeries]:
+        """
+        Streams the historic bars of a stock page by page, straight from the
+        repository bar iterator \n
+        Multiplied or downsampled series are built whole, they are already
+        small, and sent as a single page
+        """
+        if multiplier == 1 and max_points is None:
+            async for page in self._stock_repository.stream_historic_series(
+                symbol,
+                from_timestamp,
+                to_timestamp,
+                group_by
+            ):
+                yield page
+            return
+
+        yield await self._get_downsampled_series(
+            symbol, from_timestamp, to_timestamp, group_by, multiplier, max_points, downsample
+        )
+
+
+    async def _get_downsampled_series(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        multiplier: int,
+        max_points: Optional[int],
+        downsample: DownsampleMethod
+    ) -> BarSeries:
+        series = await self._stock_repository.get_historic_series(
             symbol,
             from_timestamp,
             to_timestamp,
-            group_by
+            group_by,
+            multiplier=multiplier
+        )
+        if max_points is None:
+            return series
+        return series.take(downsample_indexes(series.timestamp, series.close, max_points, downsample))
+
+
+    async def get_historic_bars(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        multiplier: int = 1,
+        adjusted: bool = True
+    ) -> BarSeriesResponse:
+        """
+        Get the historic OHLCV bars of a stock in columns \n
+        Returns a `BarSeriesResponse` with one list per field
+        """
+        if multiplier < 1:
+            raise HTTPException(status_code=400, detail="multiplier must be positive")
+        series = await self._stock_repository.get_historic_series(
+            symbol,
+            from_timestamp,
+            to_timestamp,
+            group_by,
+            adjusted,
+            multiplier
+        )
+        return BarSeriesResponse(
+            symbol=symbol.upper(),
+            group_by=group_by,
+            multiplier=multiplier,
+            **series.to_columns()
+        )
+
+
+    async def get_indicators(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        params: IndicatorParams,
+        names: Optional[List[str]] = None,
+        multiplier: int = 1
+    ) -> IndicatorsResponse:
+        """
+        Computes technical indicators over the historic bars of a stock \n
+        Bars before `from_timestamp` are loaded too so the indicators are
+        already warmed up at the first returned bar
+        """
+        names = names or list(INDICATOR_NAMES)
+        unknown = [name for name in names if name not in INDICATOR_NAMES]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown indicators: {', '.join(unknown)}")
+        if group_by not in TIMESPAN_MILLISECONDS or multiplier < 1:
+            raise HTTPException(status_code=400, detail="Invalid bar size")
+
+        lookback = await self._warmup_lookback(symbol, from_timestamp, group_by, multiplier, params.warmup)
+        series = await self._stock_repository.get_historic_series(
+            symbol,
+            from_timestamp - lookback,
+            to_timestamp,
+            group_by,
+            multiplier=multiplier
+        )
+        values = compute_indicators(series, params)
+        start = int(np.searchsorted(series.timestamp, from_timestamp))
+
+        return IndicatorsResponse(
+            symbol=symbol.upper(),
+            group_by=group_by,
+            multiplier=multiplier,
+            timestamp=series.timestamp[start:].tolist(),
+            indicators={
+                name: np.where(np.isnan(values[name][start:]), None, values[name][start:]).tolist()
+                for name in names
+            }
+        )
+
+
+    async def _warmup_lookback(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        group_by: str,
+        multiplier: int,
+        warmup: int
+    ) -> int:
+        """
+        Returns how far before `from_timestamp` the history must start to
+        hold `warmup` bars, doubling the window across nights, weekends and
+        holidays up to `INDICATOR_MAX_LOOKBACK_BARS` x `warmup` bars or
+        `INDICATOR_MAX_LOOKBACK`, whichever is shorter \n
+        Without enough history the indicators are computed from the bars
+        that exist and stay `None` until they warm up. The probed bars stay
+        in the bar cache, so the final read is local
+        """
+        span = warmup * TIMESPAN_MILLISECONDS[group_by] * multiplier
+        limit = min(
+            max(span * INDICATOR_MAX_LOOKBACK_BARS, INDICATOR_MIN_LOOKBACK),
+            INDICATOR_MAX_LOOKBACK
+        )
+        lookback = min(max(span * 2, INDICATOR_MIN_LOOKBACK), limit)
+        while lookback < limit:
+            probe = await self._stock_repository.get_historic_series(
+                symbol,
+                from_timestamp - lookback,
+                from_timestamp - 1,
+                group_by,
+                multiplier=multiplier
+            )
+            if len(probe) >= warmup:
+                return lookback
+            lookback *= 2
+        return limit
+
+
+    async def create_indicator_tracker(
+        self,
+        symbol: str,
+        params: Optional[IndicatorParams] = None
+    ) -> IncrementalIndicators:
+        """
+        Seeds live indicators of `symbol` from its recent bars, then each
+        quote updates them in O(1)
+        """
+        params = params or IndicatorParams()
+        now = int(time.time() * 1000)
+        lookback = max(
+            params.warmup * TIMESPAN_MILLISECONDS[self._indicator_timespan] * 4,
+            INDICATOR_MIN_LOOKBACK
+        )
+        series = await self._stock_repository.get_historic_series(
+            symbol,
+            now - lookback,
+            now,
+            self._indicator_timespan
         )
+        return IncrementalIndicators.from_series(series, params, self._indicator_timespan)
@@ -0,0 +1,120 @@
+import asyncio
+from typing import Dict, Optional, Set
+from src.application.services.stock_price_hub import StockPriceHub
+from src.domain.brokers.i_cluster_membership import IClusterMembership
+from src.infrastructure.utils.consistent_hash_ring import ConsistentHashRing
+from src.infrastructure.utils.logger import setup_logger
+
+logger = setup_logger("SymbolShardCoordinator")
+
+
+class SymbolShardCoordinator:
+    """
+    Reparte el polling de símbolos entre nodos con un anillo de hash
+    consistente. \n
+    Cada `heartbeat_interval` segundos publica el heartbeat del nodo con sus
+    símbolos suscritos, reconstruye el anillo con los miembros vivos y asigna
+    al hub los símbolos pedidos en todo el cluster que le tocan a este nodo.
+    Si la membresía falla, el nodo produce todo lo que piden sus clientes.
+    """
+
+    def __init__(
+        self,
+        membership: IClusterMembership,
+        stock_price_hub: StockPriceHub,
+        enabled: bool = False,
+        heartbeat_interval: float = 5.0,
+        node_ttl: float = 15.0,
+        vnodes: int = 64
+    ):
+        self._membership = membership
+        self._stock_price_hub = stock_price_hub
+        self.enabled = enabled
+        self.heartbeat_interval = heartbeat_interval
+        self.node_ttl = node_ttl
+        self._ring = ConsistentHashRing(vnodes=vnodes)
+        self._owned: Set[str] = set()
+        self._wake = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+
+        self.rebalances = 0
+        self.moved = 0
+        self.errors = 0
+
+
+    @property
+    def node_id(self) -> str:
+        return self._membership.node_id
+
+
+    async def start(self):
+        if not self.enabled:
+            return
+        # una suscripción nueva se anuncia sin esperar al próximo heartbeat
+        self._stock_price_hub.set_demand_listener(self._wake.set)
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+
+    async def stop(self):
+        if self._runner is None:
+            return
+        self._runner.cancel()
+        try:
+            await self._runner
+        except asyncio.CancelledError:
+            pass
+        self._runner = None
+        await self._membership.leave()
+
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                await self._rebalance()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.warning("Cluster membership unavailable, producing local symbols: %s", e)
+                await self._stock_price_hub.assign(self._stock_price_hub.local_symbols)
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.heartbeat_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+    async def _rebalance(self):
+        await self._membership.heartbeat(self.node_ttl, self._stock_price_hub.local_symbols)
+        members = await self._membership.members()
+        if self.node_id not in members:
+            members = sorted([*members, self.node_id])
+
+        if members != self._ring.nodes:
+            for node in set(self._ring.nodes) - set(members):
+                self._ring.remove(node)
+            for node in members:
+                self._ring.add(node)
+            self.rebalances += 1
+            logger.info("Cluster members changed: %s", ", ".join(members))
+
+        demand = await self._membership.demand(members)
+        owned = {symbol for symbol in demand if self._ring.owner(symbol) == self.node_id}
+        if owned != self._owned:
+            self.moved += len(owned ^ self._owned)
+            self._owned = owned
+        await self._stock_price_hub.assign(owned)
+
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "enabled": int(self.enabled),
+            "members": len(self._ring.nodes),
+            "owned": len(self._owned),
+            "rebalances": self.rebalances,
+            "moved": self.moved,
+            "errors": self.errors,
+        }
@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Set
+
+class IClusterMembership(ABC):
+    node_id: str
+
+    @abstractmethod
+    async def heartbeat(self, ttl: float, symbols: Iterable[str]) -> None:
+        """
+        Mark this node alive for `ttl` seconds together with the symbols
+        its local clients are subscribed to
+        """
+        pass
+
+
+    @abstractmethod
+    async def members(self) -> List[str]:
+        """
+        Get the nodes with a live heartbeat \n
+        Returns the node ids sorted
+        """
+        pass
+
+
+    @abstractmethod
+    async def demand(self, members: Iterable[str]) -> Set[str]:
+        """
+        Get the symbols subscribed on any of `members`
+        """
+        pass
+
+
+    @abstractmethod
+    async def leave(self) -> None:
+        """
+        Remove this node from the cluster before its heartbeat expires
+        """
+        pass
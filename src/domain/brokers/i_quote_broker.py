@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable
+from src.domain.entities.stock_entities import StockQuote
+
+QuoteHandler = Callable[[str, StockQuote], Awaitable[None]]
+
+class IQuoteBroker(ABC):
+    @abstractmethod
+    async def start(self) -> None:
+        """
+        Open the connections of the broker
+        """
+        pass
+
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """
+        Close the connections of the broker and release its leases
+        """
+        pass
+
+
+    @abstractmethod
+    async def publish(self, symbol: str, quote: StockQuote) -> None:
+        """
+        Publish a quote to every node subscribed to `symbol`
+        """
+        pass
+
+
+    @abstractmethod
+    async def subscribe(self, symbol: str, handler: QuoteHandler) -> None:
+        """
+        Receive the quotes published for `symbol` by any node
+        """
+        pass
+
+
+    @abstractmethod
+    async def unsubscribe(self, symbol: str, handler: QuoteHandler) -> None:
+        """
+        Stop receiving the quotes of `symbol`
+        """
+        pass
+
+
+    @abstractmethod
+    async def acquire_producer(self, symbol: str, lease: float) -> bool:
+        """
+        Acquire or renew the producer lease of `symbol` for `lease` seconds \n
+        Returns `True` if this node is the only one that should poll it
+        """
+        pass
+
+
+    @abstractmethod
+    async def release_producer(self, symbol: str) -> None:
+        """
+        Release the producer lease of `symbol` if this node holds it
+        """
+        pass
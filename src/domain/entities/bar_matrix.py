@@ -0,0 +1,53 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional
+import numpy as np
+from src.domain.entities.bar_series import BAR_COLUMNS, BarSeries
+
+
+@dataclass(frozen=True)
+class BarMatrix:
+    """
+    Un campo de varias series alineado sobre un índice común: `values`
+    tiene una fila por timestamp y una columna por símbolo. Los huecos se
+    rellenan con el último valor conocido; antes de la primera barra de un
+    símbolo el valor es NaN.
+    """
+    timestamp: np.ndarray
+    symbols: List[str]
+    values: np.ndarray
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def align(
+        cls,
+        series: Mapping[str, BarSeries],
+        column: str = "close",
+        errors: Optional[Mapping[str, str]] = None
+    ) -> "BarMatrix":
+        """
+        Aligns `column` of every series on the union of their timestamps
+        with forward fill
+        """
+        if column not in BAR_COLUMNS or column == "timestamp":
+            raise ValueError(f"Unknown column {column}")
+
+        symbols = list(series)
+        index = np.unique(np.concatenate(
+            [item.timestamp for item in series.values()] or [np.empty(0, dtype=np.int64)]
+        ))
+        values = np.full((len(index), len(symbols)), np.nan)
+        for position, item in enumerate(series.values()):
+            if not len(item):
+                continue
+            # la última barra con timestamp <= cada fila del índice
+            last = np.searchsorted(item.timestamp, index, side="right") - 1
+            known = last >= 0
+            values[known, position] = getattr(item, column)[last[known]]
+
+        return cls(timestamp=index, symbols=symbols, values=values, errors=dict(errors or {}))
+
+    def to_rows(self) -> List[List[float]]:
+        """
+        Returns the values as nested lists with `None` for missing values
+        """
+        return np.where(np.isnan(self.values), None, self.values).tolist()
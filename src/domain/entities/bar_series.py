@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Sequence
+import numpy as np
+from src.domain.entities.stock_entities import StockBar, StockQuote
+
+BAR_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True)
+class BarSeries:
+    """
+    Serie OHLCV en columnas: un array de NumPy por campo en vez de un objeto
+    por barra. `timestamp` son milisegundos (int64) ordenados de menor a mayor.
+    """
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, column).nbytes for column in BAR_COLUMNS)
+
+    @classmethod
+    def from_columns(
+        cls,
+        timestamp: Sequence[int],
+        open: Sequence[float],
+        high: Sequence[float],
+        low: Sequence[float],
+        close: Sequence[float],
+        volume: Sequence[float]
+    ) -> "BarSeries":
+        return cls(
+            timestamp=np.asarray(timestamp, dtype=np.int64),
+            open=np.asarray(open, dtype=np.float64),
+            high=np.asarray(high, dtype=np.float64),
+            low=np.asarray(low, dtype=np.float64),
+            close=np.asarray(close, dtype=np.float64),
+            volume=np.asarray(volume, dtype=np.float64)
+        )
+
+    @classmethod
+    def empty(cls) -> "BarSeries":
+        return cls.from_columns([], [], [], [], [], [])
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[float]]) -> "BarSeries":
+        """
+        Builds a series from `(timestamp, open, high, low, close, volume)` rows
+        """
+        if not rows:
+            return cls.empty()
+        return cls.from_columns(*zip(*rows))
+
+    @classmethod
+    def from_bars(cls, bars: Iterable[StockBar]) -> "BarSeries":
+        return cls.from_rows([
+            (bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume)
+            for bar in bars
+        ])
+
+    @classmethod
+    def concat(cls, series: Iterable["BarSeries"]) -> "BarSeries":
+        series = [item for item in series if len(item)]
+        if not series:
+            return cls.empty()
+        return cls(**{
+            column: np.concatenate([getattr(item, column) for item in series])
+            for column in BAR_COLUMNS
+        })
+
+    def slice(self, from_timestamp: int, to_timestamp: int) -> "BarSeries":
+        """
+        Returns the bars inside the closed range, without copying
+        """
+        start = np.searchsorted(self.timestamp, from_timestamp, side="left")
+        end = np.searchsorted(self.timestamp, to_timestamp, side="right")
+        return BarSeries(**{column: getattr(self, column)[start:end] for column in BAR_COLUMNS})
+
+    def take(self, indexes: np.ndarray) -> "BarSeries":
+        return BarSeries(**{column: getattr(self, column)[indexes] for column in BAR_COLUMNS})
+
+    def to_columns(self) -> Dict[str, List[float]]:
+        return {column: getattr(self, column).tolist() for column in BAR_COLUMNS}
+
+    def to_bars(self) -> List[StockBar]:
+        return [
+            StockBar(timestamp=timestamp, open=open, high=high, low=low, close=close, volume=volume)
+            for timestamp, open, high, low, close, volume in zip(*self.to_columns().values())
+        ]
+
+    def to_quotes(self) -> List[StockQuote]:
+        return [
+            StockQuote(price=close, timestamp=datetime.fromtimestamp(seconds))
+            for close, seconds in zip(self.close.tolist(), (self.timestamp / 1000).tolist())
+        ]
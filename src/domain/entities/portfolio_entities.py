@@ -0,0 +1,61 @@
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class TransactionType(str, Enum):
+    BUY = "buy"
+    SELL = "sell"
+    DIVIDEND = "dividend"
+    SPLIT = "split"
+
+
+class Transaction(BaseModel):
+    """
+    Un movimiento de la cartera. `timestamp` en milisegundos. \n
+    - buy / sell: `quantity` acciones a `price` por acción más `fee`. \n
+    - dividend: cobra `quantity` x `price` menos `fee`. \n
+    - split: `quantity` es la proporción (2 para un split 2 por 1).
+    """
+    symbol: str
+    type: TransactionType
+    timestamp: int
+    quantity: float = Field(gt=0)
+    price: float = Field(default=0.0, ge=0)
+    fee: float = Field(default=0.0, ge=0)
+
+
+class LedgerEntry(Transaction):
+    """
+    Una transacción guardada en el ledger de un usuario. `id` crece con
+    cada inserción.
+    """
+    id: int
+
+
+class LedgerPosition(BaseModel):
+    symbol: str
+    quantity: float = 0.0
+    cost_basis: float = 0.0
+    realized_pnl: float = 0.0
+
+
+class LedgerSnapshot(BaseModel):
+    """
+    Posiciones de un usuario tras aplicar sus transacciones hasta
+    `last_transaction_id`. \n
+    `timestamp` es el de la transacción más reciente incluida: guardar una
+    transacción anterior invalida la foto.
+    """
+    last_transaction_id: int
+    timestamp: int
+    positions: List[LedgerPosition]
+
+
+class PositionEntity(BaseModel):
+    symbol: str
+    quantity: float
+    cost_basis: float
+    market_value: Optional[float]
+    realized_pnl: float
+    unrealized_pnl: Optional[float]
@@ -0,0 +1,37 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+# duración (en milisegundos) de una barra por cada `group_by` de Polygon,
+# month/quarter/year usan la duración máxima posible
+TIMESPAN_MILLISECONDS = {
+    "minute": 60_000,
+    "hour": 3_600_000,
+    "day": 86_400_000,
+    "week": 7 * 86_400_000,
+    "month": 31 * 86_400_000,
+    "quarter": 92 * 86_400_000,
+    "year": 366 * 86_400_000,
+}
+
+
+class StockQuote(BaseModel):
+    price: float
+    timestamp: datetime
+
+    def to_dict(self) -> dict:
+        return self.model_dump(mode="json")
+
+
+class StockBar(BaseModel):
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+    def to_quote(self) -> StockQuote:
+        return StockQuote(
+            price=self.close,
+            timestamp=datetime.fromtimestamp(self.timestamp / 1000)
+        )
@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+from src.domain.entities.bar_series import BarSeries
+
+class IBarRepository(ABC):
+    @abstractmethod
+    def get_coverage(self, symbol: str, timespan: str, adjusted: bool) -> List[Tuple[int, int]]:
+        """
+        Get the time intervals (ms, inclusive) already stored for a series \n
+        Returns the intervals sorted by start
+        """
+        pass
+
+
+    @abstractmethod
+    def get_series(
+        self,
+        symbol: str,
+        timespan: str,
+        adjusted: bool,
+        from_timestamp: int,
+        to_timestamp: int,
+        limit: Optional[int] = None
+    ) -> BarSeries:
+        """
+        Get the stored bars of a series inside a time range as columns \n
+        Returns a `BarSeries` with at most `limit` bars sorted by timestamp
+        """
+        pass
+
+
+    @abstractmethod
+    def save_series(
+        self,
+        symbol: str,
+        timespan: str,
+        adjusted: bool,
+        from_timestamp: int,
+        to_timestamp: int,
+        bars: BarSeries
+    ) -> None:
+        """
+        Replace the stored bars of a series inside a time range \n
+        and mark the range as covered
+        """
+        pass
@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional
+from src.domain.entities.portfolio_entities import LedgerEntry, LedgerSnapshot, Transaction
+
+class ILedgerRepository(ABC):
+    @abstractmethod
+    def add_transactions(self, user_id: str, transactions: Iterable[Transaction]) -> int:
+        """
+        Append transactions to the ledger of a user in batched inserts,
+        all of them or none \n
+        Returns the number of transactions stored
+        """
+        pass
+
+
+    @abstractmethod
+    def get_entries(self, user_id: str, after_id: int = 0) -> List[LedgerEntry]:
+        """
+        Get the transactions of a user stored after `after_id` \n
+        Returns the entries sorted by timestamp and id
+        """
+        pass
+
+
+    @abstractmethod
+    def get_snapshot(self, user_id: str) -> Optional[LedgerSnapshot]:
+        """
+        Get the latest position snapshot of a user, if any
+        """
+        pass
+
+
+    @abstractmethod
+    def save_snapshot(self, user_id: str, snapshot: LedgerSnapshot) -> None:
+        """
+        Replace the position snapshot of a user
+        """
+        pass
\ No newline at end of file
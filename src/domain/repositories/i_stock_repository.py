@@ -0,0 +1,107 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, List
+from src.domain.entities.bar_series import BarSeries
+from src.domain.entities.stock_entities import StockBar, StockQuote
+
+class IStockRepository(ABC):
+    @abstractmethod
+    async def get_current_stock_price(self, symbol: str) -> StockQuote:
+        """
+        Get the last quote of a stock \n
+        Receives the stock `symbol` \n
+        Returns a `StockQuote`
+        """
+        pass
+
+    async def refresh_current_stock_price(self, symbol: str) -> StockQuote:
+        """
+        Get the last quote of a stock skipping any local cache \n
+        Caching repositories keep the fresh quote for later readers
+        """
+        return await self.get_current_stock_price(symbol)
+
+    @abstractmethod
+    async def get_historic_stock_price(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        multiplier: int = 1
+    ) -> List[StockQuote]:
+        """
+        Get the historic quotes of a stock \n
+        Receives the stock `symbol`, the range and the bar size (`multiplier` x `group_by`) \n
+        Returns a list of `StockQuote` sorted by timestamp
+        """
+        pass
+
+
+    @abstractmethod
+    async def get_historic_bars(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        adjusted: bool = True
+    ) -> List[StockBar]:
+        """
+        Get the historic OHLCV bars of a stock \n
+        Receives the stock `symbol`, the range (ms timestamps) and the `group_by` timespan \n
+        Returns a list of `StockBar` sorted by timestamp
+        """
+        pass
+
+
+    @abstractmethod
+    async def get_historic_series(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        adjusted: bool = True,
+        multiplier: int = 1
+    ) -> BarSeries:
+        """
+        Get the historic OHLCV bars of a stock as columns \n
+        Receives the stock `symbol`, the range (ms timestamps) and the bar size
+        (`multiplier` x `group_by`) \n
+        Returns a `BarSeries` sorted by timestamp
+        """
+        pass
+
+
+    @abstractmethod
+    def stream_historic_bars(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        adjusted: bool = True
+    ) -> AsyncIterator[List[StockBar]]:
+        """
+        Stream the historic OHLCV bars of a stock following the upstream pagination \n
+        Receives the stock `symbol`, the range (ms timestamps) and the `group_by` timespan \n
+        Yields lists of `StockBar` sorted by timestamp, one per page
+        """
+        pass
+
+
+    @abstractmethod
+    def stream_historic_series(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        adjusted: bool = True
+    ) -> AsyncIterator[BarSeries]:
+        """
+        Stream the historic OHLCV bars of a stock as columns following the upstream pagination \n
+        Receives the stock `symbol`, the range (ms timestamps) and the `group_by` timespan \n
+        Yields one `BarSeries` sorted by timestamp per page, without an object per bar
+        """
+        pass
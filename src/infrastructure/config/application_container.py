@@ -3,18 +3,37 @@ from supabase import create_client
 
 from src.infrastructure.repositories.auth.auth_repository import AuthRepository
 from src.application.services.auth_service import AuthService
+from src.application.services.stock_service import StockService
+from src.application.services.portfolio_service import PortfolioService
+from src.application.services.stock_price_hub import StockPriceHub
+from src.application.services.stock_price_ingest import StockPriceIngest
+from src.application.services.poll_scheduler import PollScheduler
+from src.application.services.symbol_shard_coordinator import SymbolShardCoordinator
+from src.infrastructure.repositories.stock.stock_repository import StockRepository
+from src.infrastructure.repositories.stock.cached_stock_repository import CachedStockRepository
+from src.infrastructure.utils.ttl_cache import TTLCache
+from src.infrastructure.utils.market_calendar import MarketCalendar
 from src.infrastructure.data_sources.http.http_client import HTTPClient
+from src.infrastructure.data_sources.http.rate_limiter import RateLimiter
+from src.infrastructure.data_sources.ws.trade_feed_client import TradeFeedClient
+from src.infrastructure.data_sources.ws.websocket_sender import SendQueueMetrics
+from src.infrastructure.data_sources.broker.in_process_quote_broker import InProcessQuoteBroker
+from src.infrastructure.data_sources.broker.redis_quote_broker import RedisQuoteBroker
 from src.infrastructure.config.settings import Settings
 from src.infrastructure.data_sources.db.database import Database
 from src.infrastructure.data_sources.db.repositories.user_db_repository import UserDBRepository
+from src.infrastructure.data_sources.db.repositories.bar_db_repository import BarDBRepository
+from src.infrastructure.data_sources.db.repositories.ledger_db_repository import LedgerDBRepository
 
 class AplicationContainer(containers.DeclarativeContainer):
     # wiring config
     wiring_config = containers.WiringConfiguration(
         modules=[
             "src.web.auth.auth_router",
-            # "src.web.stock.stock_router",
-            # "src.web.stock.stock_ws"
+            "src.web.auth.auth_dependencies",
+            "src.web.stock.stock_router",
+            "src.web.stock.stock_ws",
+            "src.web.portfolio.portfolio_router"
         ]
     )
 
@@ -27,20 +46,87 @@ class AplicationContainer(containers.DeclarativeContainer):
         settings().SUPABASE_URL,
         settings().SUPABASE_KEY
     )
-    db = providers.Singleton(Database, db_url=settings().DATABASE_URL)
+    db = providers.Singleton(Database, db_url=settings().DATABASE_URL, echo=settings().DB_ECHO)
+    stock_api_rate_limiter = providers.Singleton(
+        RateLimiter,
+        rate=settings().STOCK_API_RATE_LIMIT,
+        burst=settings().STOCK_API_RATE_BURST
+    )
+    historic_stock_api_rate_limiter = providers.Singleton(
+        RateLimiter,
+        rate=settings().HISTORIC_STOCK_API_RATE_LIMIT,
+        burst=settings().HISTORIC_STOCK_API_RATE_BURST
+    )
     stock_api = providers.Singleton(
         HTTPClient,
         base_url=settings().STOCK_API_BASE_URL,
         headers={
             "X-Finnhub-Token": settings().STOCK_API_TOKEN
-        }
+        },
+        timeout=settings().HTTP_TIMEOUT,
+        max_connections=settings().HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings().HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings().HTTP_KEEPALIVE_EXPIRY,
+        http2=settings().HTTP2_ENABLED,
+        rate_limiter=stock_api_rate_limiter,
+        rate_limit_retries=settings().HTTP_RATE_LIMIT_RETRIES,
+        retries=settings().HTTP_RETRIES,
+        retry_backoff_base=settings().HTTP_RETRY_BACKOFF_BASE,
+        retry_backoff_max=settings().HTTP_RETRY_BACKOFF_MAX,
+        circuit_failure_threshold=settings().HTTP_CIRCUIT_FAILURE_THRESHOLD,
+        circuit_recovery_timeout=settings().HTTP_CIRCUIT_RECOVERY_TIMEOUT,
+        hedge=settings().HTTP_HEDGE_ENABLED,
+        hedge_percentile=settings().HTTP_HEDGE_PERCENTILE
     )
     historic_stock_api = providers.Singleton(
         HTTPClient,
         base_url=settings().HISTORIC_STOCK_API_BASE_URL,
         params={
             "apiKey": settings().HISTORIC_STOCK_API_TOKEN
-        }
+        },
+        timeout=settings().HTTP_TIMEOUT,
+        max_connections=settings().HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings().HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings().HTTP_KEEPALIVE_EXPIRY,
+        http2=settings().HTTP2_ENABLED,
+        rate_limiter=historic_stock_api_rate_limiter,
+        rate_limit_retries=settings().HTTP_RATE_LIMIT_RETRIES,
+        retries=settings().HTTP_RETRIES,
+        retry_backoff_base=settings().HTTP_RETRY_BACKOFF_BASE,
+        retry_backoff_max=settings().HTTP_RETRY_BACKOFF_MAX,
+        circuit_failure_threshold=settings().HTTP_CIRCUIT_FAILURE_THRESHOLD,
+        circuit_recovery_timeout=settings().HTTP_CIRCUIT_RECOVERY_TIMEOUT,
+        hedge=settings().HTTP_HEDGE_ENABLED,
+        hedge_percentile=settings().HTTP_HEDGE_PERCENTILE
+    )
+
+    trade_feed = providers.Singleton(
+        TradeFeedClient,
+        url=settings().STOCK_FEED_URL,
+        token=settings().STOCK_API_TOKEN,
+        reconnect_backoff_base=settings().STOCK_FEED_RECONNECT_BACKOFF_BASE,
+        reconnect_backoff_max=settings().STOCK_FEED_RECONNECT_BACKOFF_MAX
+    )
+
+    # brokers
+    quote_broker = providers.Selector(
+        lambda: settings().BROKER_BACKEND,
+        memory=providers.Singleton(InProcessQuoteBroker),
+        redis=providers.Singleton(
+            RedisQuoteBroker,
+            url=settings().BROKER_URL,
+            reconnect_backoff_base=settings().BROKER_RECONNECT_BACKOFF_BASE,
+            reconnect_backoff_max=settings().BROKER_RECONNECT_BACKOFF_MAX
+        )
+    )
+
+    # caches
+    quote_cache = providers.Singleton(
+        TTLCache,
+        ttl=settings().QUOTE_CACHE_TTL,
+        stale_ttl=settings().QUOTE_CACHE_STALE_TTL,
+        max_entries=settings().QUOTE_CACHE_MAX_ENTRIES,
+        max_bytes=settings().QUOTE_CACHE_MAX_BYTES
     )
 
     # repositories
@@ -54,16 +140,36 @@ class AplicationContainer(containers.DeclarativeContainer):
         session_factory=db.provided.session
     )
 
-    # stock_repository = providers.Factory(
-    #     StockRepository,
-    #     stock_api=stock_api,
-    #     historic_stock_api=historic_stock_api
-    # )
+    bar_repository = providers.Singleton(
+        BarDBRepository,
+        session_factory=db.provided.session
+    )
+
+    ledger_repository = providers.Singleton(
+        LedgerDBRepository,
+        session_factory=db.provided.session,
+        batch_size=settings().LEDGER_IMPORT_BATCH_SIZE
+    )
+
+    market_calendar = providers.Singleton(
+        MarketCalendar.from_settings,
+        timezone_name=settings().MARKET_TIMEZONE,
+        holidays=settings().MARKET_HOLIDAYS
+    )
 
-    # stock_service = providers.Factory(
-    #     StockService,
-    #     stock_repository=stock_repository
-    # )
+    stock_repository = providers.Factory(
+        CachedStockRepository,
+        stock_repository=providers.Factory(
+            StockRepository,
+            stock_api=stock_api,
+            historic_stock_api=historic_stock_api,
+            historic_concurrency=settings().HISTORIC_FETCH_CONCURRENCY
+        ),
+        quote_cache=quote_cache,
+        bar_repository=bar_repository,
+        market_calendar=market_calendar,
+        publication_delay=settings().HISTORIC_PUBLICATION_DELAY
+    )
 
     # services 
     auth_service = providers.Factory(
@@ -71,3 +177,65 @@ class AplicationContainer(containers.DeclarativeContainer):
         auth_repository=auth_repository,
         user_repository=user_repository
     )
+
+    stock_price_ingest = providers.Singleton(
+        StockPriceIngest,
+        trade_feed=trade_feed,
+        enabled=settings().STOCK_FEED_ENABLED,
+        publish_interval=settings().STOCK_FEED_PUBLISH_INTERVAL
+    )
+
+    send_queue_metrics = providers.Singleton(SendQueueMetrics)
+
+    poll_scheduler = providers.Singleton(
+        PollScheduler,
+        calendar=market_calendar,
+        base_interval=settings().STOCK_POLLING_INTERVAL,
+        min_interval=settings().POLL_MIN_INTERVAL,
+        max_interval=settings().POLL_MAX_INTERVAL,
+        closed_interval=settings().POLL_CLOSED_INTERVAL,
+        max_concurrency=settings().POLL_MAX_CONCURRENCY
+    )
+
+    stock_price_hub = providers.Singleton(
+        StockPriceHub,
+        stock_repository=stock_repository,
+        poll_interval=settings().STOCK_POLLING_INTERVAL,
+        stock_price_ingest=stock_price_ingest,
+        quote_broker=quote_broker,
+        producer_lease=settings().BROKER_PRODUCER_LEASE,
+        producer_lease_min=settings().BROKER_PRODUCER_LEASE_MIN,
+        producer_lease_max=settings().BROKER_PRODUCER_LEASE_MAX,
+        poll_scheduler=poll_scheduler
+    )
+
+    symbol_shard_coordinator = providers.Singleton(
+        SymbolShardCoordinator,
+        membership=quote_broker,
+        stock_price_hub=stock_price_hub,
+        enabled=settings().SHARDING_ENABLED,
+        heartbeat_interval=settings().SHARD_HEARTBEAT_INTERVAL,
+        node_ttl=settings().SHARD_NODE_TTL,
+        vnodes=settings().SHARD_VIRTUAL_NODES
+    )
+
+    stock_service = providers.Factory(
+        StockService,
+        stock_repository=stock_repository,
+        stock_price_hub=stock_price_hub,
+        batch_concurrency=settings().QUOTES_BATCH_CONCURRENCY,
+        stream_batch_interval=settings().STOCK_STREAM_BATCH_INTERVAL,
+        stream_max_symbols=settings().STOCK_STREAM_MAX_SYMBOLS,
+        send_queue_size=settings().WS_SEND_QUEUE_SIZE,
+        send_timeout=settings().WS_SEND_TIMEOUT,
+        slow_client_policy=settings().WS_SLOW_CLIENT_POLICY,
+        send_queue_metrics=send_queue_metrics
+    )
+
+    portfolio_service = providers.Factory(
+        PortfolioService,
+        stock_service=stock_service,
+        ledger_repository=ledger_repository,
+        max_symbols=settings().PORTFOLIO_MAX_SYMBOLS,
+        snapshot_interval=settings().LEDGER_SNAPSHOT_INTERVAL
+    )
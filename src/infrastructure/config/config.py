@@ -29,6 +29,11 @@ class Configs(BaseSettings):
 
     PROJECT_ROOT: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+    # logging
+    LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO').upper()
+    LOG_FORMAT: str = os.getenv('LOG_FORMAT', 'color')
+    LOG_PAYLOAD_MAX_CHARS: int = int(os.getenv('LOG_PAYLOAD_MAX_CHARS', '1000'))
+
     # date
     DATETIME_FORMAT: str = "%Y-%m-%dT%H:%M:%S"
     DATE_FORMAT: str = "%Y-%m-%d"
@@ -46,6 +51,71 @@ class Configs(BaseSettings):
     HISTORIC_STOCK_API_BASE_URL: str = os.getenv('HISTORIC_STOCK_API_BASE_URL', '')
     HISTORIC_STOCK_API_TOKEN: str = os.getenv('HISTORIC_STOCK_API_TOKEN', '')
 
+    # http client pool
+    HTTP_TIMEOUT: float = float(os.getenv('HTTP_TIMEOUT', '30'))
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv('HTTP_MAX_CONNECTIONS', '100'))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv('HTTP_MAX_KEEPALIVE_CONNECTIONS', '20'))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '30'))
+    HTTP2_ENABLED: bool = os.getenv('HTTP2_ENABLED', 'false').lower() == 'true'
+
+    # upstream rate limits (requests per second, 0 disables the limit)
+    STOCK_API_RATE_LIMIT: float = float(os.getenv('STOCK_API_RATE_LIMIT', '1'))
+    STOCK_API_RATE_BURST: int = int(os.getenv('STOCK_API_RATE_BURST', '10'))
+    HISTORIC_STOCK_API_RATE_LIMIT: float = float(os.getenv('HISTORIC_STOCK_API_RATE_LIMIT', '0.083'))
+    HISTORIC_STOCK_API_RATE_BURST: int = int(os.getenv('HISTORIC_STOCK_API_RATE_BURST', '5'))
+    HISTORIC_FETCH_CONCURRENCY: int = int(os.getenv('HISTORIC_FETCH_CONCURRENCY', '4'))
+    HISTORIC_PUBLICATION_DELAY: float = float(os.getenv('HISTORIC_PUBLICATION_DELAY', '86400'))
+    HTTP_RATE_LIMIT_RETRIES: int = int(os.getenv('HTTP_RATE_LIMIT_RETRIES', '2'))
+
+    # http resilience
+    HTTP_RETRIES: int = int(os.getenv('HTTP_RETRIES', '2'))
+    HTTP_RETRY_BACKOFF_BASE: float = float(os.getenv('HTTP_RETRY_BACKOFF_BASE', '0.2'))
+    HTTP_RETRY_BACKOFF_MAX: float = float(os.getenv('HTTP_RETRY_BACKOFF_MAX', '5'))
+    HTTP_CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv('HTTP_CIRCUIT_FAILURE_THRESHOLD', '5'))
+    HTTP_CIRCUIT_RECOVERY_TIMEOUT: float = float(os.getenv('HTTP_CIRCUIT_RECOVERY_TIMEOUT', '30'))
+    HTTP_HEDGE_ENABLED: bool = os.getenv('HTTP_HEDGE_ENABLED', 'false').lower() == 'true'
+    HTTP_HEDGE_PERCENTILE: float = float(os.getenv('HTTP_HEDGE_PERCENTILE', '0.95'))
+
+    # quote cache
+    QUOTE_CACHE_TTL: float = float(os.getenv('QUOTE_CACHE_TTL', '5'))
+    QUOTE_CACHE_STALE_TTL: float = float(os.getenv('QUOTE_CACHE_STALE_TTL', '30'))
+    QUOTE_CACHE_MAX_ENTRIES: int = int(os.getenv('QUOTE_CACHE_MAX_ENTRIES', '5000'))
+    QUOTE_CACHE_MAX_BYTES: int = int(os.getenv('QUOTE_CACHE_MAX_BYTES', '0'))
+    QUOTES_BATCH_CONCURRENCY: int = int(os.getenv('QUOTES_BATCH_CONCURRENCY', '10'))
+    STOCK_POLLING_INTERVAL: float = float(os.getenv('STOCK_POLLING_INTERVAL', '30'))
+    STOCK_STREAM_BATCH_INTERVAL: float = float(os.getenv('STOCK_STREAM_BATCH_INTERVAL', '1'))
+    STOCK_STREAM_MAX_SYMBOLS: int = int(os.getenv('STOCK_STREAM_MAX_SYMBOLS', '200'))
+    STOCK_FEED_ENABLED: bool = os.getenv('STOCK_FEED_ENABLED', 'false').lower() == 'true'
+    STOCK_FEED_URL: str = os.getenv('STOCK_FEED_URL', 'wss://ws.finnhub.io')
+    STOCK_FEED_PUBLISH_INTERVAL: float = float(os.getenv('STOCK_FEED_PUBLISH_INTERVAL', '0.5'))
+    STOCK_FEED_RECONNECT_BACKOFF_BASE: float = float(os.getenv('STOCK_FEED_RECONNECT_BACKOFF_BASE', '1'))
+    STOCK_FEED_RECONNECT_BACKOFF_MAX: float = float(os.getenv('STOCK_FEED_RECONNECT_BACKOFF_MAX', '30'))
+    WS_SEND_QUEUE_SIZE: int = int(os.getenv('WS_SEND_QUEUE_SIZE', '100'))
+    WS_SEND_TIMEOUT: float = float(os.getenv('WS_SEND_TIMEOUT', '5'))
+    WS_SLOW_CLIENT_POLICY: str = os.getenv('WS_SLOW_CLIENT_POLICY', 'drop')
+    BROKER_BACKEND: str = os.getenv('BROKER_BACKEND', 'memory')
+    BROKER_URL: str = os.getenv('BROKER_URL', 'redis://127.0.0.1:6379/0')
+    BROKER_PRODUCER_LEASE: float = float(os.getenv('BROKER_PRODUCER_LEASE', '0'))
+    BROKER_PRODUCER_LEASE_MIN: float = float(os.getenv('BROKER_PRODUCER_LEASE_MIN', '15'))
+    BROKER_PRODUCER_LEASE_MAX: float = float(os.getenv('BROKER_PRODUCER_LEASE_MAX', '120'))
+    BROKER_RECONNECT_BACKOFF_BASE: float = float(os.getenv('BROKER_RECONNECT_BACKOFF_BASE', '1'))
+    BROKER_RECONNECT_BACKOFF_MAX: float = float(os.getenv('BROKER_RECONNECT_BACKOFF_MAX', '30'))
+    SHARDING_ENABLED: bool = os.getenv('SHARDING_ENABLED', 'false').lower() == 'true'
+    SHARD_HEARTBEAT_INTERVAL: float = float(os.getenv('SHARD_HEARTBEAT_INTERVAL', '5'))
+    SHARD_NODE_TTL: float = float(os.getenv('SHARD_NODE_TTL', '15'))
+    SHARD_VIRTUAL_NODES: int = int(os.getenv('SHARD_VIRTUAL_NODES', '64'))
+    MARKET_TIMEZONE: str = os.getenv('MARKET_TIMEZONE', 'America/New_York')
+    MARKET_HOLIDAYS: str = os.getenv('MARKET_HOLIDAYS', '')
+    POLL_MIN_INTERVAL: float = float(os.getenv('POLL_MIN_INTERVAL', '5'))
+    POLL_MAX_INTERVAL: float = float(os.getenv('POLL_MAX_INTERVAL', '120'))
+    POLL_CLOSED_INTERVAL: float = float(os.getenv('POLL_CLOSED_INTERVAL', '900'))
+    POLL_MAX_CONCURRENCY: int = int(os.getenv('POLL_MAX_CONCURRENCY', '20'))
+
+    # portfolio
+    PORTFOLIO_MAX_SYMBOLS: int = int(os.getenv('PORTFOLIO_MAX_SYMBOLS', '200'))
+    LEDGER_SNAPSHOT_INTERVAL: int = int(os.getenv('LEDGER_SNAPSHOT_INTERVAL', '500'))
+    LEDGER_IMPORT_BATCH_SIZE: int = int(os.getenv('LEDGER_IMPORT_BATCH_SIZE', '1000'))
+
     # database
     DB: str = os.getenv("DB", "postgresql")
     DB_USER: str = os.getenv("DB_USER", "admin")
@@ -53,6 +123,7 @@ class Configs(BaseSettings):
     DB_HOST: str = os.getenv("DB_HOST", "127.0.0.1")
     DB_PORT: str = os.getenv("DB_PORT", "5432")
     DB_ENGINE: str = DB_ENGINE_MAPPER.get(DB, "postgresql")
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
 
     DATABASE_URI_FORMAT: str = "{db_engine}://{user}:{password}@{host}:{port}/{database}"
 
@@ -7,9 +7,65 @@ class Settings():
     STOCK_API_TOKEN: str = configs.STOCK_API_TOKEN
     HISTORIC_STOCK_API_BASE_URL: str = configs.HISTORIC_STOCK_API_BASE_URL
     HISTORIC_STOCK_API_TOKEN: str = configs.HISTORIC_STOCK_API_TOKEN
+    HTTP_TIMEOUT: float = configs.HTTP_TIMEOUT
+    HTTP_MAX_CONNECTIONS: int = configs.HTTP_MAX_CONNECTIONS
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = configs.HTTP_MAX_KEEPALIVE_CONNECTIONS
+    HTTP_KEEPALIVE_EXPIRY: float = configs.HTTP_KEEPALIVE_EXPIRY
+    HTTP2_ENABLED: bool = configs.HTTP2_ENABLED
+    STOCK_API_RATE_LIMIT: float = configs.STOCK_API_RATE_LIMIT
+    STOCK_API_RATE_BURST: int = configs.STOCK_API_RATE_BURST
+    HISTORIC_STOCK_API_RATE_LIMIT: float = configs.HISTORIC_STOCK_API_RATE_LIMIT
+    HISTORIC_STOCK_API_RATE_BURST: int = configs.HISTORIC_STOCK_API_RATE_BURST
+    HISTORIC_FETCH_CONCURRENCY: int = configs.HISTORIC_FETCH_CONCURRENCY
+    HISTORIC_PUBLICATION_DELAY: float = configs.HISTORIC_PUBLICATION_DELAY
+    HTTP_RATE_LIMIT_RETRIES: int = configs.HTTP_RATE_LIMIT_RETRIES
+    HTTP_RETRIES: int = configs.HTTP_RETRIES
+    HTTP_RETRY_BACKOFF_BASE: float = configs.HTTP_RETRY_BACKOFF_BASE
+    HTTP_RETRY_BACKOFF_MAX: float = configs.HTTP_RETRY_BACKOFF_MAX
+    HTTP_CIRCUIT_FAILURE_THRESHOLD: int = configs.HTTP_CIRCUIT_FAILURE_THRESHOLD
+    HTTP_CIRCUIT_RECOVERY_TIMEOUT: float = configs.HTTP_CIRCUIT_RECOVERY_TIMEOUT
+    HTTP_HEDGE_ENABLED: bool = configs.HTTP_HEDGE_ENABLED
+    HTTP_HEDGE_PERCENTILE: float = configs.HTTP_HEDGE_PERCENTILE
+    QUOTE_CACHE_TTL: float = configs.QUOTE_CACHE_TTL
+    QUOTE_CACHE_STALE_TTL: float = configs.QUOTE_CACHE_STALE_TTL
+    QUOTE_CACHE_MAX_ENTRIES: int = configs.QUOTE_CACHE_MAX_ENTRIES
+    QUOTE_CACHE_MAX_BYTES: int = configs.QUOTE_CACHE_MAX_BYTES
+    QUOTES_BATCH_CONCURRENCY: int = configs.QUOTES_BATCH_CONCURRENCY
+    STOCK_POLLING_INTERVAL: float = configs.STOCK_POLLING_INTERVAL
+    STOCK_STREAM_BATCH_INTERVAL: float = configs.STOCK_STREAM_BATCH_INTERVAL
+    STOCK_STREAM_MAX_SYMBOLS: int = configs.STOCK_STREAM_MAX_SYMBOLS
+    STOCK_FEED_ENABLED: bool = configs.STOCK_FEED_ENABLED
+    STOCK_FEED_URL: str = configs.STOCK_FEED_URL
+    STOCK_FEED_PUBLISH_INTERVAL: float = configs.STOCK_FEED_PUBLISH_INTERVAL
+    STOCK_FEED_RECONNECT_BACKOFF_BASE: float = configs.STOCK_FEED_RECONNECT_BACKOFF_BASE
+    STOCK_FEED_RECONNECT_BACKOFF_MAX: float = configs.STOCK_FEED_RECONNECT_BACKOFF_MAX
+    WS_SEND_QUEUE_SIZE: int = configs.WS_SEND_QUEUE_SIZE
+    WS_SEND_TIMEOUT: float = configs.WS_SEND_TIMEOUT
+    WS_SLOW_CLIENT_POLICY: str = configs.WS_SLOW_CLIENT_POLICY
+    BROKER_BACKEND: str = configs.BROKER_BACKEND
+    BROKER_URL: str = configs.BROKER_URL
+    BROKER_PRODUCER_LEASE: float = configs.BROKER_PRODUCER_LEASE
+    BROKER_PRODUCER_LEASE_MIN: float = configs.BROKER_PRODUCER_LEASE_MIN
+    BROKER_PRODUCER_LEASE_MAX: float = configs.BROKER_PRODUCER_LEASE_MAX
+    BROKER_RECONNECT_BACKOFF_BASE: float = configs.BROKER_RECONNECT_BACKOFF_BASE
+    BROKER_RECONNECT_BACKOFF_MAX: float = configs.BROKER_RECONNECT_BACKOFF_MAX
+    SHARDING_ENABLED: bool = configs.SHARDING_ENABLED
+    SHARD_HEARTBEAT_INTERVAL: float = configs.SHARD_HEARTBEAT_INTERVAL
+    SHARD_NODE_TTL: float = configs.SHARD_NODE_TTL
+    SHARD_VIRTUAL_NODES: int = configs.SHARD_VIRTUAL_NODES
+    MARKET_TIMEZONE: str = configs.MARKET_TIMEZONE
+    MARKET_HOLIDAYS: str = configs.MARKET_HOLIDAYS
+    POLL_MIN_INTERVAL: float = configs.POLL_MIN_INTERVAL
+    POLL_MAX_INTERVAL: float = configs.POLL_MAX_INTERVAL
+    POLL_CLOSED_INTERVAL: float = configs.POLL_CLOSED_INTERVAL
+    POLL_MAX_CONCURRENCY: int = configs.POLL_MAX_CONCURRENCY
+    PORTFOLIO_MAX_SYMBOLS: int = configs.PORTFOLIO_MAX_SYMBOLS
+    LEDGER_SNAPSHOT_INTERVAL: int = configs.LEDGER_SNAPSHOT_INTERVAL
+    LEDGER_IMPORT_BATCH_SIZE: int = configs.LEDGER_IMPORT_BATCH_SIZE
     SUPABASE_URL: str = configs.SUPABASE_URL
     SUPABASE_KEY: str = configs.SUPABASE_KEY
     DATABASE_URL: str = configs.DATABASE_URI
+    DB_ECHO: bool = configs.DB_ECHO
     CORS_ORIGINS: list[str] = configs.CORS_ORIGINS
 
     # Server Configuration
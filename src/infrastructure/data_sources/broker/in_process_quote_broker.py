@@ -0,0 +1,80 @@
+import asyncio
+import os
+import socket
+from typing import Dict, Iterable, List, Set
+from src.domain.brokers.i_cluster_membership import IClusterMembership
+from src.domain.brokers.i_quote_broker import IQuoteBroker, QuoteHandler
+from src.domain.entities.stock_entities import StockQuote
+
+
+class InProcessQuoteBroker(IQuoteBroker, IClusterMembership):
+    """
+    Broker dentro del proceso: un solo worker, siempre es el productor
+    y el único miembro del cluster
+    """
+
+    def __init__(self):
+        self.node_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._handlers: Dict[str, Set[QuoteHandler]] = {}
+        self._symbols: Set[str] = set()
+
+        self.published = 0
+
+
+    async def start(self):
+        pass
+
+
+    async def stop(self):
+        self._handlers.clear()
+
+
+    async def publish(self, symbol: str, quote: StockQuote):
+        self.published += 1
+        handlers = list(self._handlers.get(symbol, ()))
+        await asyncio.gather(*[handler(symbol, quote) for handler in handlers])
+
+
+    async def subscribe(self, symbol: str, handler: QuoteHandler):
+        self._handlers.setdefault(symbol, set()).add(handler)
+
+
+    async def unsubscribe(self, symbol: str, handler: QuoteHandler):
+        handlers = self._handlers.get(symbol)
+        if handlers is None:
+            return
+        handlers.discard(handler)
+        if not handlers:
+            del self._handlers[symbol]
+
+
+    async def acquire_producer(self, symbol: str, lease: float) -> bool:
+        return True
+
+
+    async def release_producer(self, symbol: str):
+        pass
+
+
+    async def heartbeat(self, ttl: float, symbols: Iterable[str]):
+        self._symbols = set(symbols)
+
+
+    async def members(self) -> List[str]:
+        return [self.node_id]
+
+
+    async def demand(self, members: Iterable[str]) -> Set[str]:
+        return set(self._symbols)
+
+
+    async def leave(self):
+        self._symbols.clear()
+
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "channels": len(self._handlers),
+            "published": self.published,
+        }
@@ -0,0 +1,327 @@
+import asyncio
+import json
+import os
+import random
+import socket
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from src.domain.brokers.i_cluster_membership import IClusterMembership
+from src.domain.brokers.i_quote_broker import IQuoteBroker, QuoteHandler
+from src.domain.entities.stock_entities import StockQuote
+from src.infrastructure.data_sources.broker.resp import RespArg, RespError, encode_command, read_reply
+from src.infrastructure.utils.logger import setup_logger
+
+logger = setup_logger("RedisQuoteBroker")
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class RedisQuoteBroker(IQuoteBroker, IClusterMembership):
+    """
+    Broker entre workers y nodos sobre Redis (o cualquier servidor que hable
+    RESP), sin dependencias: PUBLISH/SUBSCRIBE por canal `quotes:<symbol>` y
+    un lease `SET NX PX` por símbolo para elegir un único productor. \n
+    Si Redis no responde cada nodo vuelve a producir y repartir en local,
+    así los precios siguen llegando aunque se multipliquen las llamadas. \n
+    La membresía del cluster es un sorted set `quotes:nodes` puntuado con la
+    expiración de cada heartbeat y una clave `quotes:demand:<node>` con TTL
+    que lista los símbolos suscritos en ese nodo.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://127.0.0.1:6379/0",
+        node_id: Optional[str] = None,
+        channel_prefix: str = "quotes:",
+        reconnect_backoff_base: float = 1.0,
+        reconnect_backoff_max: float = 30.0
+    ):
+        parsed = urlsplit(url)
+        self._host = parsed.hostname or "127.0.0.1"
+        self._port = parsed.port or 6379
+        self._password = parsed.password
+        self._db = int(parsed.path.lstrip("/") or 0)
+        self.node_id = node_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.channel_prefix = channel_prefix
+        self.reconnect_backoff_base = reconnect_backoff_base
+        self.reconnect_backoff_max = reconnect_backoff_max
+
+        self._handlers: Dict[str, Set[QuoteHandler]] = {}
+        self._leases: Set[str] = set()
+        self._command_connection: Optional[Connection] = None
+        self._command_lock = asyncio.Lock()
+        self._pubsub_writer: Optional[asyncio.StreamWriter] = None
+        self._listener: Optional[asyncio.Task] = None
+
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+
+
+    async def start(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+
+    async def stop(self):
+        for symbol in list(self._leases):
+            await self.release_producer(symbol)
+
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+        self._close_command_connection()
+
+
+    async def publish(self, symbol: str, quote: StockQuote):
+        message = json.dumps({
+            "p": quote.price,
+            "t": int(quote.timestamp.timestamp() * 1000),
+        })
+        try:
+            await self._command("PUBLISH", self._channel(symbol), message)
+            self.published += 1
+        except (ConnectionError, OSError, RespError) as e:
+            # sin broker el nodo reparte en local lo que produce
+            logger.warning("Publishing %s to redis failed, delivering locally: %s", symbol, e)
+            await self._dispatch(symbol, quote)
+
+
+    async def subscribe(self, symbol: str, handler: QuoteHandler):
+        handlers = self._handlers.setdefault(symbol, set())
+        handlers.add(handler)
+        if len(handlers) == 1:
+            await self._pubsub_send("SUBSCRIBE", self._channel(symbol))
+
+
+    async def unsubscribe(self, symbol: str, handler: QuoteHandler):
+        handlers = self._handlers.get(symbol)
+        if handlers is None:
+            return
+        handlers.discard(handler)
+        if not handlers:
+            del self._handlers[symbol]
+            await self._pubsub_send("UNSUBSCRIBE", self._channel(symbol))
+
+
+    async def acquire_producer(self, symbol: str, lease: float) -> bool:
+        key = self._lease_key(symbol)
+        lease_ms = max(1, int(lease * 1000))
+        try:
+            if await self._command("SET", key, self.node_id, "NX", "PX", lease_ms) == "OK":
+                self._leases.add(symbol)
+                return True
+
+            # GET + PEXPIRE no es atómico: en el peor caso dos nodos producen
+            # durante un ciclo y el siguiente GET corrige
+            owner = await self._command("GET", key)
+            if owner is not None and owner.decode() == self.node_id:
+                await self._command("PEXPIRE", key, lease_ms)
+                self._leases.add(symbol)
+                return True
+        except (ConnectionError, OSError, RespError) as e:
+            logger.warning("Producer lease of %s unavailable, producing locally: %s", symbol, e)
+            return True
+
+        self._leases.discard(symbol)
+        return False
+
+
+    async def release_producer(self, symbol: str):
+        if symbol not in self._leases:
+            return
+        self._leases.discard(symbol)
+        key = self._lease_key(symbol)
+        try:
+            owner = await self._command("GET", key)
+            if owner is not None and owner.decode() == self.node_id:
+                await self._command("DEL", key)
+        except (ConnectionError, OSError, RespError) as e:
+            logger.warning("Could not release producer lease of %s: %s", symbol, e)
+
+
+    async def heartbeat(self, ttl: float, symbols: Iterable[str]):
+        ttl_ms = max(1, int(ttl * 1000))
+        await self._command("ZADD", self._nodes_key, int(time.time() * 1000) + ttl_ms, self.node_id)
+        await self._command("SET", self._demand_key(self.node_id), json.dumps(sorted(symbols)), "PX", ttl_ms)
+
+
+    async def members(self) -> List[str]:
+        now_ms = int(time.time() * 1000)
+        await self._command("ZREMRANGEBYSCORE", self._nodes_key, "-inf", now_ms)
+        members = await self._command("ZRANGEBYSCORE", self._nodes_key, now_ms, "+inf")
+        return sorted(member.decode() for member in members)
+
+
+    async def demand(self, members: Iterable[str]) -> Set[str]:
+        keys = [self._demand_key(member) for member in members]
+        if not keys:
+            return set()
+        symbols: Set[str] = set()
+        for value in await self._command("MGET", *keys):
+            if value is not None:
+                symbols.update(json.loads(value))
+        return symbols
+
+
+    async def leave(self):
+        try:
+            await self._command("ZREM", self._nodes_key, self.node_id)
+            await self._command("DEL", self._demand_key(self.node_id))
+        except (ConnectionError, OSError, RespError) as e:
+            logger.warning("Could not leave the cluster: %s", e)
+
+
+    @property
+    def _nodes_key(self) -> str:
+        return f"{self.channel_prefix}nodes"
+
+
+    def _demand_key(self, node_id: str) -> str:
+        return f"{self.channel_prefix}demand:{node_id}"
+
+
+    def _channel(self, symbol: str) -> str:
+        return f"{self.channel_prefix}{symbol}"
+
+
+    def _lease_key(self, symbol: str) -> str:
+        return f"{self.channel_prefix}producer:{symbol}"
+
+
+    async def _connect(self) -> Connection:
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        setup: List[Tuple[RespArg, ...]] = []
+        if self._password:
+            setup.append(("AUTH", self._password))
+        if self._db:
+            setup.append(("SELECT", self._db))
+        for command in setup:
+            writer.write(encode_command(*command))
+            reply = await read_reply(reader)
+            if isinstance(reply, RespError):
+                writer.close()
+                raise reply
+        return reader, writer
+
+
+    async def _command(self, *args: RespArg):
+        async with self._command_lock:
+            for attempt in range(2):
+                try:
+                    if self._command_connection is None:
+                        self._command_connection = await self._connect()
+                    reader, writer = self._command_connection
+                    writer.write(encode_command(*args))
+                    await writer.drain()
+                    reply = await read_reply(reader)
+                    break
+                except (ConnectionError, OSError, asyncio.IncompleteReadError) as e:
+                    self.errors += 1
+                    self._close_command_connection()
+                    # una conexión cortada se reintenta una vez con una nueva
+                    if attempt:
+                        raise ConnectionError(str(e)) from e
+                except BaseException:
+                    # cancelada entre escribir y leer, la respuesta pendiente
+                    # la leería la siguiente orden como propia
+                    self._close_command_connection()
+                    raise
+
+        if isinstance(reply, RespError):
+            self.errors += 1
+            raise reply
+        return reply
+
+
+    def _close_command_connection(self):
+        if self._command_connection is not None:
+            self._command_connection[1].close()
+            self._command_connection = None
+
+
+    async def _pubsub_send(self, *args: RespArg):
+        # sin conexión la suscripción queda en `_handlers`, que se reenvía
+        # entero al conectar
+        if self._pubsub_writer is None:
+            return
+        try:
+            self._pubsub_writer.write(encode_command(*args))
+            await self._pubsub_writer.drain()
+        except (ConnectionError, OSError) as e:
+            logger.warning("Could not send %s: %s", args[0], e)
+
+
+    async def _listen(self):
+        attempt = 0
+        while True:
+            writer = None
+            try:
+                reader, writer = await self._connect()
+                # la conexión se publica y los canales se leen sin ceder el
+                # control entre medias: una suscripción llega aquí o se envía
+                # directamente, nunca se pierde
+                self._pubsub_writer = writer
+                channels = [self._channel(symbol) for symbol in self._handlers]
+                if channels:
+                    writer.write(encode_command("SUBSCRIBE", *channels))
+                    await writer.drain()
+                attempt = 0
+                logger.info("Redis broker connected, %d channels", len(channels))
+
+                while True:
+                    reply = await read_reply(reader)
+                    if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                        await self._on_message(reply[1].decode(), reply[2])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.warning("Redis broker disconnected: %s", e)
+            finally:
+                self._pubsub_writer = None
+                if writer is not None:
+                    writer.close()
+
+            attempt += 1
+            delay = random.uniform(0, min(self.reconnect_backoff_max, self.reconnect_backoff_base * 2 ** attempt))
+            await asyncio.sleep(delay)
+
+
+    async def _on_message(self, channel: str, payload: bytes):
+        symbol = channel.removeprefix(self.channel_prefix)
+        try:
+            message = json.loads(payload)
+            quote = StockQuote(
+                price=message["p"],
+                timestamp=datetime.fromtimestamp(message["t"] / 1000)
+            )
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Invalid quote message on %s", channel)
+            return
+        self.received += 1
+        await self._dispatch(symbol, quote)
+
+
+    async def _dispatch(self, symbol: str, quote: StockQuote):
+        handlers = list(self._handlers.get(symbol, ()))
+        await asyncio.gather(*[handler(symbol, quote) for handler in handlers])
+
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "connected": int(self._pubsub_writer is not None),
+            "channels": len(self._handlers),
+            "leases": len(self._leases),
+            "published": self.published,
+            "received": self.received,
+            "errors": self.errors,
+        }
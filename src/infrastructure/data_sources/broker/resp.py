@@ -0,0 +1,69 @@
+"""
+Lo mínimo del protocolo RESP2 de Redis que usan el broker y su servidor
+de pruebas: comandos como arrays de bulk strings y lectura de respuestas.
+"""
+import asyncio
+from typing import Any, Union
+
+RespArg = Union[str, bytes, int, float]
+
+
+class RespError(Exception):
+    pass
+
+
+def encode_command(*args: RespArg) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+def encode_reply(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RespError):
+        return b"-%s\r\n" % str(value).encode()
+    if isinstance(value, bool):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, (list, tuple)):
+        return b"*%d\r\n" % len(value) + b"".join(encode_reply(item) for item in value)
+    if value == "OK" or value == "PONG":
+        return b"+%s\r\n" % value.encode()
+    if isinstance(value, str):
+        value = value.encode()
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """
+    Reads one RESP value, bulk strings are returned as `bytes` \n
+    Error replies are returned (not raised) as `RespError`
+    """
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("connection closed by peer")
+    kind, payload = line[:1], line[1:-2]
+
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        return RespError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RespError(f"unexpected reply type {kind!r}")
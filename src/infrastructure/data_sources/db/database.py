@@ -11,8 +11,8 @@ logger = setup_logger("Database")
 Base = declarative_base()
 
 class Database:
-    def __init__(self, db_url: str) -> None:
-        self._engine = create_engine(db_url, echo=True)
+    def __init__(self, db_url: str, echo: bool = False) -> None:
+        self._engine = create_engine(db_url, echo=echo)
         self._session_factory = orm.scoped_session(
             orm.sessionmaker(
                 autocommit=False,
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, String, UUID
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String, UUID
 from src.infrastructure.data_sources.db.database import Base
 from datetime import datetime
 
@@ -20,4 +20,103 @@ class User(Base):
                f"last_name=\"{self.last_name}\", " \
                f"profile_pic=\"{self.profile_pic}\", " \
                f"created_at={self.created_at}, " \
-               f"updated_at={self.updated_at})>"
\ No newline at end of file
+               f"updated_at={self.updated_at})>"
+
+class LedgerTransaction(Base):
+    __tablename__ = "ledger_transaction"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(UUID, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    symbol = Column(String, nullable=False)
+    type = Column(String, nullable=False)
+    timestamp = Column(BigInteger, nullable=False)
+    quantity = Column(Float, nullable=False)
+    price = Column(Float, nullable=False, default=0.0)
+    fee = Column(Float, nullable=False, default=0.0)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    __table_args__ = (
+        Index("ix_ledger_transaction_user", "user_id", "id"),
+    )
+
+    def __repr__(self):
+        return f"<LedgerTransaction(id={self.id}, " \
+               f"user_id={self.user_id}, " \
+               f"symbol=\"{self.symbol}\", " \
+               f"type=\"{self.type}\", " \
+               f"timestamp={self.timestamp}, " \
+               f"quantity={self.quantity}, " \
+               f"price={self.price})>"
+
+
+class LedgerSnapshot(Base):
+    __tablename__ = "ledger_snapshot"
+
+    user_id = Column(UUID, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    last_transaction_id = Column(BigInteger, nullable=False)
+    timestamp = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    def __repr__(self):
+        return f"<LedgerSnapshot(user_id={self.user_id}, " \
+               f"last_transaction_id={self.last_transaction_id}, " \
+               f"timestamp={self.timestamp})>"
+
+
+class LedgerSnapshotPosition(Base):
+    __tablename__ = "ledger_snapshot_position"
+
+    user_id = Column(UUID, ForeignKey("ledger_snapshot.user_id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    symbol = Column(String, primary_key=True, nullable=False)
+    quantity = Column(Float, nullable=False)
+    cost_basis = Column(Float, nullable=False)
+    realized_pnl = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<LedgerSnapshotPosition(user_id={self.user_id}, " \
+               f"symbol=\"{self.symbol}\", " \
+               f"quantity={self.quantity}, " \
+               f"cost_basis={self.cost_basis})>"
+
+class StockBar(Base):
+    __tablename__ = "stock_bar"
+
+    symbol = Column(String, primary_key=True, nullable=False)
+    timespan = Column(String, primary_key=True, nullable=False)
+    adjusted = Column(Boolean, primary_key=True, nullable=False)
+    timestamp = Column(BigInteger, primary_key=True, nullable=False)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<StockBar(symbol=\"{self.symbol}\", " \
+               f"timespan=\"{self.timespan}\", " \
+               f"adjusted={self.adjusted}, " \
+               f"timestamp={self.timestamp}, " \
+               f"close={self.close})>"
+
+
+class StockBarCoverage(Base):
+    __tablename__ = "stock_bar_coverage"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String, nullable=False)
+    timespan = Column(String, nullable=False)
+    adjusted = Column(Boolean, nullable=False)
+    from_timestamp = Column(BigInteger, nullable=False)
+    to_timestamp = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    __table_args__ = (
+        Index("ix_stock_bar_coverage_series", "symbol", "timespan", "adjusted"),
+    )
+
+    def __repr__(self):
+        return f"<StockBarCoverage(symbol=\"{self.symbol}\", " \
+               f"timespan=\"{self.timespan}\", " \
+               f"adjusted={self.adjusted}, " \
+               f"from_timestamp={self.from_timestamp}, " \
+               f"to_timestamp={self.to_timestamp})>"
@@ -0,0 +1,134 @@
+import threading
+from contextlib import AbstractContextManager
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import delete, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.infrastructure.data_sources.db.models import StockBar, StockBarCoverage
+from src.domain.repositories.i_bar_repository import IBarRepository
+from src.domain.entities.bar_series import BAR_COLUMNS, BarSeries
+from src.infrastructure.utils.intervals import merge_intervals
+from src.infrastructure.utils.logger import setup_logger
+
+logger = setup_logger('bar_db_repository')
+
+class BarDBRepository(IBarRepository):
+    def __init__(self, session_factory: Callable[..., AbstractContextManager[Session]]) -> None:
+        self.session_factory = session_factory
+        # serializa las escrituras de este proceso: dos descargas del mismo
+        # hueco reemplazan el rango una después de la otra
+        self._write_lock = threading.Lock()
+
+
+    def get_coverage(self, symbol: str, timespan: str, adjusted: bool) -> List[Tuple[int, int]]:
+        with self.session_factory() as session:
+            rows = session.query(
+                StockBarCoverage.from_timestamp,
+                StockBarCoverage.to_timestamp
+            ).filter(
+                StockBarCoverage.symbol == symbol,
+                StockBarCoverage.timespan == timespan,
+                StockBarCoverage.adjusted == adjusted
+            ).all()
+            return merge_intervals((row.from_timestamp, row.to_timestamp) for row in rows)
+
+
+    def get_series(
+        self,
+        symbol: str,
+        timespan: str,
+        adjusted: bool,
+        from_timestamp: int,
+        to_timestamp: int,
+        limit: Optional[int] = None
+    ) -> BarSeries:
+        with self.session_factory() as session:
+            query = session.query(
+                StockBar.timestamp,
+                StockBar.open,
+                StockBar.high,
+                StockBar.low,
+                StockBar.close,
+                StockBar.volume
+            ).filter(
+                StockBar.symbol == symbol,
+                StockBar.timespan == timespan,
+                StockBar.adjusted == adjusted,
+                StockBar.timestamp >= from_timestamp,
+                StockBar.timestamp <= to_timestamp
+            ).order_by(StockBar.timestamp)
+            rows = query.limit(limit).all() if limit else query.all()
+            # sin un objeto por barra: las filas van directo a columnas
+            return BarSeries.from_rows(rows)
+
+
+    def save_series(
+        self,
+        symbol: str,
+        timespan: str,
+        adjusted: bool,
+        from_timestamp: int,
+        to_timestamp: int,
+        bars: BarSeries
+    ) -> None:
+        series = (
+            StockBarCoverage.symbol == symbol,
+            StockBarCoverage.timespan == timespan,
+            StockBarCoverage.adjusted == adjusted
+        )
+
+        with self._write_lock, self.session_factory() as session:
+            try:
+                session.execute(
+                    delete(StockBar).where(
+                        StockBar.symbol == symbol,
+                        StockBar.timespan == timespan,
+                        StockBar.adjusted == adjusted,
+                        StockBar.timestamp >= from_timestamp,
+                        StockBar.timestamp <= to_timestamp
+                    )
+                )
+                if len(bars):
+                    session.execute(
+                        insert(StockBar),
+                        [
+                            {
+                                "symbol": symbol,
+                                "timespan": timespan,
+                                "adjusted": adjusted,
+                                **dict(zip(BAR_COLUMNS, values))
+                            } for values in zip(*bars.to_columns().values())
+                        ]
+                    )
+
+                # fusiona el nuevo rango con los rangos ya cubiertos. Solo se
+                # borran las filas bloqueadas: las que otro worker inserte a la
+                # vez sobreviven y `get_coverage` las fusiona al leer
+                coverage = session.query(StockBarCoverage).filter(*series).with_for_update().all()
+                merged = merge_intervals(
+                    [(row.from_timestamp, row.to_timestamp) for row in coverage] +
+                    [(from_timestamp, to_timestamp)]
+                )
+                if coverage:
+                    session.execute(
+                        delete(StockBarCoverage).where(StockBarCoverage.id.in_([row.id for row in coverage]))
+                    )
+                session.execute(
+                    insert(StockBarCoverage),
+                    [
+                        {
+                            "symbol": symbol,
+                            "timespan": timespan,
+                            "adjusted": adjusted,
+                            "from_timestamp": start,
+                            "to_timestamp": end,
+                        } for start, end in merged
+                    ]
+                )
+                session.commit()
+            except IntegrityError as e:
+                # otro proceso guardó el mismo rango en paralelo
+                logger.warning(f"Bars for {symbol}/{timespan} already stored: {e}")
+                session.rollback()
@@ -0,0 +1,145 @@
+from contextlib import AbstractContextManager
+from itertools import batched
+from typing import Callable, Iterable, List, Optional
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.orm import Session
+
+from src.infrastructure.data_sources.db.models import LedgerSnapshot, LedgerSnapshotPosition, LedgerTransaction
+from src.domain.repositories.i_ledger_repository import ILedgerRepository
+from src.domain.entities.portfolio_entities import LedgerEntry, LedgerPosition, Transaction
+from src.domain.entities.portfolio_entities import LedgerSnapshot as LedgerSnapshotEntity
+from src.infrastructure.utils.logger import setup_logger
+
+logger = setup_logger('ledger_db_repository')
+
+class LedgerDBRepository(ILedgerRepository):
+    def __init__(
+        self,
+        session_factory: Callable[..., AbstractContextManager[Session]],
+        batch_size: int = 1000
+    ) -> None:
+        self.session_factory = session_factory
+        self._batch_size = batch_size
+
+
+    def add_transactions(self, user_id: str, transactions: Iterable[Transaction]) -> int:
+        with self.session_factory() as session:
+            count = 0
+            oldest = None
+            # un executemany por lote: un import grande no vive entero en memoria
+            for batch in batched(transactions, self._batch_size):
+                session.execute(
+                    insert(LedgerTransaction),
+                    [
+                        {
+                            "user_id": user_id,
+                            "symbol": item.symbol.strip().upper(),
+                            "type": item.type.value,
+                            "timestamp": item.timestamp,
+                            "quantity": item.quantity,
+                            "price": item.price,
+                            "fee": item.fee,
+                        } for item in batch
+                    ]
+                )
+                count += len(batch)
+                batch_oldest = min(item.timestamp for item in batch)
+                oldest = batch_oldest if oldest is None else min(oldest, batch_oldest)
+
+            if count:
+                # una transacción anterior a la foto cambia el orden de la réplica
+                stale = session.query(LedgerSnapshot.user_id).filter(
+                    LedgerSnapshot.user_id == user_id,
+                    LedgerSnapshot.timestamp > oldest
+                ).first()
+                if stale:
+                    self._delete_snapshot(session, user_id)
+            session.commit()
+            logger.info(f"Stored {count} ledger transactions for user {user_id}")
+            return count
+
+
+    def get_entries(self, user_id: str, after_id: int = 0) -> List[LedgerEntry]:
+        with self.session_factory() as session:
+            rows = session.query(
+                LedgerTransaction.id,
+                LedgerTransaction.symbol,
+                LedgerTransaction.type,
+                LedgerTransaction.timestamp,
+                LedgerTransaction.quantity,
+                LedgerTransaction.price,
+                LedgerTransaction.fee
+            ).filter(
+                LedgerTransaction.user_id == user_id,
+                LedgerTransaction.id > after_id
+            ).order_by(LedgerTransaction.timestamp, LedgerTransaction.id).all()
+            return [
+                LedgerEntry(
+                    id=row.id,
+                    symbol=row.symbol,
+                    type=row.type,
+                    timestamp=row.timestamp,
+                    quantity=row.quantity,
+                    price=row.price,
+                    fee=row.fee
+                ) for row in rows
+            ]
+
+
+    def get_snapshot(self, user_id: str) -> Optional[LedgerSnapshotEntity]:
+        with self.session_factory() as session:
+            snapshot = session.query(LedgerSnapshot).filter(LedgerSnapshot.user_id == user_id).first()
+            if not snapshot:
+                return None
+            positions = session.query(LedgerSnapshotPosition).filter(
+                LedgerSnapshotPosition.user_id == user_id
+            ).all()
+            return LedgerSnapshotEntity(
+                last_transaction_id=snapshot.last_transaction_id,
+                timestamp=snapshot.timestamp,
+                positions=[
+                    LedgerPosition(
+                        symbol=position.symbol,
+                        quantity=position.quantity,
+                        cost_basis=position.cost_basis,
+                        realized_pnl=position.realized_pnl
+                    ) for position in positions
+                ]
+            )
+
+
+    def save_snapshot(self, user_id: str, snapshot: LedgerSnapshotEntity) -> None:
+        with self.session_factory() as session:
+            # otra inserción pudo invalidar lo replicado mientras tanto
+            late_entries = session.query(func.count(LedgerTransaction.id)).filter(
+                LedgerTransaction.user_id == user_id,
+                LedgerTransaction.id > snapshot.last_transaction_id,
+                LedgerTransaction.timestamp < snapshot.timestamp
+            ).scalar()
+            if late_entries:
+                return
+
+            self._delete_snapshot(session, user_id)
+            session.execute(
+                insert(LedgerSnapshot),
+                [{
+                    "user_id": user_id,
+                    "last_transaction_id": snapshot.last_transaction_id,
+                    "timestamp": snapshot.timestamp,
+                }]
+            )
+            if snapshot.positions:
+                session.execute(
+                    insert(LedgerSnapshotPosition),
+                    [
+                        {"user_id": user_id, **position.model_dump()}
+                        for position in snapshot.positions
+                    ]
+                )
+            session.commit()
+
+
+    def _delete_snapshot(self, session: Session, user_id: str) -> None:
+        session.execute(delete(LedgerSnapshotPosition).where(LedgerSnapshotPosition.user_id == user_id))
+        session.execute(delete(LedgerSnapshot).where(LedgerSnapshot.user_id == user_id))
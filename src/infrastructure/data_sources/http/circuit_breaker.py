@@ -0,0 +1,107 @@
+import time
+from enum import Enum
+from typing import Dict, Union
+
+from src.infrastructure.utils.logger import setup_logger
+
+logger = setup_logger("CircuitBreaker")
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str, retry_in: float):
+        self.retry_in = retry_in
+        super().__init__(f"Circuit for {name} is open, retry in {retry_in:.1f}s")
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por host. \n
+    Tras `failure_threshold` fallos seguidos el circuito se abre y las
+    llamadas fallan de inmediato durante `recovery_timeout` segundos;
+    luego deja pasar una llamada de prueba (half open) y se cierra si
+    tiene éxito.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and self._retry_in() <= 0:
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def before_call(self):
+        """
+        Raises `CircuitOpenError` if the call must not reach the upstream
+        """
+        if not self.enabled:
+            return
+
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return
+
+        if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._state = CircuitState.HALF_OPEN
+            self._probe_in_flight = True
+            return
+
+        self.rejected += 1
+        raise CircuitOpenError(self.name, max(self._retry_in(), 0.0))
+
+    def record_success(self):
+        if self._state != CircuitState.CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._failures += 1
+        self._probe_in_flight = False
+        if self.enabled and (
+            self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold
+        ):
+            if self._state != CircuitState.OPEN:
+                self.opened += 1
+                logger.warning(f"Circuit for {self.name} opened after {self._failures} failures")
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self):
+        """
+        Frees the half open probe when the call was cancelled without a result
+        """
+        self._probe_in_flight = False
+
+    def _retry_in(self) -> float:
+        return self._opened_at + self.recovery_timeout - time.monotonic()
+
+    @property
+    def metrics(self) -> Dict[str, Union[str, int]]:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
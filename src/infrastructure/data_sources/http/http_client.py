@@ -1,33 +1,110 @@
-from typing import Optional, Dict, Any
+import asyncio
+import importlib.util
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, AsyncIterator
 import httpx
 from fastapi import HTTPException
 
-from src.infrastructure.utils.logger import setup_logger
+from src.infrastructure.data_sources.http.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.infrastructure.data_sources.http.latency_tracker import LatencyTracker
+from src.infrastructure.data_sources.http.rate_limiter import RateLimiter, RequestPriority
+from src.infrastructure.utils.logger import Truncated, setup_logger
+from src.infrastructure.utils.single_flight import SingleFlight
 
 logger = setup_logger("HTTPClient")
 
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
+
 class HTTPClient:
     def __init__(
         self,
         base_url: str,
         headers: Optional[Dict[str, str]] = None,
         params: Optional[Dict[str, str]] = None,
-        timeout: float = 30.0
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        rate_limit_retries: int = 2,
+        retries: int = 2,
+        retry_backoff_base: float = 0.2,
+        retry_backoff_max: float = 5.0,
+        circuit_failure_threshold: int = 5,
+        circuit_recovery_timeout: float = 30.0,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95
     ):
         self.base_url = base_url.rstrip('/')
         self.headers = headers or {}
         self.timeout = timeout
         self.params = params or {}
-        self._client = None
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2 and self._http2_available()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._single_flight = SingleFlight()
+        self._rate_limiter = rate_limiter
+        self.rate_limit_retries = rate_limit_retries
+        self.retries = retries
+        self.retry_backoff_base = retry_backoff_base
+        self.retry_backoff_max = retry_backoff_max
+        self._circuit_breaker = CircuitBreaker(
+            self.base_url,
+            failure_threshold=circuit_failure_threshold,
+            recovery_timeout=circuit_recovery_timeout
+        )
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self._latency = LatencyTracker()
+        self.retried = 0
+        self.hedged = 0
+        self.hedge_wins = 0
         logger.info("************[Client Started]************")
 
-    async def set_client(self):
-        self._client = httpx.AsyncClient(
-            base_url=self.base_url,
-            headers=self.headers,
-            timeout=self.timeout,
-            params=self.params
-        )
+    @staticmethod
+    def _http2_available() -> bool:
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed, falling back to HTTP/1.1")
+            return False
+        return True
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # El cliente es compartido por todas las corrutinas: httpx.AsyncClient
+        # es seguro para uso concurrente y reutiliza las conexiones del pool.
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=self.timeout,
+                params=self.params,
+                limits=self.limits,
+                http2=self.http2
+            )
+        return self._client
+
+    async def start(self):
+        self._get_client()
+
+    async def close(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("************[Client Closed]************")
+        self._client = None
+
+    def _url(self, path: Optional[str]) -> str:
+        if not path:
+            return self.base_url
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}{path}"
 
     async def _make_request(
         self,
@@ -36,63 +113,265 @@ class HTTPClient:
         params: Optional[Dict[str, str]] = None,
         body: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
+        priority: Optional[RequestPriority] = None,
         **kwargs
     ) -> Any:
-        if self._client is None:
-            await self.set_client()
+        try:
+            logger.info("[%s] %s params=%s", method, Truncated(self._url(path)), Truncated(params))
+            logger.debug("Body: %s Extra Headers: %s Kwargs: %s", Truncated(body), Truncated(headers), Truncated(kwargs))
+
+            response = await self._send_with_retries(
+                method=method,
+                url=self._url(path),
+                priority=priority,
+                params=params,
+                json=body,
+                headers=headers,
+                **kwargs
+            )
+            response.raise_for_status()
+            result = response.json()
+
+            # el cuerpo completo solo en DEBUG y recortado: puede pesar megas
+            logger.debug("[Response] %s", Truncated(result))
+
+            return result
+        except CircuitOpenError as e:
+            logger.error("Error en la llamada a la API: %s", e)
+            raise HTTPException(
+                status_code=503,
+                detail=f"Error en la llamada a la API: {str(e)}"
+            )
+        except httpx.HTTPError as e:
+            logger.error("Error en la llamada a la API: %s", e)
+            raise HTTPException(
+                status_code=e.response.status_code if hasattr(e, 'response') else 500,
+                detail=f"Error en la llamada a la API: {str(e)}"
+            )
+
+    async def _send_with_retries(
+        self,
+        method: str,
+        url: str,
+        priority: Optional[RequestPriority] = None,
+        **kwargs
+    ) -> httpx.Response:
+        # solo los métodos idempotentes se reintentan
+        retries = self.retries if method in IDEMPOTENT_METHODS else 0
+        attempt = 0
 
-        async with self._client as client:
+        while True:
             try:
-                logger.info(f"************[{method}]************")
-                logger.info(f"URL: {self.base_url}{path}" if path else self.base_url)
-                logger.info(f"Extra Params: {params}")
-                logger.info(f"Body: {body}")
-                logger.info(f"Extra Headers: {headers}")
-                logger.info(f"Kwargs: {kwargs}")
-
-                response = await client.request(
-                    method=method,
-                    url=f"{self.base_url}{path}" if path else self.base_url,
-                    params=params,
-                    json=body,
-                    headers=headers,
-                    **kwargs
-                )
-                response.raise_for_status()
-                result = response.json()
-
-                logger.info("************[Response]************")
-                logger.info(f"{result}")
-                logger.info("************[End]************")
-
-                return result
-            except httpx.HTTPError as e:
-                logger.error("************[Error]************")
-                logger.error(f"Error en la llamada a la API: {str(e)}")
-                logger.error("************[End]************")
-                raise HTTPException(
-                    status_code=e.response.status_code if hasattr(e, 'response') else 500,
-                    detail=f"Error en la llamada a la API: {str(e)}"
-                )
-            finally:
-                logger.info("************[Client Closed]************")
-                await client.aclose()
-                self._client = None
+                response = await self._send_guarded(method, url, priority, **kwargs)
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= retries:
+                    return response
+                reason = f"status {response.status_code}"
+            except httpx.TransportError as e:
+                if attempt >= retries:
+                    raise
+                reason = repr(e)
+
+            attempt += 1
+            self.retried += 1
+            # backoff exponencial con full jitter
+            delay = random.uniform(0, min(self.retry_backoff_max, self.retry_backoff_base * 2 ** attempt))
+            logger.warning("Retrying %s %s in %.2fs (%d/%d): %s", method, url, delay, attempt, retries, reason)
+            await asyncio.sleep(delay)
+
+    async def _send_guarded(
+        self,
+        method: str,
+        url: str,
+        priority: Optional[RequestPriority] = None,
+        **kwargs
+    ) -> httpx.Response:
+        self._circuit_breaker.before_call()
+        try:
+            if method == "GET" and self.hedge:
+                response = await self._send_hedged(method, url, priority, **kwargs)
+            else:
+                response = await self._send(method, url, priority, **kwargs)
+        except httpx.TransportError:
+            self._circuit_breaker.record_failure()
+            raise
+        except BaseException:
+            self._circuit_breaker.release()
+            raise
+
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            self._circuit_breaker.record_failure()
+        else:
+            self._circuit_breaker.record_success()
+        return response
+
+    async def _send_hedged(
+        self,
+        method: str,
+        url: str,
+        priority: Optional[RequestPriority] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Sends a duplicate request if the first one takes longer than the
+        recent latency percentile and returns whichever finishes first
+        """
+        hedge_delay = self._latency.percentile(self.hedge_percentile)
+        if hedge_delay is None:
+            return await self._send(method, url, priority, **kwargs)
+
+        tasks = [asyncio.ensure_future(self._send(method, url, priority, **kwargs))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if done:
+                return tasks[0].result()
+
+            self.hedged += 1
+            tasks.append(asyncio.ensure_future(self._send(method, url, priority, **kwargs)))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is tasks[1]:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        priority: Optional[RequestPriority] = None,
+        **kwargs
+    ) -> httpx.Response:
+        client = self._get_client()
+        attempt = 0
+
+        while True:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire(priority)
+
+            started_at = time.monotonic()
+            response = await client.request(method=method, url=url, **kwargs)
+            self._latency.record(time.monotonic() - started_at)
+
+            if self._rate_limiter is None:
+                return response
+
+            delay = self._rate_limit_delay(response)
+            if delay is not None:
+                self._rate_limiter.backoff(delay)
+
+            # 429: se espera lo que indica el upstream y se reintenta
+            if response.status_code != 429 or attempt >= self.rate_limit_retries:
+                return response
+            attempt += 1
+
+    @staticmethod
+    def _rate_limit_delay(response: httpx.Response) -> Optional[float]:
+        """
+        Returns how many seconds to wait before calling the upstream again,
+        based on `Retry-After` or the `X-Ratelimit-*` headers
+        """
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                try:
+                    return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0.0)
+                except (TypeError, ValueError):
+                    pass
+
+        remaining = response.headers.get("X-Ratelimit-Remaining")
+        reset = response.headers.get("X-Ratelimit-Reset")
+        if reset is not None and (remaining == "0" or response.status_code == 429):
+            try:
+                return max(float(reset) - time.time(), 0.0)
+            except ValueError:
+                pass
+
+        if response.status_code == 429:
+            return 1.0
+        return None
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "single_flight": self._single_flight.metrics,
+            "rate_limiter": self._rate_limiter.metrics if self._rate_limiter else None,
+            "circuit_breaker": self._circuit_breaker.metrics,
+            "retried": self.retried,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "latency_p95": self._latency.percentile(0.95),
+        }
+
+    @staticmethod
+    def _request_key(
+        method: str,
+        path: Optional[str],
+        params: Optional[Dict[str, str]],
+        headers: Optional[Dict[str, str]]
+    ) -> tuple:
+        return (
+            method,
+            path,
+            tuple(sorted((params or {}).items())),
+            tuple(sorted((headers or {}).items())),
+        )
 
     async def get(
         self,
         path: Optional[str] = None,
         params: Optional[Dict[str, str]] = None,
         headers: Optional[Dict[str, str]] = None,
+        coalesce: bool = True,
         **kwargs
     ) -> Any:
-        return await self._make_request(
-            "GET",
-            path,
-            params=params,
-            headers=headers,
-            **kwargs
-        )
+        def request():
+            return self._make_request(
+                "GET",
+                path,
+                params=params,
+                headers=headers,
+                **kwargs
+            )
+
+        # GET idénticos concurrentes comparten una sola llamada al upstream
+        if not coalesce or kwargs:
+            return await request()
+
+        key = self._request_key("GET", path, params, headers)
+        return await self._single_flight.do(key, request)
+
+    async def get_pages(
+        self,
+        path: Optional[str] = None,
+        params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        next_page_key: str = "next_url"
+    ) -> AsyncIterator[Any]:
+        """
+        Yields every page of a paginated GET, following the url found in
+        `next_page_key` until a response does not have one
+        """
+        while True:
+            page = await self.get(path, params=params, headers=headers)
+            yield page
+
+            next_url = page.get(next_page_key) if isinstance(page, dict) else None
+            if not next_url:
+                return
+
+            # la url del cursor ya incluye todos los query params de la consulta
+            path = next_url[len(self.base_url):] if next_url.startswith(self.base_url) else next_url
+            params = None
 
     async def post(
         self,
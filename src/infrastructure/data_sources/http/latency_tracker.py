@@ -0,0 +1,24 @@
+from collections import deque
+from typing import Optional
+
+
+class LatencyTracker:
+    """
+    Guarda las últimas `window` latencias (en segundos) para estimar percentiles
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Returns the `q` percentile (0-1) or `None` while there are not enough samples
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
@@ -0,0 +1,160 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.infrastructure.utils.logger import setup_logger
+
+logger = setup_logger("RateLimiter")
+
+
+class RequestPriority(IntEnum):
+    """
+    Prioridad de una llamada al upstream, los valores menores salen antes
+    """
+    INTERACTIVE = 0
+    BACKGROUND = 1
+    PREFETCH = 2
+
+
+_current_priority: ContextVar[RequestPriority] = ContextVar(
+    "request_priority", default=RequestPriority.INTERACTIVE
+)
+
+
+def current_priority() -> RequestPriority:
+    return _current_priority.get()
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """
+    Sets the priority of every upstream call made inside the block \n
+    Tasks created inside the block inherit it
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class RateLimiter:
+    """
+    Token bucket por upstream con cola de prioridad. \n
+    - `rate`: tokens por segundo (`0` desactiva el límite). \n
+    - `burst`: capacidad máxima del bucket. \n
+    Cuando no hay tokens, las llamadas esperan en la cola y se despachan
+    por prioridad y luego por orden de llegada.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._sequence = itertools.count()
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        self.granted = 0
+        self.queued = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    async def acquire(self, priority: Optional[RequestPriority] = None):
+        if not self.enabled:
+            return
+
+        if priority is None:
+            priority = current_priority()
+
+        self._refill()
+        if not self._waiters and not self._is_paused() and self._tokens >= 1:
+            self._tokens -= 1
+            self._record_grant(0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters,
+            (int(priority), next(self._sequence), time.monotonic(), future)
+        )
+        self.queued += 1
+        self._ensure_dispatcher()
+        await future
+
+    def backoff(self, delay: float):
+        """
+        Stops granting tokens for `delay` seconds, used when the upstream
+        answers 429 or reports its quota as exhausted
+        """
+        self.throttled += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        # el bucket vuelve a llenarse recién desde el final de la pausa
+        self._tokens = 0.0
+        self._updated_at = self._paused_until
+        logger.warning(f"Upstream rate limit reached, pausing for {delay:.2f}s")
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def _dispatch(self):
+        while self._waiters:
+            now = time.monotonic()
+            if self._is_paused(now):
+                await asyncio.sleep(self._paused_until - now)
+                continue
+
+            self._refill(now)
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+
+            _, _, enqueued_at, future = heapq.heappop(self._waiters)
+            # el llamador se canceló mientras esperaba
+            if future.done():
+                continue
+
+            self._tokens -= 1
+            self._record_grant(now - enqueued_at)
+            future.set_result(None)
+
+    def _refill(self, now: Optional[float] = None):
+        now = now or time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def _is_paused(self, now: Optional[float] = None) -> bool:
+        return (now or time.monotonic()) < self._paused_until
+
+    def _record_grant(self, wait: float):
+        self.granted += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    @property
+    def metrics(self) -> Dict[str, float]:
+        return {
+            "queue_depth": self.queue_depth,
+            "granted": self.granted,
+            "queued": self.queued,
+            "throttled": self.throttled,
+            "avg_wait": self.total_wait / self.granted if self.granted else 0.0,
+            "max_wait": self.max_wait,
+        }
@@ -0,0 +1,172 @@
+import importlib.util
+from abc import ABC, abstractmethod
+import json
+import struct
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+from fastapi import WebSocket, WebSocketException, status
+from src.domain.entities.stock_entities import StockQuote
+
+_msgpack_available = importlib.util.find_spec("msgpack") is not None
+if _msgpack_available:
+    import msgpack
+
+SUBPROTOCOL_PREFIX = "stocks."
+
+# precios en diezmilésimas: los deltas son enteros exactos
+PRICE_SCALE = 10_000
+
+# layout binario: cabecera, definiciones de símbolos nuevos y entradas delta
+_HEADER = struct.Struct("<BH")
+_SYMBOL = struct.Struct("<HB")
+_COUNT = struct.Struct("<H")
+_ENTRY = struct.Struct("<Hqq")
+QUOTES_FRAME = 1
+
+EncodedFrame = Union[str, bytes]
+
+
+def _quotes_of(frame: Any) -> Optional[Mapping[str, StockQuote]]:
+    """
+    Returns the quotes carried by a frame, either a multiplexed
+    `{"type": "quotes", "data": {...}}` or a single `{"symbol", "data"}` \n
+    Control frames return `None`
+    """
+    if not isinstance(frame, dict):
+        return None
+    if frame.get("type") == "quotes":
+        return frame["data"]
+    if "symbol" in frame and isinstance(frame.get("data"), StockQuote):
+        return {frame["symbol"]: frame["data"]}
+    return None
+
+
+def _to_json(value: Any):
+    if isinstance(value, StockQuote):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FrameCodec:
+    """
+    Formato JSON de siempre: cada quote con su precio y timestamp ISO
+    """
+    name = "json"
+
+    def encode(self, frame: Any) -> EncodedFrame:
+        return json.dumps(frame, default=_to_json)
+
+
+class DeltaFrameCodec(FrameCodec, ABC):
+    """
+    Base de los formatos compactos. \n
+    Guarda el último precio y timestamp enviados por símbolo en esta conexión
+    y codifica solo la diferencia; los frames de control siguen en JSON.
+    El codec debe aplicarse en el orden real de envío, después de conflar.
+    """
+
+    def __init__(self):
+        self._last: Dict[str, Tuple[int, int]] = {}
+
+    def encode(self, frame: Any) -> EncodedFrame:
+        quotes = _quotes_of(frame)
+        if quotes is None:
+            return super().encode(frame)
+        return self._encode_quotes(quotes)
+
+    def _deltas(self, quotes: Mapping[str, StockQuote]) -> List[Tuple[str, int, int]]:
+        deltas = []
+        for symbol, quote in quotes.items():
+            price = round(quote.price * PRICE_SCALE)
+            timestamp = int(quote.timestamp.timestamp() * 1000)
+            last_price, last_timestamp = self._last.get(symbol, (0, 0))
+            self._last[symbol] = (price, timestamp)
+            deltas.append((symbol, price - last_price, timestamp - last_timestamp))
+        return deltas
+
+    @abstractmethod
+    def _encode_quotes(self, quotes: Mapping[str, StockQuote]) -> EncodedFrame:
+        pass
+
+
+class MsgpackFrameCodec(DeltaFrameCodec):
+    """
+    `{"t": "q", "d": {symbol: [delta_precio, delta_ms]}}` en MessagePack
+    """
+    name = "msgpack"
+
+    def _encode_quotes(self, quotes: Mapping[str, StockQuote]) -> bytes:
+        return msgpack.packb({
+            "t": "q",
+            "d": {symbol: [price, timestamp] for symbol, price, timestamp in self._deltas(quotes)},
+        })
+
+
+class BinaryFrameCodec(DeltaFrameCodec):
+    """
+    Layout empaquetado little-endian, sin dependencias: \n
+    `u8 tipo, u16 n_símbolos_nuevos, [u16 id, u8 len, utf8]*, u16 n, [u16 id, i64 delta_precio, i64 delta_ms]*` \n
+    Cada símbolo se define una sola vez por conexión y luego viaja como id.
+    """
+    name = "binary"
+
+    def __init__(self):
+        super().__init__()
+        self._ids: Dict[str, int] = {}
+
+    def _encode_quotes(self, quotes: Mapping[str, StockQuote]) -> bytes:
+        new_symbols = []
+        entries = []
+        for symbol, price, timestamp in self._deltas(quotes):
+            symbol_id = self._ids.get(symbol)
+            if symbol_id is None:
+                symbol_id = self._ids[symbol] = len(self._ids)
+                new_symbols.append((symbol_id, symbol.encode()))
+            entries.append(_ENTRY.pack(symbol_id, price, timestamp))
+
+        parts = [_HEADER.pack(QUOTES_FRAME, len(new_symbols))]
+        for symbol_id, encoded in new_symbols:
+            parts.append(_SYMBOL.pack(symbol_id, len(encoded)))
+            parts.append(encoded)
+        parts.append(_COUNT.pack(len(entries)))
+        parts.extend(entries)
+        return b"".join(parts)
+
+
+FRAME_CODECS = {
+    codec.name: codec
+    for codec in (FrameCodec, MsgpackFrameCodec, BinaryFrameCodec)
+    if codec is not MsgpackFrameCodec or _msgpack_available
+}
+
+
+def negotiate_frame_codec(websocket: WebSocket) -> Tuple[FrameCodec, Optional[str]]:
+    """
+    Picks the wire format from the `stocks.<format>` subprotocols offered by
+    the client or the `format` query parameter, JSON by default \n
+    Returns the codec and the subprotocol to accept, if any \n
+    Raises `WebSocketException` (1003) when the client only asks for formats
+    this server can't speak, instead of silently falling back to JSON
+    """
+    offered = [
+        subprotocol.removeprefix(SUBPROTOCOL_PREFIX)
+        for subprotocol in websocket.scope.get("subprotocols", [])
+        if subprotocol.startswith(SUBPROTOCOL_PREFIX)
+    ]
+    for name in offered:
+        if name in FRAME_CODECS:
+            return FRAME_CODECS[name](), SUBPROTOCOL_PREFIX + name
+
+    name = websocket.query_params.get("format")
+    if name is not None:
+        requested = name = name.lower()
+        if name in FRAME_CODECS:
+            return FRAME_CODECS[name](), None
+    elif offered:
+        requested = ", ".join(SUBPROTOCOL_PREFIX + offer for offer in offered)
+    else:
+        return FrameCodec(), None
+
+    raise WebSocketException(
+        code=status.WS_1003_UNSUPPORTED_DATA,
+        reason=f"Formato no soportado: {requested}. Disponibles: {', '.join(FRAME_CODECS)}"
+    )
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import random
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.exceptions import WebSocketException
+
+from src.infrastructure.utils.logger import setup_logger
+
+logger = setup_logger("TradeFeedClient")
+
+TradeHandler = Callable[[str, float, float, int], Awaitable[None]]
+
+
+class TradeFeedClient:
+    """
+    Cliente de un feed de trades estilo Finnhub sobre una sola conexión. \n
+    Envía `{"type": "subscribe", "symbol": ...}` por símbolo, recibe
+    `{"type": "trade", "data": [{"s", "p", "v", "t"}]}` y se reconecta con
+    backoff volviendo a suscribir todos los símbolos activos.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: Optional[str] = None,
+        reconnect_backoff_base: float = 1.0,
+        reconnect_backoff_max: float = 30.0
+    ):
+        self.url = f"{url}?token={token}" if token else url
+        self.reconnect_backoff_base = reconnect_backoff_base
+        self.reconnect_backoff_max = reconnect_backoff_max
+        self._symbols: Set[str] = set()
+        self._connection: Optional[ClientConnection] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._on_trade: Optional[TradeHandler] = None
+
+        self.connects = 0
+        self.messages = 0
+        self.trades = 0
+
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None
+
+
+    def set_trade_handler(self, handler: TradeHandler):
+        self._on_trade = handler
+
+
+    async def start(self):
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+        self._runner = None
+
+
+    async def subscribe(self, symbol: str):
+        if symbol in self._symbols:
+            return
+        self._symbols.add(symbol)
+        await self._send({"type": "subscribe", "symbol": symbol})
+
+
+    async def unsubscribe(self, symbol: str):
+        if symbol not in self._symbols:
+            return
+        self._symbols.discard(symbol)
+        await self._send({"type": "unsubscribe", "symbol": symbol})
+
+
+    async def _send(self, message: dict):
+        # sin conexión no hay nada que enviar: al reconectar se re-suscribe todo
+        if self._connection is None:
+            return
+        try:
+            await self._connection.send(json.dumps(message))
+        except WebSocketException as e:
+            logger.warning("Could not send %s: %s", message, e)
+
+
+    async def _run(self):
+        attempt = 0
+        while True:
+            try:
+                async with connect(self.url) as connection:
+                    self._connection = connection
+                    self.connects += 1
+                    attempt = 0
+                    logger.info("Trade feed connected, %d symbols", len(self._symbols))
+
+                    for symbol in list(self._symbols):
+                        await connection.send(json.dumps({"type": "subscribe", "symbol": symbol}))
+
+                    async for raw in connection:
+                        await self._handle(raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Trade feed disconnected: %s", e)
+            finally:
+                self._connection = None
+
+            attempt += 1
+            delay = random.uniform(0, min(self.reconnect_backoff_max, self.reconnect_backoff_base * 2 ** attempt))
+            await asyncio.sleep(delay)
+
+
+    async def _handle(self, raw):
+        self.messages += 1
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            logger.warning("Invalid trade feed message")
+            return
+
+        if message.get("type") != "trade" or self._on_trade is None:
+            return
+
+        for trade in message.get("data") or []:
+            try:
+                symbol, price, volume, timestamp = trade["s"], float(trade["p"]), float(trade.get("v", 0)), int(trade["t"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.trades += 1
+            await self._on_trade(symbol, price, volume, timestamp)
+
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "connected": int(self.connected),
+            "symbols": len(self._symbols),
+            "connects": self.connects,
+            "messages": self.messages,
+            "trades": self.trades,
+        }
@@ -0,0 +1,214 @@
+import asyncio
+import itertools
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Dict, Hashable, Optional
+from fastapi import WebSocket
+from src.infrastructure.data_sources.ws.frame_codecs import FrameCodec
+from src.infrastructure.utils.logger import setup_logger
+
+logger = setup_logger("WebSocketSender")
+
+# 1013 "try again later": el cliente no consume a tiempo
+SLOW_CLIENT_CLOSE_CODE = 1013
+
+
+class SlowClientPolicy(str, Enum):
+    DROP = "drop"
+    DISCONNECT = "disconnect"
+
+
+class SlowClientError(ConnectionError):
+    pass
+
+
+class SendQueueMetrics:
+    """
+    Contadores agregados de todas las colas de envío del proceso
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self.queued = 0
+        self.sent = 0
+        self.bytes_sent = 0
+        self.conflated = 0
+        self.dropped = 0
+        self.disconnects = 0
+        self.max_depth = 0
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "connections": self.connections,
+            "queued": self.queued,
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "bytes_sent": self.bytes_sent,
+            "conflated": self.conflated,
+            "dropped": self.dropped,
+            "disconnects": self.disconnects,
+        }
+
+
+class WebSocketSender:
+    """
+    Cola de envío acotada de un websocket con un único escritor. \n
+    Los frames con la misma `key` se sustituyen mientras esperan, de modo que
+    un cliente lento solo recibe el último precio de cada símbolo. Si la cola
+    se llena, `policy` decide entre descartar el frame más antiguo o cerrar la
+    conexión; un envío que supera `send_timeout` siempre cierra la conexión. \n
+    Los frames se codifican con `codec` al escribirse, ya conflados, para
+    que los formatos delta partan siempre del último valor realmente enviado.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_queue: int = 100,
+        send_timeout: float = 5.0,
+        policy: SlowClientPolicy = SlowClientPolicy.DROP,
+        totals: Optional[SendQueueMetrics] = None,
+        codec: Optional[FrameCodec] = None
+    ):
+        self._websocket = websocket
+        self._codec = codec or FrameCodec()
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.policy = SlowClientPolicy(policy)
+        self._totals = totals or SendQueueMetrics()
+        self._queue: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._unkeyed = itertools.count()
+        self._ready = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._writer = asyncio.create_task(self._write_loop())
+        self._closing: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self.sent = 0
+        self.bytes_sent = 0
+        self.conflated = 0
+        self.dropped = 0
+        self._totals.connections += 1
+
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+
+    def offer(self, frame: Any, key: Optional[Hashable] = None):
+        """
+        Queues `frame` without waiting for the client \n
+        A pending frame with the same `key` is replaced. Raises
+        `SlowClientError` once the connection was closed
+        """
+        if self._closed:
+            raise SlowClientError("websocket sender is closed")
+
+        if key is not None and key in self._queue:
+            self._queue[key] = frame
+            self.conflated += 1
+            self._totals.conflated += 1
+            return
+
+        if len(self._queue) >= self.max_queue:
+            if self.policy is SlowClientPolicy.DISCONNECT:
+                self._disconnect("send queue full")
+                raise SlowClientError("send queue full")
+            self._queue.popitem(last=False)
+            self.dropped += 1
+            self._totals.dropped += 1
+            self._totals.queued -= 1
+
+        self._queue[("frame", next(self._unkeyed)) if key is None else key] = frame
+        self._totals.queued += 1
+        self._totals.max_depth = max(self._totals.max_depth, len(self._queue))
+        self._drained.clear()
+        self._ready.set()
+
+
+    async def drained(self):
+        """
+        Waits until every queued frame was written to the socket
+        """
+        await self._drained.wait()
+
+
+    async def close(self):
+        self._shutdown()
+
+
+    def _shutdown(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._totals.connections -= 1
+        self._totals.queued -= len(self._queue)
+        self._queue.clear()
+        self._drained.set()
+        if self._writer is not asyncio.current_task():
+            self._writer.cancel()
+
+
+    async def _write_loop(self):
+        try:
+            while not self._closed:
+                await self._ready.wait()
+                while self._queue:
+                    _, frame = self._queue.popitem(last=False)
+                    self._totals.queued -= 1
+                    await asyncio.wait_for(self._send(frame), self.send_timeout)
+                self._ready.clear()
+                self._drained.set()
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            # un envío a medias no se puede retomar: se cierra la conexión
+            self._disconnect(f"send took longer than {self.send_timeout}s")
+        except Exception as e:
+            logger.info("Websocket send failed: %s", e)
+            self._shutdown()
+
+
+    async def _send(self, frame: Any):
+        message = self._codec.encode(frame)
+        if isinstance(message, bytes):
+            await self._websocket.send_bytes(message)
+        else:
+            await self._websocket.send_text(message)
+        self.sent += 1
+        self.bytes_sent += len(message)
+        self._totals.sent += 1
+        self._totals.bytes_sent += len(message)
+
+
+    def _disconnect(self, reason: str):
+        logger.warning("Disconnecting slow websocket client: %s", reason)
+        self._totals.disconnects += 1
+        self._shutdown()
+        self._closing = asyncio.create_task(self._close_websocket(reason))
+
+
+    async def _close_websocket(self, reason: str):
+        try:
+            await self._websocket.close(code=SLOW_CLIENT_CLOSE_CODE, reason=reason)
+        except Exception:
+            pass
+
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "depth": self.depth,
+            "sent": self.sent,
+            "bytes_sent": self.bytes_sent,
+            "conflated": self.conflated,
+            "dropped": self.dropped,
+        }
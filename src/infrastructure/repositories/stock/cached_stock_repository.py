@@ -0,0 +1,261 @@
+import asyncio
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+from src.domain.entities.bar_series import BarSeries
+from src.domain.entities.stock_entities import TIMESPAN_MILLISECONDS, StockBar, StockQuote
+from src.domain.repositories.i_bar_repository import IBarRepository
+from src.domain.repositories.i_stock_repository import IStockRepository
+from src.infrastructure.utils.bar_resampler import finer_timespans, resample
+from src.infrastructure.utils.intervals import split_interval
+from src.infrastructure.utils.market_calendar import MarketCalendar
+from src.infrastructure.utils.ttl_cache import TTLCache
+
+class CachedStockRepository(IStockRepository):
+    """
+    Decorates a `IStockRepository` with local caches \n
+    - Quotes are served from `quote_cache` while fresh, stale quotes are
+      served immediately while they are refreshed in background \n
+    - Historic bars are persisted in `bar_repository`, only the time ranges
+      not stored yet are requested upstream. A range without bars is only
+      stored as empty once it is `publication_delay` seconds old, upstream
+      publishes aggregates late \n
+    - Coarser or multiplied bar sizes are aggregated from stored finer bars
+      instead of being requested upstream
+    """
+    # barras leídas de la base por página al hacer streaming
+    STORED_PAGE_SIZE = 5000
+
+    def __init__(
+        self,
+        stock_repository: IStockRepository,
+        quote_cache: TTLCache,
+        bar_repository: IBarRepository,
+        market_calendar: Optional[MarketCalendar] = None,
+        publication_delay: float = 86400.0
+    ):
+        self._stock_repository = stock_repository
+        self._quote_cache = quote_cache
+        self._bar_repository = bar_repository
+        # las barras diarias y mayores se cortan con el calendario de la bolsa
+        self._timezone = (market_calendar or MarketCalendar()).timezone
+        self._publication_delay_ms = int(publication_delay * 1000)
+
+
+    async def get_current_stock_price(self, symbol: str) -> StockQuote:
+        quote: StockQuote = await self._quote_cache.get_or_load(
+            symbol.upper(),
+            lambda: self._stock_repository.get_current_stock_price(symbol)
+        )
+        # copia para que los llamadores no modifiquen el valor cacheado
+        return quote.model_copy()
+
+
+    async def refresh_current_stock_price(self, symbol: str) -> StockQuote:
+        quote: StockQuote = await self._quote_cache.refresh(
+            symbol.upper(),
+            lambda: self._stock_repository.get_current_stock_price(symbol)
+        )
+        return quote.model_copy()
+
+
+    async def get_historic_stock_price(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        multiplier: int = 1
+    ) -> List[StockQuote]:
+        series = await self.get_historic_series(
+            symbol,
+            from_timestamp,
+            to_timestamp,
+            group_by,
+            multiplier=multiplier
+        )
+        return series.to_quotes()
+
+
+    async def get_historic_series(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        adjusted: bool = True,
+        multiplier: int = 1
+    ) -> BarSeries:
+        if group_by not in TIMESPAN_MILLISECONDS or from_timestamp > to_timestamp:
+            return await self._stock_repository.get_historic_series(
+                symbol, from_timestamp, to_timestamp, group_by, adjusted, multiplier
+            )
+
+        symbol = symbol.upper()
+        # la propia serie o una más fina guardada entera se agrega sin ir al upstream
+        for timespan in (group_by, *finer_timespans(group_by)):
+            if await self._is_stored(symbol, timespan, adjusted, from_timestamp, to_timestamp):
+                series = await asyncio.to_thread(
+                    self._bar_repository.get_series,
+                    symbol, timespan, adjusted, from_timestamp, to_timestamp
+                )
+                return self._resample(series, timespan, group_by, multiplier)
+
+        # si no, se descarga (y guarda) la barra base y los múltiplos salen de ella
+        pages = [
+            page async for page in self.stream_historic_series(
+                symbol, from_timestamp, to_timestamp, group_by, adjusted
+            )
+        ]
+        return self._resample(BarSeries.concat(pages), group_by, group_by, multiplier)
+
+
+    async def _is_stored(
+        self,
+        symbol: str,
+        timespan: str,
+        adjusted: bool,
+        from_timestamp: int,
+        to_timestamp: int
+    ) -> bool:
+        coverage = await asyncio.to_thread(
+            self._bar_repository.get_coverage, symbol, timespan, adjusted
+        )
+        return any(start <= from_timestamp and to_timestamp <= end for start, end in coverage)
+
+
+    def _resample(self, series: BarSeries, timespan: str, group_by: str, multiplier: int) -> BarSeries:
+        if timespan == group_by and multiplier == 1:
+            return series
+        return resample(series, group_by, multiplier, self._timezone)
+
+
+    async def get_historic_bars(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        adjusted: bool = True
+    ) -> List[StockBar]:
+        bars: List[StockBar] = []
+        async for page in self.stream_historic_bars(
+            symbol,
+            from_timestamp,
+            to_timestamp,
+            group_by,
+            adjusted
+        ):
+            bars.extend(page)
+        return bars
+
+
+    async def stream_historic_bars(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        adjusted: bool = True
+    ) -> AsyncIterator[List[StockBar]]:
+        async for page in self.stream_historic_series(
+            symbol,
+            from_timestamp,
+            to_timestamp,
+            group_by,
+            adjusted
+        ):
+            yield page.to_bars()
+
+
+    async def stream_historic_series(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        adjusted: bool = True
+    ) -> AsyncIterator[BarSeries]:
+        if group_by not in TIMESPAN_MILLISECONDS or from_timestamp > to_timestamp:
+            async for page in self._stock_repository.stream_historic_series(
+                symbol, from_timestamp, to_timestamp, group_by, adjusted
+            ):
+                yield page
+            return
+
+        symbol = symbol.upper()
+        coverage = await asyncio.to_thread(
+            self._bar_repository.get_coverage, symbol, group_by, adjusted
+        )
+
+        # los tramos ya guardados se leen de la base, solo los huecos van al upstream
+        for segment_from, segment_to, is_covered in split_interval(
+            (from_timestamp, to_timestamp), coverage
+        ):
+            segment = (segment_from, segment_to)
+            pages = (
+                self._stream_stored(symbol, segment, group_by, adjusted)
+                if is_covered else
+                self._stream_gap(symbol, segment, group_by, adjusted)
+            )
+            async for page in pages:
+                if len(page):
+                    yield page
+
+
+    async def _stream_stored(
+        self,
+        symbol: str,
+        segment: Tuple[int, int],
+        group_by: str,
+        adjusted: bool
+    ) -> AsyncIterator[BarSeries]:
+        cursor, segment_to = segment
+        while cursor <= segment_to:
+            page = await asyncio.to_thread(
+                self._bar_repository.get_series,
+                symbol, group_by, adjusted, cursor, segment_to, self.STORED_PAGE_SIZE
+            )
+            if not len(page):
+                return
+            yield page
+            cursor = int(page.timestamp[-1]) + 1
+
+
+    async def _stream_gap(
+        self,
+        symbol: str,
+        gap: Tuple[int, int],
+        group_by: str,
+        adjusted: bool
+    ) -> AsyncIterator[BarSeries]:
+        """
+        Streams a missing range from upstream persisting its closed bars page by page
+        """
+        gap_from, gap_to = gap
+        # las barras que aún no cerraron pueden cambiar, no se persisten
+        now = int(time.time() * 1000)
+        closed_until = now - TIMESPAN_MILLISECONDS[group_by]
+        cursor = gap_from
+
+        async for page in self._stock_repository.stream_historic_series(
+            symbol, gap_from, gap_to, group_by, adjusted
+        ):
+            if len(page):
+                store_to = min(int(page.timestamp[-1]), closed_until, gap_to)
+                if store_to >= cursor:
+                    await asyncio.to_thread(
+                        self._bar_repository.save_series,
+                        symbol, group_by, adjusted, cursor, store_to,
+                        page.slice(cursor, store_to)
+                    )
+                    cursor = store_to + 1
+            yield page
+
+        # el resto del hueco no trajo barras: solo queda cubierto vacío si es
+        # lo bastante viejo como para que el upstream ya las hubiera publicado
+        store_to = min(gap_to, closed_until, now - self._publication_delay_ms)
+        if store_to >= cursor:
+            await asyncio.to_thread(
+                self._bar_repository.save_series,
+                symbol, group_by, adjusted, cursor, store_to, BarSeries.empty()
+            )
@@ -1,14 +1,32 @@
+import asyncio
+from collections import deque
 from datetime import datetime
-from typing import List
-from src.stocks.models import StockQuote
+from typing import AsyncIterator, Deque, List, Tuple
+from src.domain.entities.bar_series import BarSeries
+from src.domain.entities.stock_entities import TIMESPAN_MILLISECONDS, StockBar, StockQuote
+from src.domain.repositories.i_stock_repository import IStockRepository
+from src.infrastructure.data_sources.http.http_client import HTTPClient
 
-from src.infrastructure.shared.http.http_client import HTTPClient
+class StockRepository(IStockRepository):
+    """
+    Quotes from Finnhub and historic bars from Polygon \n
+    Ranges wider than one page of bars are split into time chunks that are
+    fetched `historic_concurrency` at a time (each call still goes through
+    the upstream rate limiter) and yielded in order. Retries are left to
+    `HTTPClient`, which already retries 5xx and waits out 429s
+    """
+    # barras por página de Polygon, acota la memoria de cada respuesta
+    HISTORIC_PAGE_LIMIT = 5000
 
-class StockRepository:
-
-    def __init__(self, stock_api: HTTPClient, historic_stock_api: HTTPClient):
+    def __init__(
+        self,
+        stock_api: HTTPClient,
+        historic_stock_api: HTTPClient,
+        historic_concurrency: int = 4
+    ):
         self._stock_api = stock_api
         self._historic_stock_api = historic_stock_api
+        self._historic_concurrency = max(1, historic_concurrency)
 
 
     async def get_current_stock_price(self, symbol: str) -> StockQuote:
@@ -26,19 +44,210 @@ class StockRepository:
         symbol: str,
         from_timestamp: int,
         to_timestamp: int,
-        group_by: str
+        group_by: str,
+        multiplier: int = 1
     ) -> List[StockQuote]:
-        response = await self._historic_stock_api.get(
-            path=f'/aggs/ticker/{symbol}/range/1/{group_by}/{from_timestamp}/{to_timestamp}',
-            params={
-                "adjusted": "true",
-                "sort": "asc",
-            }
+        series = await self.get_historic_series(
+            symbol,
+            from_timestamp,
+            to_timestamp,
+            group_by,
+            multiplier=multiplier
         )
+        return series.to_quotes()
+
+
+    async def get_historic_series(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        adjusted: bool = True,
+        multiplier: int = 1
+    ) -> BarSeries:
+        pages = [
+            self._to_series(results)
+            async for results in self._stream_historic_results(
+                symbol,
+                from_timestamp,
+                to_timestamp,
+                group_by,
+                adjusted,
+                multiplier
+            )
+        ]
+        return BarSeries.concat(pages)
+
+
+    async def get_historic_bars(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        adjusted: bool = True
+    ) -> List[StockBar]:
+        bars: List[StockBar] = []
+        async for page in self.stream_historic_bars(
+            symbol,
+            from_timestamp,
+            to_timestamp,
+            group_by,
+            adjusted
+        ):
+            bars.extend(page)
+        return bars
+
+
+    async def stream_historic_bars(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        adjusted: bool = True
+    ) -> AsyncIterator[List[StockBar]]:
+        async for results in self._stream_historic_results(
+            symbol,
+            from_timestamp,
+            to_timestamp,
+            group_by,
+            adjusted
+        ):
+            yield [
+                StockBar(
+                    timestamp=item["t"],
+                    open=item["o"],
+                    high=item["h"],
+                    low=item["l"],
+                    close=item["c"],
+                    volume=item["v"]
+                ) for item in results
+            ]
+
+
+    async def stream_historic_series(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        adjusted: bool = True
+    ) -> AsyncIterator[BarSeries]:
+        async for results in self._stream_historic_results(
+            symbol,
+            from_timestamp,
+            to_timestamp,
+            group_by,
+            adjusted
+        ):
+            yield self._to_series(results)
+
 
+    @staticmethod
+    def _to_series(results: List[dict]) -> BarSeries:
+        # cada columna sale directa del JSON de Polygon, sin un objeto por barra
+        return BarSeries.from_columns(*(
+            [item[key] for item in results] for key in ("t", "o", "h", "l", "c", "v")
+        ))
+
+
+    async def _stream_historic_results(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        adjusted: bool,
+        multiplier: int = 1
+    ) -> AsyncIterator[List[dict]]:
+        chunks = self._split_range(from_timestamp, to_timestamp, group_by, multiplier)
+        if len(chunks) == 1:
+            async for response in self._historic_pages(symbol, chunks[0], group_by, adjusted, multiplier):
+                yield response.get("results", [])
+            return
+
+        # ventana deslizante: como mucho `historic_concurrency` tramos pedidos o sin consumir
+        remaining = iter(chunks)
+        window: Deque[asyncio.Task] = deque()
+
+        def schedule():
+            chunk = next(remaining, None)
+            if chunk is not None:
+                window.append(asyncio.create_task(
+                    self._fetch_chunk(symbol, chunk, group_by, adjusted, multiplier)
+                ))
+
+        try:
+            for _ in range(self._historic_concurrency):
+                schedule()
+
+            last_timestamp = None
+            while window:
+                pages = await window.popleft()
+                schedule()
+                for results in pages:
+                    # los tramos no se solapan, pero una barra en el borde no se repite
+                    if last_timestamp is not None:
+                        results = [item for item in results if item["t"] > last_timestamp]
+                    if results:
+                        last_timestamp = results[-1]["t"]
+                        yield results
+        finally:
+            for task in window:
+                task.cancel()
+
+
+    def _split_range(
+        self,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        multiplier: int
+    ) -> List[Tuple[int, int]]:
+        """
+        Splits the range in chunks of at most one page of bars
+        """
+        width = TIMESPAN_MILLISECONDS.get(group_by)
+        if width is None or to_timestamp < from_timestamp:
+            return [(from_timestamp, to_timestamp)]
+
+        span = self.HISTORIC_PAGE_LIMIT * width * multiplier
+        return [
+            (start, min(start + span - 1, to_timestamp))
+            for start in range(from_timestamp, to_timestamp + 1, span)
+        ]
+
+
+    async def _fetch_chunk(
+        self,
+        symbol: str,
+        chunk: Tuple[int, int],
+        group_by: str,
+        adjusted: bool,
+        multiplier: int
+    ) -> List[List[dict]]:
         return [
-            StockQuote(
-                price=item["c"],
-                timestamp=datetime.fromtimestamp(item["t"] / 1000)
-            ) for item in response["results"]
+            response.get("results", [])
+            async for response in self._historic_pages(symbol, chunk, group_by, adjusted, multiplier)
         ]
+
+
+    def _historic_pages(
+        self,
+        symbol: str,
+        chunk: Tuple[int, int],
+        group_by: str,
+        adjusted: bool,
+        multiplier: int
+    ) -> AsyncIterator[dict]:
+        from_timestamp, to_timestamp = chunk
+        return self._historic_stock_api.get_pages(
+            path=f'/aggs/ticker/{symbol}/range/{multiplier}/{group_by}/{from_timestamp}/{to_timestamp}',
+            params={
+                "adjusted": "true" if adjusted else "false",
+                "sort": "asc",
+                "limit": self.HISTORIC_PAGE_LIMIT,
+            }
+        )
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import List, Optional
+import numpy as np
+from src.domain.entities.bar_series import BarSeries
+from src.domain.entities.stock_entities import TIMESPAN_MILLISECONDS
+
+DAY_MILLISECONDS = TIMESPAN_MILLISECONDS["day"]
+# 1970-01-01 fue jueves: desplazamiento hasta el domingo anterior
+EPOCH_DAYS_SINCE_SUNDAY = 4
+
+INTRADAY_TIMESPANS = ("minute", "hour")
+CALENDAR_TIMESPANS = ("day", "week", "month", "quarter", "year")
+
+
+def finer_timespans(timespan: str) -> List[str]:
+    """
+    Returns the timespans a `timespan` series can be built from,
+    coarsest first
+    """
+    width = TIMESPAN_MILLISECONDS[timespan]
+    return sorted(
+        (candidate for candidate in ("minute", "hour", "day") if TIMESPAN_MILLISECONDS[candidate] < width),
+        key=TIMESPAN_MILLISECONDS.get,
+        reverse=True
+    )
+
+
+def resample(
+    series: BarSeries,
+    timespan: str,
+    multiplier: int = 1,
+    tz: Optional[tzinfo] = None
+) -> BarSeries:
+    """
+    Aggregates a finer series into `multiplier` x `timespan` bars \n
+    Intraday buckets are aligned to UTC, day and longer buckets follow the
+    calendar of `tz` (the exchange timezone) and are stamped with their
+    local start, like Polygon aggregates. Weeks start on Sunday
+    """
+    if timespan not in TIMESPAN_MILLISECONDS:
+        raise ValueError(f"Unknown timespan {timespan}")
+    if not len(series):
+        return series
+
+    timestamps = series.timestamp
+    keys = _bucket_keys(timestamps, timespan, multiplier, tz)
+
+    # las barras vienen ordenadas: cada cambio de clave abre un bucket
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(timestamps)] - 1
+    return BarSeries(
+        timestamp=keys[starts],
+        open=series.open[starts],
+        high=np.maximum.reduceat(series.high, starts),
+        low=np.minimum.reduceat(series.low, starts),
+        close=series.close[ends],
+        volume=np.add.reduceat(series.volume, starts)
+    )
+
+
+def bucket_start(
+    timestamp: int,
+    timespan: str,
+    multiplier: int = 1,
+    tz: Optional[tzinfo] = None
+) -> int:
+    """
+    Returns the start of the `multiplier` x `timespan` bucket that contains
+    `timestamp`, with the same alignment as `resample`
+    """
+    if timespan not in TIMESPAN_MILLISECONDS:
+        raise ValueError(f"Unknown timespan {timespan}")
+    return int(_bucket_keys(np.array([timestamp], dtype=np.int64), timespan, multiplier, tz)[0])
+
+
+def _bucket_keys(timestamps: np.ndarray, timespan: str, multiplier: int, tz: Optional[tzinfo]) -> np.ndarray:
+    if timespan in INTRADAY_TIMESPANS:
+        width = TIMESPAN_MILLISECONDS[timespan] * multiplier
+        return timestamps - timestamps % width
+    return _calendar_keys(timestamps, timespan, multiplier, tz or timezone.utc)
+
+
+def _calendar_keys(timestamps: np.ndarray, timespan: str, multiplier: int, tz: tzinfo) -> np.ndarray:
+    offsets = _utc_offsets(timestamps, tz)
+    local_days = (timestamps + offsets) // DAY_MILLISECONDS
+
+    if timespan == "day":
+        bucket_days = local_days - local_days % multiplier
+    elif timespan == "week":
+        sundays = local_days - (local_days + EPOCH_DAYS_SINCE_SUNDAY) % 7
+        bucket_days = sundays - (sundays // 7) % multiplier * 7
+    else:
+        months = local_days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        months_per_bucket = {"month": 1, "quarter": 3, "year": 12}[timespan] * multiplier
+        bucket_months = months - months % months_per_bucket
+        bucket_days = bucket_months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+
+    # el inicio local de cada bucket vuelve a UTC con su propio desfase horario
+    unique_days, inverse = np.unique(bucket_days, return_inverse=True)
+    starts = np.array([
+        day * DAY_MILLISECONDS - _offset_ms(day * DAY_MILLISECONDS, tz, local=True)
+        for day in unique_days.tolist()
+    ], dtype=np.int64)
+    return starts[inverse]
+
+
+def _utc_offsets(timestamps: np.ndarray, tz: tzinfo) -> np.ndarray:
+    """
+    Returns the UTC offset (ms) of every timestamp in `tz`, computed once
+    per distinct hour
+    """
+    hours = timestamps // TIMESPAN_MILLISECONDS["hour"]
+    unique_hours, inverse = np.unique(hours, return_inverse=True)
+    offsets = np.array([
+        _offset_ms(hour * TIMESPAN_MILLISECONDS["hour"], tz)
+        for hour in unique_hours.tolist()
+    ], dtype=np.int64)
+    return offsets[inverse]
+
+
+def _offset_ms(timestamp: int, tz: tzinfo, local: bool = False) -> int:
+    moment = datetime.fromtimestamp(timestamp / 1000, timezone.utc)
+    if local:
+        moment = moment.replace(tzinfo=tz)
+    else:
+        moment = moment.astimezone(tz)
+    return int(moment.utcoffset() / timedelta(milliseconds=1))
@@ -0,0 +1,110 @@
+import csv
+import io
+from datetime import datetime, timezone
+from typing import BinaryIO, Dict, Iterator, List
+from src.domain.entities.portfolio_entities import Transaction, TransactionType
+
+# nombres habituales de las columnas en los exports de los brokers
+_COLUMN_ALIASES = {
+    "symbol": ("symbol", "ticker", "instrument"),
+    "type": ("type", "action", "side", "transaction type"),
+    "timestamp": ("timestamp", "date", "datetime", "time", "trade date"),
+    "quantity": ("quantity", "qty", "shares", "units", "ratio"),
+    "price": ("price", "price per share", "amount per share"),
+    "fee": ("fee", "fees", "commission", "commissions"),
+}
+_REQUIRED_COLUMNS = ("symbol", "type", "timestamp", "quantity")
+
+_TYPE_ALIASES = {
+    "buy": TransactionType.BUY,
+    "bought": TransactionType.BUY,
+    "sell": TransactionType.SELL,
+    "sold": TransactionType.SELL,
+    "dividend": TransactionType.DIVIDEND,
+    "div": TransactionType.DIVIDEND,
+    "split": TransactionType.SPLIT,
+    "stock split": TransactionType.SPLIT,
+}
+
+_DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%Y %H:%M:%S", "%d.%m.%Y")
+
+
+def read_broker_csv(file: BinaryIO) -> Iterator[Transaction]:
+    """
+    Parses a broker CSV export one row at a time, so an import never holds
+    the whole file \n
+    Headers are matched case-insensitively against common aliases. Dates
+    are epoch milliseconds, ISO 8601 or US dates, UTC when they carry no
+    offset. Raises `ValueError` with the line of the first invalid row
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        columns = _map_columns(reader.fieldnames or [])
+        for row in reader:
+            try:
+                yield _parse_row(row, columns)
+            except ValueError as e:
+                raise ValueError(f"Invalid row at line {reader.line_num}: {e}") from e
+    finally:
+        # el archivo es del llamador: no se cierra con el wrapper
+        if not file.closed:
+            text.detach()
+
+
+def _map_columns(fieldnames: List[str]) -> Dict[str, str]:
+    normalized = {name.strip().lower(): name for name in fieldnames if name}
+    columns = {}
+    for field, aliases in _COLUMN_ALIASES.items():
+        name = next((normalized[alias] for alias in aliases if alias in normalized), None)
+        if name is not None:
+            columns[field] = name
+
+    missing = [field for field in _REQUIRED_COLUMNS if field not in columns]
+    if missing:
+        raise ValueError(f"Missing CSV columns: {', '.join(missing)}")
+    return columns
+
+
+def _parse_row(row: Dict[str, str], columns: Dict[str, str]) -> Transaction:
+    kind = (row[columns["type"]] or "").strip().lower()
+    if kind not in _TYPE_ALIASES:
+        raise ValueError(f"Unknown transaction type '{kind}'")
+
+    return Transaction(
+        symbol=(row[columns["symbol"]] or "").strip().upper(),
+        type=_TYPE_ALIASES[kind],
+        timestamp=_parse_timestamp(row[columns["timestamp"]] or ""),
+        # algunos brokers escriben las ventas con cantidad negativa
+        quantity=abs(_parse_number(row[columns["quantity"]])),
+        price=_parse_number(row.get(columns.get("price", ""))),
+        fee=abs(_parse_number(row.get(columns.get("fee", ""))))
+    )
+
+
+def _parse_number(value: str | None) -> float:
+    value = (value or "").strip().replace("$", "").replace(",", "")
+    return float(value) if value else 0.0
+
+
+def _parse_timestamp(value: str) -> int:
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        moment = None
+        for date_format in _DATE_FORMATS:
+            try:
+                moment = datetime.strptime(value, date_format)
+                break
+            except ValueError:
+                continue
+        if moment is None:
+            raise ValueError(f"Unknown date '{value}'")
+
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
@@ -0,0 +1,94 @@
+from enum import Enum
+import numpy as np
+
+
+class DownsampleMethod(str, Enum):
+    LTTB = "lttb"
+    MIN_MAX = "minmax"
+
+
+def downsample_indexes(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    max_points: int,
+    method: DownsampleMethod = DownsampleMethod.LTTB
+) -> np.ndarray:
+    """
+    Returns the sorted indexes of at most `max_points` points that keep
+    the visual shape of the series
+    """
+    if method is DownsampleMethod.MIN_MAX:
+        return min_max(values, max_points)
+    return lttb(timestamps, values, max_points)
+
+
+def lttb(timestamps: np.ndarray, values: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets \n
+    The first and last points are kept and every bucket in between keeps
+    the point that forms the largest triangle with the point kept in the
+    previous bucket and the average of the next one. Buckets are rows of a
+    matrix, only the choice of each row depends on the previous one
+    """
+    n = len(values)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    # tiempos relativos: los milisegundos absolutos pierden precisión al multiplicar
+    x = (timestamps - timestamps[0]).astype(np.float64)
+    y = values.astype(np.float64)
+    bounds = _bucket_bounds(n - 2, max_points - 2) + 1
+    starts, ends = bounds[:-1], bounds[1:]
+    rows = _bucket_rows(starts, ends)
+
+    # el tercer vértice es la media del bucket siguiente; el último usa el punto final
+    counts = ends - starts
+    next_x = np.r_[(np.add.reduceat(x[:-1], starts) / counts)[1:], x[-1]]
+    next_y = np.r_[(np.add.reduceat(y[:-1], starts) / counts)[1:], y[-1]]
+    X, Y = x[rows], y[rows]
+
+    selected = np.empty(len(starts) + 2, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    ax, ay = x[0], y[0]
+    for bucket in range(len(starts)):
+        row_x, row_y = X[bucket], Y[bucket]
+        area = np.abs(
+            (ax - next_x[bucket]) * (row_y - ay) - (ax - row_x) * (next_y[bucket] - ay)
+        )
+        best = int(area.argmax())
+        selected[bucket + 1] = rows[bucket, best]
+        ax, ay = row_x[best], row_y[best]
+    return selected
+
+
+def min_max(values: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Keeps the lowest and highest point of `max_points` / 2 buckets, fully
+    vectorized
+    """
+    n = len(values)
+    if max_points >= n or max_points < 2:
+        return np.arange(n)
+
+    bounds = _bucket_bounds(n, max_points // 2)
+    rows = _bucket_rows(bounds[:-1], bounds[1:])
+    matrix = values[rows]
+    picked = np.r_[
+        np.take_along_axis(rows, matrix.argmin(axis=1)[:, None], axis=1).ravel(),
+        np.take_along_axis(rows, matrix.argmax(axis=1)[:, None], axis=1).ravel()
+    ]
+    return np.unique(picked)
+
+
+def _bucket_bounds(n: int, buckets: int) -> np.ndarray:
+    # límites fraccionarios como el LTTB original: los buckets difieren como mucho en un punto
+    return (np.arange(buckets + 1) * n) // buckets
+
+
+def _bucket_rows(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Index matrix with one bucket per row, short rows repeat their last
+    index so they tie with it and `argmax` keeps the real one
+    """
+    width = int((ends - starts).max())
+    return np.minimum(starts[:, None] + np.arange(width), ends[:, None] - 1)
@@ -0,0 +1,411 @@
+import math
+from collections import deque
+from dataclasses import dataclass
+from datetime import tzinfo
+from typing import Dict, Optional
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from src.domain.entities.bar_series import BarSeries
+from src.infrastructure.utils.bar_resampler import bucket_start
+
+INDICATOR_NAMES = (
+    "sma",
+    "ema",
+    "rsi",
+    "macd",
+    "macd_signal",
+    "macd_histogram",
+    "bollinger_upper",
+    "bollinger_middle",
+    "bollinger_lower",
+    "vwap",
+)
+
+# cada bloque de la EMA vectorizada escala los valores como mucho por 1e150
+EWM_BLOCK_EXPONENT = 150 * math.log(10)
+
+
+@dataclass(frozen=True)
+class IndicatorParams:
+    """
+    Periodos (en barras) de los indicadores técnicos
+    """
+    sma_period: int = 20
+    ema_period: int = 20
+    rsi_period: int = 14
+    macd_fast: int = 12
+    macd_slow: int = 26
+    macd_signal: int = 9
+    bollinger_period: int = 20
+    bollinger_width: float = 2.0
+
+    def __post_init__(self):
+        periods = (
+            self.sma_period, self.ema_period, self.rsi_period, self.macd_fast,
+            self.macd_slow, self.macd_signal, self.bollinger_period
+        )
+        if min(periods) < 1:
+            raise ValueError("Indicator periods must be positive")
+        if self.macd_fast >= self.macd_slow:
+            raise ValueError("macd_fast must be shorter than macd_slow")
+        if self.bollinger_width <= 0:
+            raise ValueError("bollinger_width must be positive")
+
+    @property
+    def warmup(self) -> int:
+        """
+        Bars needed before every indicator has a value
+        """
+        return max(
+            self.sma_period,
+            self.ema_period,
+            self.rsi_period + 1,
+            self.macd_slow + self.macd_signal - 1,
+            self.bollinger_period
+        )
+
+
+def compute_indicators(series: BarSeries, params: IndicatorParams) -> Dict[str, np.ndarray]:
+    """
+    Computes every indicator over the whole series at once \n
+    Returns one array per name in `INDICATOR_NAMES`, aligned with the bars;
+    bars before the warm-up of an indicator are NaN
+    """
+    close = series.close
+    middle, upper, lower = bollinger(close, params.bollinger_period, params.bollinger_width)
+    line, signal, histogram = macd(close, params.macd_fast, params.macd_slow, params.macd_signal)
+    return {
+        "sma": sma(close, params.sma_period),
+        "ema": ema(close, params.ema_period),
+        "rsi": rsi(close, params.rsi_period),
+        "macd": line,
+        "macd_signal": signal,
+        "macd_histogram": histogram,
+        "bollinger_upper": upper,
+        "bollinger_middle": middle,
+        "bollinger_lower": lower,
+        "vwap": vwap(series.high, series.low, close, series.volume),
+    }
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        # centrar en el primer valor acota el error de redondeo de la suma acumulada
+        sums = np.cumsum(np.r_[0.0, values - values[0]])
+        out[period - 1:] = values[0] + (sums[period:] - sums[:-period]) / period
+    return out
+
+
+def ema(values: np.ndarray, period: int, alpha: Optional[float] = None) -> np.ndarray:
+    """
+    Exponential moving average seeded with the SMA of the first `period`
+    values, `alpha` defaults to 2 / (period + 1). A NaN prefix is skipped
+    """
+    out = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if not len(valid):
+        return out
+    start = valid[0]
+    if len(values) - start < period:
+        return out
+
+    seed = start + period - 1
+    out[seed] = values[start:seed + 1].mean()
+    out[seed + 1:] = _ewm(values[seed + 1:], alpha or 2 / (period + 1), out[seed])
+    return out
+
+
+def rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    Relative strength index with Wilder smoothing
+    """
+    out = np.full(len(close), np.nan)
+    if len(close) <= period:
+        return out
+    changes = np.diff(close)
+    gains = ema(np.maximum(changes, 0), period, 1 / period)
+    losses = ema(np.maximum(-changes, 0), period, 1 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[1:] = np.where(losses == 0, 100.0, 100 - 100 / (1 + gains / losses))
+    out[1:][np.isnan(gains)] = np.nan
+    return out
+
+
+def macd(close: np.ndarray, fast: int, slow: int, signal: int):
+    """
+    Returns the MACD line, its signal line and the histogram
+    """
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(close: np.ndarray, period: int, width: float):
+    """
+    Returns the middle, upper and lower bands (population deviation)
+    """
+    middle = sma(close, period)
+    deviation = np.full(len(close), np.nan)
+    if len(close) >= period:
+        deviation[period - 1:] = sliding_window_view(close, period).std(axis=1)
+    return middle, middle + width * deviation, middle - width * deviation
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """
+    Volume weighted average of the typical price since the first bar
+    """
+    traded = np.cumsum((high + low + close) / 3 * volume)
+    volumes = np.cumsum(volume)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(volumes > 0, traded / volumes, np.nan)
+
+
+def _ewm(values: np.ndarray, alpha: float, previous: float) -> np.ndarray:
+    """
+    Solves y[i] = (1 - alpha) * y[i-1] + alpha * x[i] in closed form by
+    blocks, so the recursion runs in NumPy instead of a Python loop
+    """
+    decay = 1 - alpha
+    if decay <= 0:
+        return values.astype(np.float64)
+
+    out = np.empty(len(values))
+    block = max(1, int(EWM_BLOCK_EXPONENT / -math.log(decay)))
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        growth = decay ** -np.arange(1, len(chunk) + 1, dtype=np.float64)
+        out[start:start + len(chunk)] = (previous + alpha * np.cumsum(chunk * growth)) / growth
+        previous = out[start + len(chunk) - 1]
+    return out
+
+
+class _Ema:
+    """
+    EMA de una serie que crece barra a barra
+    """
+
+    def __init__(self, period: int, alpha: Optional[float] = None):
+        self.period = period
+        self.alpha = alpha or 2 / (period + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value: Optional[float] = None
+
+    def seed(self, values: np.ndarray):
+        self.count = len(values)
+        if self.count >= self.period:
+            self.value = float(ema(values, self.period, self.alpha)[-1])
+        else:
+            self.seed_sum = float(values.sum())
+
+    def peek(self, x: float) -> Optional[float]:
+        if self.value is not None:
+            return self.value + self.alpha * (x - self.value)
+        if self.count + 1 == self.period:
+            return (self.seed_sum + x) / self.period
+        return None
+
+    def push(self, x: float):
+        value = self.peek(x)
+        self.count += 1
+        self.seed_sum += x
+        self.value = value
+
+
+class _Window:
+    """
+    Media y desviación de las últimas `period` barras, actualizadas con
+    Welford para no restar sumas de cuadrados grandes
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values = deque(maxlen=period)
+        self.mean = 0.0
+        self.deviations = 0.0
+
+    def seed(self, values: np.ndarray):
+        window = values[-self.period:]
+        self.values.extend(window.tolist())
+        if len(window):
+            self.mean = float(window.mean())
+            self.deviations = float(((window - self.mean) ** 2).sum())
+
+    def peek(self, x: float):
+        if len(self.values) + 1 < self.period:
+            return None, None
+        mean, deviations = self._step(x)
+        return mean, math.sqrt(max(deviations, 0.0) / self.period)
+
+    def push(self, x: float):
+        self.mean, self.deviations = self._step(x)
+        self.values.append(x)
+
+    def _step(self, x: float):
+        if len(self.values) < self.period:
+            delta = x - self.mean
+            mean = self.mean + delta / (len(self.values) + 1)
+            return mean, self.deviations + delta * (x - mean)
+        # ventana llena: entra `x` y sale la barra más vieja
+        leaving = self.values[0]
+        mean = self.mean + (x - leaving) / self.period
+        return mean, self.deviations + (x - leaving) * (x - mean + leaving - self.mean)
+
+
+class IncrementalIndicators:
+    """
+    Los mismos indicadores que `compute_indicators` actualizados en O(1) por
+    tick. \n
+    El estado guarda las barras cerradas; cada tick recalcula solo la barra
+    en curso de `multiplier` x `timespan` y, al llegar uno de un bucket
+    nuevo, la barra en curso se cierra y pasa al estado.
+    """
+
+    def __init__(
+        self,
+        params: IndicatorParams,
+        timespan: str = "minute",
+        multiplier: int = 1,
+        tz: Optional[tzinfo] = None
+    ):
+        self.params = params
+        self.timespan = timespan
+        self.multiplier = multiplier
+        self.tz = tz
+
+        self._sma = _Window(params.sma_period)
+        self._bollinger = _Window(params.bollinger_period)
+        self._ema = _Ema(params.ema_period)
+        self._gains = _Ema(params.rsi_period, 1 / params.rsi_period)
+        self._losses = _Ema(params.rsi_period, 1 / params.rsi_period)
+        self._fast = _Ema(params.macd_fast)
+        self._slow = _Ema(params.macd_slow)
+        self._signal = _Ema(params.macd_signal)
+        self._previous_close: Optional[float] = None
+        self._traded = 0.0
+        self._volume = 0.0
+
+        # barra en curso: inicio, high, low, close y volumen
+        self._bar_start: Optional[int] = None
+        self._bar = (0.0, 0.0, 0.0, 0.0)
+
+    @classmethod
+    def from_series(
+        cls,
+        series: BarSeries,
+        params: IndicatorParams,
+        timespan: str = "minute",
+        multiplier: int = 1,
+        tz: Optional[tzinfo] = None
+    ) -> "IncrementalIndicators":
+        """
+        Seeds the state from a historic series with vectorized passes, its
+        last bar becomes the bar in progress
+        """
+        indicators = cls(params, timespan, multiplier, tz)
+        if not len(series):
+            return indicators
+
+        closed = series.slice(series.timestamp[0], series.timestamp[-1] - 1)
+        close = closed.close
+        indicators._sma.seed(close)
+        indicators._bollinger.seed(close)
+        indicators._ema.seed(close)
+        if len(close):
+            changes = np.diff(close)
+            indicators._gains.seed(np.maximum(changes, 0))
+            indicators._losses.seed(np.maximum(-changes, 0))
+            indicators._previous_close = float(close[-1])
+        indicators._fast.seed(close)
+        indicators._slow.seed(close)
+        line = ema(close, params.macd_fast) - ema(close, params.macd_slow)
+        indicators._signal.seed(line[~np.isnan(line)])
+        indicators._traded = float(((closed.high + closed.low + close) / 3 * closed.volume).sum())
+        indicators._volume = float(closed.volume.sum())
+
+        indicators._bar_start = int(series.timestamp[-1])
+        indicators._bar = (
+            float(series.high[-1]),
+            float(series.low[-1]),
+            float(series.close[-1]),
+            float(series.volume[-1])
+        )
+        return indicators
+
+    def update(self, timestamp: int, price: float, volume: float = 0.0) -> Dict[str, Optional[float]]:
+        """
+        Applies a tick (timestamp in ms) and returns the indicator values
+        of the bar in progress. Ticks older than that bar are ignored
+        """
+        start = bucket_start(timestamp, self.timespan, self.multiplier, self.tz)
+        if self._bar_start is None or start > self._bar_start:
+            if self._bar_start is not None:
+                self._close_bar()
+            self._bar_start = start
+            self._bar = (price, price, price, volume)
+        elif start == self._bar_start:
+            high, low, _, bar_volume = self._bar
+            self._bar = (max(high, price), min(low, price), price, bar_volume + volume)
+        return self.values()
+
+    def values(self) -> Dict[str, Optional[float]]:
+        if self._bar_start is None:
+            return {"timestamp": None, **dict.fromkeys(INDICATOR_NAMES)}
+
+        high, low, close, volume = self._bar
+        sma_value, _ = self._sma.peek(close)
+        middle, deviation = self._bollinger.peek(close)
+
+        relative_strength = None
+        if self._previous_close is not None:
+            change = close - self._previous_close
+            gain = self._gains.peek(max(change, 0.0))
+            loss = self._losses.peek(max(-change, 0.0))
+            if gain is not None and loss is not None:
+                relative_strength = 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+
+        line = signal = histogram = None
+        fast, slow = self._fast.peek(close), self._slow.peek(close)
+        if fast is not None and slow is not None:
+            line = fast - slow
+            signal = self._signal.peek(line)
+            histogram = None if signal is None else line - signal
+
+        traded = self._traded + (high + low + close) / 3 * volume
+        volumes = self._volume + volume
+        width = self.params.bollinger_width
+        return {
+            "timestamp": self._bar_start,
+            "sma": sma_value,
+            "ema": self._ema.peek(close),
+            "rsi": relative_strength,
+            "macd": line,
+            "macd_signal": signal,
+            "macd_histogram": histogram,
+            "bollinger_upper": None if middle is None else middle + width * deviation,
+            "bollinger_middle": middle,
+            "bollinger_lower": None if middle is None else middle - width * deviation,
+            "vwap": traded / volumes if volumes > 0 else None,
+        }
+
+    def _close_bar(self):
+        high, low, close, volume = self._bar
+        self._sma.push(close)
+        self._bollinger.push(close)
+        self._ema.push(close)
+        if self._previous_close is not None:
+            change = close - self._previous_close
+            self._gains.push(max(change, 0.0))
+            self._losses.push(max(-change, 0.0))
+        self._previous_close = close
+
+        fast, slow = self._fast.peek(close), self._slow.peek(close)
+        self._fast.push(close)
+        self._slow.push(close)
+        if fast is not None and slow is not None:
+            self._signal.push(fast - slow)
+
+        self._traded += (high + low + close) / 3 * volume
+        self._volume += volume
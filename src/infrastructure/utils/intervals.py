@@ -0,0 +1,52 @@
+from typing import Iterable, List, Tuple
+
+Interval = Tuple[int, int]
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """
+    Merges overlapping or adjacent closed integer intervals \n
+    Returns the merged intervals sorted by start
+    """
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(interval: Interval, covered: Iterable[Interval]) -> List[Interval]:
+    """
+    Returns the parts of the closed `interval` not included in `covered`
+    """
+    start, end = interval
+    gaps: List[Interval] = []
+    cursor = start
+    for covered_start, covered_end in merge_intervals(covered):
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start - 1))
+        cursor = max(cursor, covered_end + 1)
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def split_interval(interval: Interval, covered: Iterable[Interval]) -> List[Tuple[int, int, bool]]:
+    """
+    Splits the closed `interval` into ordered segments \n
+    Returns `(start, end, is_covered)` tuples
+    """
+    start, end = interval
+    segments = [(gap_start, gap_end, False) for gap_start, gap_end in subtract_intervals(interval, covered)]
+    for covered_start, covered_end in merge_intervals(covered):
+        if covered_end >= start and covered_start <= end:
+            segments.append((max(covered_start, start), min(covered_end, end), True))
+    return sorted(segments)
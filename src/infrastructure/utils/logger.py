@@ -1,9 +1,16 @@
+import atexit
+import json
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
+
+from src.infrastructure.config.config import configs
 
 class ColoredFormatter(logging.Formatter):
     """Formateador personalizado que agrega colores a los logs"""
-    
+
     COLORS = {
         'DEBUG': '\033[94m',    # Azul
         'INFO': '\033[92m',     # Verde
@@ -20,50 +27,99 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'      # Reset
     }
 
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None):
+        super().__init__(fmt, datefmt)
+        # Un formateador por nivel con los colores ya incrustados en el formato,
+        # así no hay que reemplazar segmentos en cada registro
+        self._formatters = {
+            level: logging.Formatter(self._colorize(fmt or '%(message)s', color), datefmt)
+            for level, color in self.COLORS.items() if level != 'RESET'
+        }
+
+    def _colorize(self, fmt: str, message_color: str) -> str:
+        reset = self.SEGMENT_COLORS['RESET']
+        for segment in ('asctime', 'name', 'levelname'):
+            fmt = fmt.replace(
+                f"%({segment})s",
+                f"{self.SEGMENT_COLORS[segment]}%({segment})s{reset}"
+            )
+        return fmt.replace('%(message)s', f"{message_color}%(message)s{reset}")
+
     def format(self, record):
-        # Guardar el mensaje original
-        original_msg = record.msg
-        
-        # Agregar color al mensaje según el nivel
-        if record.levelname in self.COLORS:
-            record.msg = f"{self.COLORS[record.levelname]}{record.msg}{self.COLORS['RESET']}"
-        
-        # Formatear el mensaje con colores en los segmentos
-        formatted = super().format(record)
-        
-        # Aplicar colores a los segmentos
-        formatted = formatted.replace(
-            record.asctime,
-            f"{self.SEGMENT_COLORS['asctime']}{record.asctime}{self.SEGMENT_COLORS['RESET']}"
-        )
-        formatted = formatted.replace(
-            record.name,
-            f"{self.SEGMENT_COLORS['name']}{record.name}{self.SEGMENT_COLORS['RESET']}"
-        )
-        formatted = formatted.replace(
-            record.levelname,
-            f"{self.SEGMENT_COLORS['levelname']}{record.levelname}{self.SEGMENT_COLORS['RESET']}"
-        )
-        
-        # Restaurar el mensaje original
-        record.msg = original_msg
-        
-        return formatted
+        formatter = self._formatters.get(record.levelname)
+        if formatter is None:
+            return super().format(record)
+        return formatter.format(record)
 
-def setup_logger(name: str) -> logging.Logger:
-    # Crear el logger
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
 
-    # Configurar el formato del log
-    formatter = ColoredFormatter(
+class JsonFormatter(logging.Formatter):
+    """Formateador JSON de una línea por registro, pensado para producción"""
+
+    def format(self, record):
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class _InProcessQueueHandler(QueueHandler):
+    """
+    Encola el registro sin formatearlo: el formateo (incluido `msg % args`)
+    ocurre en el hilo del listener y no en el event loop
+    """
+
+    def prepare(self, record):
+        return record
+
+
+class Truncated:
+    """
+    Wraps a payload so it is converted to text only when the log is emitted
+    and capped at `limit` characters
+    """
+
+    def __init__(self, value: Any, limit: int = configs.LOG_PAYLOAD_MAX_CHARS):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = str(self.value)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... ({len(text)} chars)"
+
+
+def _build_formatter() -> logging.Formatter:
+    if configs.LOG_FORMAT == "json":
+        return JsonFormatter()
+    return ColoredFormatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
 
-    # Handler para consola (con colores)
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+# Un único handler para todos los loggers: escribe en stdout desde un hilo propio
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_queue_handler = _InProcessQueueHandler(_log_queue)
+_console_handler = logging.StreamHandler(sys.stdout)
+_console_handler.setFormatter(_build_formatter())
+_listener = QueueListener(_log_queue, _console_handler, respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)
+
+
+def setup_logger(name: str) -> logging.Logger:
+    # Crear el logger
+    logger = logging.getLogger(name)
+    logger.setLevel(configs.LOG_LEVEL)
+
+    # Evitar handlers duplicados si se llama varias veces con el mismo nombre
+    if _queue_handler not in logger.handlers:
+        logger.addHandler(_queue_handler)
+    logger.propagate = False
 
-    return logger
\ No newline at end of file
+    return logger
@@ -0,0 +1,85 @@
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from enum import Enum
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from src.infrastructure.utils.logger import setup_logger
+
+logger = setup_logger("MarketCalendar")
+
+
+class MarketSession(str, Enum):
+    PRE_MARKET = "pre_market"
+    REGULAR = "regular"
+    AFTER_HOURS = "after_hours"
+    CLOSED = "closed"
+
+
+class MarketCalendar:
+    """
+    Calendario de una bolsa con horario de lunes a viernes (por defecto el de
+    NYSE/NASDAQ en hora de Nueva York) y una lista de festivos
+    """
+
+    def __init__(
+        self,
+        timezone_name: str = "America/New_York",
+        holidays: Iterable[date] = (),
+        pre_market_open: time = time(4, 0),
+        regular_open: time = time(9, 30),
+        regular_close: time = time(16, 0),
+        after_hours_close: time = time(20, 0)
+    ):
+        self.timezone = self._load_timezone(timezone_name)
+        self.holidays = set(holidays)
+        self.pre_market_open = pre_market_open
+        self.regular_open = regular_open
+        self.regular_close = regular_close
+        self.after_hours_close = after_hours_close
+
+    @classmethod
+    def from_settings(cls, timezone_name: str, holidays: str) -> "MarketCalendar":
+        """
+        Builds a calendar from a comma separated list of ISO dates
+        """
+        return cls(
+            timezone_name,
+            [date.fromisoformat(day.strip()) for day in holidays.split(",") if day.strip()]
+        )
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays
+
+    def session(self, now: Optional[datetime] = None) -> MarketSession:
+        local = (now or datetime.now(timezone.utc)).astimezone(self.timezone)
+        if not self.is_trading_day(local.date()):
+            return MarketSession.CLOSED
+
+        current = local.time()
+        if self.regular_open <= current < self.regular_close:
+            return MarketSession.REGULAR
+        if self.pre_market_open <= current < self.regular_open:
+            return MarketSession.PRE_MARKET
+        if self.regular_close <= current < self.after_hours_close:
+            return MarketSession.AFTER_HOURS
+        return MarketSession.CLOSED
+
+    def next_open(self, now: Optional[datetime] = None) -> datetime:
+        """
+        Returns the start of the next pre-market session
+        """
+        local = (now or datetime.now(timezone.utc)).astimezone(self.timezone)
+        day = local.date()
+        if local.time() >= self.pre_market_open:
+            day += timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return datetime.combine(day, self.pre_market_open, tzinfo=self.timezone)
+
+    @staticmethod
+    def _load_timezone(name: str) -> tzinfo:
+        try:
+            return ZoneInfo(name)
+        except ZoneInfoNotFoundError:
+            # imágenes sin tzdata: hora estándar de Nueva York, sin horario de verano
+            logger.warning("Timezone %s not found, using UTC-5", name)
+            return timezone(timedelta(hours=-5))
@@ -0,0 +1,212 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence
+import numpy as np
+from src.domain.entities.bar_matrix import BarMatrix
+from src.domain.entities.portfolio_entities import LedgerPosition, PositionEntity, Transaction, TransactionType
+
+_TYPE_CODES = {transaction_type: code for code, transaction_type in enumerate(TransactionType)}
+_BUY = _TYPE_CODES[TransactionType.BUY]
+_SELL = _TYPE_CODES[TransactionType.SELL]
+_DIVIDEND = _TYPE_CODES[TransactionType.DIVIDEND]
+_SPLIT = _TYPE_CODES[TransactionType.SPLIT]
+
+QUANTITY_EPSILON = 1e-9
+
+
+@dataclass(frozen=True)
+class PortfolioValuation:
+    """
+    Valoración de una cartera en cada fila de una `BarMatrix`: valor de
+    mercado, coste (coste medio), P&L realizado acumulado y no realizado,
+    retorno de cada periodo y retorno ponderado en el tiempo acumulado.
+    """
+    timestamp: np.ndarray
+    market_value: np.ndarray
+    cost_basis: np.ndarray
+    realized_pnl: np.ndarray
+    unrealized_pnl: np.ndarray
+    returns: np.ndarray
+    time_weighted_return: np.ndarray
+    positions: List[PositionEntity]
+
+
+def value_portfolio(transactions: Sequence[Transaction], prices: BarMatrix) -> PortfolioValuation:
+    """
+    Values the transactions over the split adjusted close matrix `prices` \n
+    Every step is an array operation over all events or over the whole
+    timestamps x symbols grid, there is no loop per position or per day.
+    Transactions of symbols missing from the matrix are ignored; sells
+    never take a position below zero
+    """
+    rows, columns = prices.values.shape
+    column_of = {symbol: column for column, symbol in enumerate(prices.symbols)}
+    transactions = [item for item in transactions if item.symbol.upper() in column_of]
+
+    column = np.array([column_of[item.symbol.upper()] for item in transactions], dtype=np.int64)
+    kind = np.array([_TYPE_CODES[item.type] for item in transactions], dtype=np.int64)
+    timestamp = np.array([item.timestamp for item in transactions], dtype=np.int64)
+    quantity = np.array([item.quantity for item in transactions], dtype=np.float64)
+    price = np.array([item.price for item in transactions], dtype=np.float64)
+    fee = np.array([item.fee for item in transactions], dtype=np.float64)
+
+    # eventos agrupados por símbolo y en orden temporal (estable ante empates)
+    order = np.lexsort((np.arange(len(transactions)), timestamp, column))
+    column, kind, timestamp, quantity, price, fee = (
+        array[order] for array in (column, kind, timestamp, quantity, price, fee)
+    )
+    group_start = np.r_[True, column[1:] != column[:-1]] if len(column) else np.empty(0, dtype=bool)
+
+    # los precios ajustados están en acciones de hoy: cada operación se pasa a
+    # esas unidades con los splits posteriores a ella
+    split_log = np.where(kind == _SPLIT, np.log(quantity), 0.0)
+    later_splits = _group_total(split_log, group_start) - _group_cumsum(split_log, group_start)
+    units = quantity * np.exp(later_splits)
+    delta = np.where(kind == _BUY, units, np.where(kind == _SELL, -units, 0.0))
+
+    held_after = _group_cumsum(delta, group_start)
+    if (held_after < 0).any():
+        held_after = _floor_at_zero(held_after, group_start)
+    # restos de coma flotante de una posición cerrada
+    held_after = np.where(np.abs(held_after) < QUANTITY_EPSILON, 0.0, held_after)
+    held_before = np.where(group_start, 0.0, np.r_[0.0, held_after[:-1]])
+    delta = held_after - held_before
+    # una venta mayor que la posición solo la cierra y cobra la parte vendida
+    executed = np.where(kind == _SELL, -delta / units, 1.0)
+
+    # coste medio: basis[k] = kept[k] * basis[k-1] + bought[k]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kept = np.where((kind == _SELL) & (held_before > 0), held_after / held_before, 1.0)
+    bought = np.where(kind == _BUY, quantity * price + fee, 0.0)
+    basis = _linear_recurrence(kept, bought, group_start)
+    basis_before = np.where(group_start, 0.0, np.r_[0.0, basis[:-1]])
+
+    cash = (quantity * price - fee) * executed
+    realized = np.where(
+        kind == _SELL, cash - (basis_before - basis),
+        np.where(kind == _DIVIDEND, cash, 0.0)
+    )
+    # flujo hacia las posiciones: compras entran, ventas y dividendos salen
+    flow = np.where(kind == _BUY, bought, np.where((kind == _SELL) | (kind == _DIVIDEND), -cash, 0.0))
+
+    # cada evento cuenta desde la fila de la barra en la que ocurre
+    row = np.clip(np.searchsorted(prices.timestamp, timestamp, side="right") - 1, 0, max(rows - 1, 0))
+    units_grid = _scatter_cumsum(rows, columns, row, column, delta)
+    basis_grid = _scatter_cumsum(rows, columns, row, column, basis - basis_before)
+    realized_grid = _scatter_cumsum(rows, columns, row, column, realized)
+    flows = np.bincount(row, weights=flow, minlength=rows)[:rows]
+
+    value_grid = units_grid * np.nan_to_num(prices.values)
+    market_value = value_grid.sum(axis=1)
+    cost_basis = basis_grid.sum(axis=1)
+
+    previous = np.r_[0.0, market_value[:-1]]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(previous > 0, (market_value - flows) / previous - 1, 0.0)
+
+    positions = [] if not rows else [
+        PositionEntity(
+            symbol=symbol,
+            quantity=units_grid[-1, position],
+            cost_basis=basis_grid[-1, position],
+            market_value=value_grid[-1, position],
+            realized_pnl=realized_grid[-1, position],
+            unrealized_pnl=value_grid[-1, position] - basis_grid[-1, position]
+        )
+        for position, symbol in enumerate(prices.symbols)
+    ]
+
+    return PortfolioValuation(
+        timestamp=prices.timestamp,
+        market_value=market_value,
+        cost_basis=cost_basis,
+        realized_pnl=realized_grid.sum(axis=1),
+        unrealized_pnl=market_value - cost_basis,
+        returns=returns,
+        time_weighted_return=np.cumprod(1 + returns) - 1,
+        positions=positions
+    )
+
+
+def apply_transactions(positions: Dict[str, LedgerPosition], transactions: Iterable[Transaction]) -> None:
+    """
+    Applies `transactions`, in order, to the running `positions` keyed by
+    symbol with the same rules as `value_portfolio`: average cost, splits
+    multiply the quantity and sells never take a position below zero \n
+    The cost is one step per transaction, so a ledger only replays what
+    happened after its last snapshot
+    """
+    for item in transactions:
+        symbol = item.symbol.upper()
+        position = positions.setdefault(symbol, LedgerPosition(symbol=symbol))
+
+        if item.type is TransactionType.BUY:
+            position.quantity += item.quantity
+            position.cost_basis += item.quantity * item.price + item.fee
+        elif item.type is TransactionType.SELL:
+            sold = min(item.quantity, position.quantity)
+            if sold <= 0:
+                continue
+            cost = position.cost_basis * sold / position.quantity
+            cash = (item.quantity * item.price - item.fee) * sold / item.quantity
+            position.realized_pnl += cash - cost
+            position.quantity -= sold
+            position.cost_basis -= cost
+            if position.quantity < QUANTITY_EPSILON:
+                position.quantity, position.cost_basis = 0.0, 0.0
+        elif item.type is TransactionType.DIVIDEND:
+            position.realized_pnl += item.quantity * item.price - item.fee
+        elif item.type is TransactionType.SPLIT:
+            position.quantity *= item.quantity
+
+
+def _group_cumsum(values: np.ndarray, group_start: np.ndarray) -> np.ndarray:
+    """
+    Cumulative sum that restarts at every `group_start`
+    """
+    if not len(values):
+        return values.astype(np.float64)
+    totals = np.cumsum(values)
+    start = np.maximum.accumulate(np.where(group_start, np.arange(len(values)), 0))
+    return totals - (totals - values)[start]
+
+
+def _group_total(values: np.ndarray, group_start: np.ndarray) -> np.ndarray:
+    """
+    Total of the group of every element
+    """
+    if not len(values):
+        return values.astype(np.float64)
+    starts = np.flatnonzero(group_start)
+    totals = np.add.reduceat(values, starts)
+    return np.repeat(totals, np.diff(np.r_[starts, len(values)]))
+
+
+def _floor_at_zero(totals: np.ndarray, group_start: np.ndarray) -> np.ndarray:
+    """
+    Turns the cumulative sums of every group into running sums that never
+    go below zero, subtracting the running minimum of each group
+    """
+    floored = totals.copy()
+    bounds = np.r_[np.flatnonzero(group_start), len(totals)]
+    # solo se llega aquí con ventas en descubierto, que son excepcionales
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        floored[start:end] -= np.minimum.accumulate(np.minimum(totals[start:end], 0.0))
+    return floored
+
+
+def _linear_recurrence(factor: np.ndarray, addend: np.ndarray, group_start: np.ndarray) -> np.ndarray:
+    """
+    Solves y[k] = factor[k] * y[k-1] + addend[k] (y = 0 before each group)
+    with cumulative products. A zero factor drops everything before it, so
+    it starts a new segment instead of dividing by zero
+    """
+    segment_start = group_start | (factor == 0)
+    factor = np.where(segment_start, 1.0, factor)
+    scale = np.exp(_group_cumsum(np.log(factor), segment_start))
+    return scale * _group_cumsum(addend / scale, segment_start)
+
+
+def _scatter_cumsum(rows: int, columns: int, row: np.ndarray, column: np.ndarray, values: np.ndarray) -> np.ndarray:
+    grid = np.zeros((rows, columns))
+    np.add.at(grid, (row, column), values)
+    return np.cumsum(grid, axis=0)
@@ -0,0 +1,173 @@
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+from pydantic import BaseModel
+from src.infrastructure.utils.logger import setup_logger
+from src.infrastructure.utils.single_flight import SingleFlight
+
+logger = setup_logger("TTLCache")
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate bytes of a cached value \n
+    `sys.getsizeof` is shallow (a pydantic model always measures the same),
+    so models are measured by their serialized JSON
+    """
+    if isinstance(value, BaseModel):
+        return len(value.model_dump_json())
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    stored_at: float
+    size: int
+
+
+class TTLCache:
+    """
+    Cache en memoria con TTL por entrada, expulsión LRU y
+    stale-while-revalidate. \n
+    - `ttl`: segundos que una entrada se considera fresca. \n
+    - `stale_ttl`: segundos extra durante los que se sirve el valor viejo
+      mientras se refresca en segundo plano. \n
+    - `max_entries` / `max_bytes`: límites que disparan la expulsión LRU
+      (`0` desactiva el límite).
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float = 0.0,
+        max_entries: int = 1000,
+        max_bytes: int = 0,
+        sizeof: Callable[[Any], int] = estimate_size
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._single_flight = SingleFlight()
+        self._refresh_tasks: Set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_serves = 0
+        self.evictions = 0
+        self.refresh_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns the value only if it is still fresh, without loading it
+        """
+        entry = self._entries.get(key)
+        if entry is None or self._age(entry) > self.ttl:
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def set(self, key: Hashable, value: Any):
+        self._remove(key)
+        entry = _CacheEntry(value=value, stored_at=time.monotonic(), size=self._sizeof(value))
+        self._entries[key] = entry
+        self._bytes += entry.size
+        self._evict()
+
+    def delete(self, key: Hashable):
+        self._remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            age = self._age(entry)
+            if age <= self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+
+            if age <= self.ttl + self.stale_ttl:
+                self.stale_serves += 1
+                self._entries.move_to_end(key)
+                self._refresh_in_background(key, loader)
+                return entry.value
+
+        self.misses += 1
+        return await self._load(key, loader)
+
+    async def refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Loads the value now, even if the stored one is fresh, and stores it
+        """
+        return await self._load(key, loader)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        async def load_and_store():
+            value = await loader()
+            self.set(key, value)
+            return value
+
+        # cargas concurrentes de la misma clave comparten una sola llamada
+        return await self._single_flight.do(key, load_and_store)
+
+    def _refresh_in_background(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        if self._single_flight.is_in_flight(key):
+            return
+
+        async def refresh():
+            try:
+                await self._load(key, loader)
+            except Exception as e:
+                self.refresh_errors += 1
+                logger.warning(f"Background refresh failed for {key}: {e}")
+
+        task = asyncio.create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    def _age(self, entry: _CacheEntry) -> float:
+        return time.monotonic() - entry.stored_at
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self):
+        while self._entries and (
+            (self.max_entries and len(self._entries) > self.max_entries) or
+            (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    @property
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_serves": self.stale_serves,
+            "evictions": self.evictions,
+            "refresh_errors": self.refresh_errors,
+        }
@@ -28,7 +28,6 @@ async def get_websocket_user_session(
         WebSocketException si la autenticación falla.
     """
     user_info: UserProfileEntity | None = None
-    logger.info(f"Validando sesión con token: {token}")
 
     if not token:
         logger.info("No se proporcionó un token de acceso.")
@@ -38,7 +37,6 @@ async def get_websocket_user_session(
         )
     
     try:
-        logger.info(f"token: {token}")
         user_info = await auth_service.validate_session(token)
     except Exception as e:
         logger.info(f"Error al validar sesión con token: {e}")
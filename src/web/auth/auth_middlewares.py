@@ -22,7 +22,7 @@ AUTH_SERVICE_PATHS_PREFIX = f"/{AUTH_PREFIX}"
 
 class AuthMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        logger.info(f"Request: {request.url.path}")
+        logger.info("Request: %s", request.url.path)
 
         is_public_path = (
            request.url.path in PUBLIC_PATHS or \
@@ -0,0 +1 @@
+PORTFOLIO_PREFIX = "portfolio"
\ No newline at end of file
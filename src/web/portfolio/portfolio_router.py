@@ -0,0 +1,68 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, Request, UploadFile
+from src.application.dtos.portfolio_dtos import LedgerImportResponse, LedgerTransactionsRequest, PortfolioValuationRequest, PortfolioValuationResponse, PositionsResponse
+from src.application.services.portfolio_service import PortfolioService
+from src.infrastructure.config.application_container import AplicationContainer
+from dependency_injector.wiring import Provide, inject
+
+from src.web.portfolio.portfolio_constants import PORTFOLIO_PREFIX
+
+router = APIRouter(prefix=f'/{PORTFOLIO_PREFIX}', tags=[PORTFOLIO_PREFIX])
+
+@router.post("/valuation", response_model=PortfolioValuationResponse)
+@inject
+async def value_portfolio(
+    body: PortfolioValuationRequest,
+    portfolio_service: Annotated[
+        PortfolioService,
+        Depends(Provide[AplicationContainer.portfolio_service])
+    ]
+):
+    return await portfolio_service.value_transactions(
+        body.transactions,
+        group_by=body.group_by,
+        to_timestamp=body.to_timestamp
+    )
+
+
+@router.post("/transactions", response_model=LedgerImportResponse)
+@inject
+async def add_transactions(
+    request: Request,
+    body: LedgerTransactionsRequest,
+    portfolio_service: Annotated[
+        PortfolioService,
+        Depends(Provide[AplicationContainer.portfolio_service])
+    ]
+):
+    user = request.state.current_user
+    imported = await portfolio_service.add_transactions(user.id, body.transactions)
+    return LedgerImportResponse(imported=imported)
+
+
+@router.post("/transactions/import", response_model=LedgerImportResponse)
+@inject
+async def import_transactions(
+    request: Request,
+    file: UploadFile,
+    portfolio_service: Annotated[
+        PortfolioService,
+        Depends(Provide[AplicationContainer.portfolio_service])
+    ]
+):
+    user = request.state.current_user
+    imported = await portfolio_service.import_csv(user.id, file.file)
+    return LedgerImportResponse(imported=imported)
+
+
+@router.get("/positions", response_model=PositionsResponse)
+@inject
+async def get_positions(
+    request: Request,
+    portfolio_service: Annotated[
+        PortfolioService,
+        Depends(Provide[AplicationContainer.portfolio_service])
+    ]
+):
+    user = request.state.current_user
+    return await portfolio_service.get_positions(user.id)
@@ -0,0 +1,129 @@
+import importlib.util
+import io
+import json
+import struct
+from typing import AsyncIterator, Optional
+from fastapi import HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from src.domain.entities.bar_matrix import BarMatrix
+from src.domain.entities.bar_series import BarSeries
+
+_pyarrow_available = importlib.util.find_spec("pyarrow") is not None
+if _pyarrow_available:
+    import pyarrow as pa
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+MATRIX_MEDIA_TYPE = "application/octet-stream"
+
+# magic, filas, columnas y bytes de los nombres de símbolos
+_MATRIX_HEADER = struct.Struct("<4sIII")
+MATRIX_MAGIC = b"BMX1"
+
+HISTORIC_FORMATS = {
+    "json": "application/json",
+    "ndjson": NDJSON_MEDIA_TYPE,
+    "arrow": ARROW_MEDIA_TYPE,
+}
+
+
+def negotiate_historic_format(request: Request, format: Optional[str] = None) -> str:
+    """
+    Picks the historic response format from `?format=` or the `Accept`
+    header, JSON by default
+    """
+    if format is None:
+        accept = request.headers.get("accept", "")
+        format = next(
+            (name for name, media_type in HISTORIC_FORMATS.items() if media_type in accept and name != "json"),
+            "json"
+        )
+    if format not in HISTORIC_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format {format}")
+    if format == "arrow" and not _pyarrow_available:
+        raise HTTPException(status_code=406, detail="Arrow responses need the 'arrow' extra (pyarrow)")
+    return format
+
+
+def negotiate_matrix_format(request: Request, format: Optional[str] = None) -> str:
+    if format is None:
+        format = "binary" if MATRIX_MEDIA_TYPE in request.headers.get("accept", "") else "json"
+    if format not in ("json", "binary"):
+        raise HTTPException(status_code=400, detail=f"Unknown format {format}")
+    return format
+
+
+def matrix_binary_response(matrix: BarMatrix) -> Response:
+    """
+    Encodes a matrix as one little-endian buffer: `<4sIII>` header (magic,
+    rows, columns, symbol bytes), the symbols joined by `\\n` and padded to
+    8 bytes, the int64 timestamps and the float64 values row by row (NaN
+    when missing). Clients can map both arrays without parsing \n
+    Failed symbols travel JSON encoded in the `X-Symbol-Errors` header
+    """
+    names = "\n".join(matrix.symbols).encode()
+    padding = -(_MATRIX_HEADER.size + len(names)) % 8
+    rows, columns = matrix.values.shape
+    body = b"".join((
+        _MATRIX_HEADER.pack(MATRIX_MAGIC, rows, columns, len(names)),
+        names,
+        bytes(padding),
+        matrix.timestamp.astype("<i8").tobytes(),
+        matrix.values.astype("<f8").tobytes(),
+    ))
+    headers = {"X-Symbol-Errors": json.dumps(matrix.errors)} if matrix.errors else None
+    return Response(body, media_type=MATRIX_MEDIA_TYPE, headers=headers)
+
+
+async def stream_historic_response(format: str, pages: AsyncIterator[BarSeries]) -> StreamingResponse:
+    """
+    Streams the quotes of `pages` as NDJSON or Arrow IPC, one page at a
+    time so memory does not grow with the range \n
+    The first page is awaited here: an upstream error still becomes a
+    regular error response instead of a truncated body
+    """
+    first = await anext(pages, None)
+
+    async def all_pages() -> AsyncIterator[BarSeries]:
+        if first is not None:
+            yield first
+            async for page in pages:
+                yield page
+
+    encode = _ndjson_chunks if format == "ndjson" else _arrow_chunks
+    return StreamingResponse(encode(all_pages()), media_type=HISTORIC_FORMATS[format])
+
+
+async def _ndjson_chunks(pages: AsyncIterator[BarSeries]) -> AsyncIterator[bytes]:
+    async for page in pages:
+        # mismo esquema que la respuesta JSON: un StockQuote por línea
+        yield b"".join(quote.model_dump_json().encode() + b"\n" for quote in page.to_quotes())
+
+
+async def _arrow_chunks(pages: AsyncIterator[BarSeries]) -> AsyncIterator[bytes]:
+    """
+    Arrow IPC stream with a `timestamp` (ms, UTC) and a `price` column,
+    one record batch per page built over the page arrays without copies
+    """
+    schema = pa.schema([
+        ("timestamp", pa.timestamp("ms", tz="UTC")),
+        ("price", pa.float64()),
+    ])
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, schema)
+
+    def flush() -> bytes:
+        chunk = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return chunk
+
+    async for page in pages:
+        writer.write_batch(pa.record_batch([
+            pa.array(page.timestamp, type=pa.timestamp("ms", tz="UTC")),
+            pa.array(page.close),
+        ], schema=schema))
+        yield flush()
+    writer.close()
+    yield flush()
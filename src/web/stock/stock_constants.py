@@ -0,0 +1,2 @@
+STOCKS_PREFIX = "stocks"
+MAX_BATCH_SYMBOLS = 200
@@ -1,10 +1,15 @@
 from typing import Annotated, List
-from fastapi import APIRouter, Depends, Request
-from src.stocks.service import StockService
-from core.infrastructure.di.application_container import AplicationContainer
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from src.application.dtos.stock_dtos import BarSeriesResponse, BatchQuotesRequest, BatchQuotesResponse, HistoricMatrixResponse, IndicatorsResponse
+from src.application.services.stock_service import StockService
+from src.infrastructure.config.application_container import AplicationContainer
+from src.infrastructure.utils.downsampling import DownsampleMethod
+from src.infrastructure.utils.indicators import IndicatorParams
 from dependency_injector.wiring import Provide, inject
 
-from src.stocks.models import STOCKS_PREFIX, StockQuote
+from src.domain.entities.stock_entities import StockQuote
+from src.web.stock.historic_formats import matrix_binary_response, negotiate_historic_format, negotiate_matrix_format, stream_historic_response
+from src.web.stock.stock_constants import STOCKS_PREFIX, MAX_BATCH_SYMBOLS
 
 router = APIRouter(prefix=f'/{STOCKS_PREFIX}', tags=[STOCKS_PREFIX])
 
@@ -16,6 +21,76 @@ async def get_stocks(
     return {"message": "Lista de stocks", "user": user}
 
 
+@router.get("/quotes", response_model=BatchQuotesResponse)
+@inject
+async def get_stock_quotes(
+    stock_service: Annotated[
+        StockService,
+        Depends(Provide[AplicationContainer.stock_service])
+    ],
+    symbols: Annotated[str, Query(description="Comma separated symbols")]
+):
+    return await _get_stock_quotes(stock_service, symbols.split(","))
+
+
+@router.post("/quotes", response_model=BatchQuotesResponse)
+@inject
+async def post_stock_quotes(
+    body: BatchQuotesRequest,
+    stock_service: Annotated[
+        StockService,
+        Depends(Provide[AplicationContainer.stock_service])
+    ]
+):
+    return await _get_stock_quotes(stock_service, body.symbols)
+
+
+@router.get(
+    "/matrix",
+    response_model=HistoricMatrixResponse,
+    responses={200: {"content": {"application/octet-stream": {}}}}
+)
+@inject
+async def get_historic_matrix(
+    request: Request,
+    symbols: Annotated[str, Query(description="Comma separated symbols")],
+    from_timestamp: int,
+    to_timestamp: int,
+    group_by: str,
+    stock_service: Annotated[
+        StockService, Depends(Provide[AplicationContainer.stock_service])
+    ],
+    multiplier: Annotated[int, Query(ge=1)] = 1,
+    column: str = "close",
+    format: Annotated[str | None, Query(description="json or binary, overrides Accept")] = None
+):
+    symbol_list = symbols.split(",")
+    if len(symbol_list) > MAX_BATCH_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"Too many symbols, max {MAX_BATCH_SYMBOLS}")
+    response_format = negotiate_matrix_format(request, format)
+
+    matrix = await stock_service.get_historic_matrix(
+        symbols=symbol_list,
+        from_timestamp=from_timestamp,
+        to_timestamp=to_timestamp,
+        group_by=group_by,
+        multiplier=multiplier,
+        column=column
+    )
+    if response_format == "binary":
+        return matrix_binary_response(matrix)
+
+    return HistoricMatrixResponse(
+        group_by=group_by,
+        multiplier=multiplier,
+        column=column,
+        symbols=matrix.symbols,
+        timestamp=matrix.timestamp.tolist(),
+        values=matrix.to_rows(),
+        errors=matrix.errors
+    )
+
+
 @router.get("/{stock_symbol}/current", response_model=StockQuote)
 @inject
 async def get_stock(
@@ -28,20 +103,123 @@ async def get_stock(
     return await stock_service.get_current_stock_price(stock_symbol)
 
 
-@router.get("/{stock_symbol}/historic", response_model=List[StockQuote])
+@router.get(
+    "/{stock_symbol}/historic",
+    response_model=List[StockQuote],
+    responses={200: {"content": {"application/x-ndjson": {}, "application/vnd.apache.arrow.stream": {}}}}
+)
 @inject
 async def get_historic_stock(
+    request: Request,
     stock_symbol: str,
     from_timestamp: int,
     to_timestamp: int,
     group_by: str,
     stock_service: Annotated[
         StockService, Depends(Provide[AplicationContainer.stock_service])
-    ]
+    ],
+    multiplier: Annotated[int, Query(ge=1)] = 1,
+    max_points: Annotated[int | None, Query(ge=3, description="Downsample to at most this many points")] = None,
+    downsample: DownsampleMethod = DownsampleMethod.LTTB,
+    format: Annotated[str | None, Query(description="json, ndjson or arrow, overrides Accept")] = None
 ):
+    # ndjson / arrow se envían por páginas en vez de armar la lista completa
+    response_format = negotiate_historic_format(request, format)
+    if response_format != "json":
+        return await stream_historic_response(
+            response_format,
+            stock_service.stream_historic_series(
+                symbol=stock_symbol,
+                from_timestamp=from_timestamp,
+                to_timestamp=to_timestamp,
+                group_by=group_by,
+                multiplier=multiplier,
+                max_points=max_points,
+                downsample=downsample
+            )
+        )
+
     return await stock_service.get_historic_stock_price(
         symbol=stock_symbol,
         from_timestamp=from_timestamp,
         to_timestamp=to_timestamp,
-        group_by=group_by
+        group_by=group_by,
+        multiplier=multiplier,
+        max_points=max_points,
+        downsample=downsample
     )
+
+
+@router.get("/{stock_symbol}/bars", response_model=BarSeriesResponse)
+@inject
+async def get_historic_bars(
+    stock_symbol: str,
+    from_timestamp: int,
+    to_timestamp: int,
+    group_by: str,
+    stock_service: Annotated[
+        StockService, Depends(Provide[AplicationContainer.stock_service])
+    ],
+    multiplier: Annotated[int, Query(ge=1)] = 1,
+    adjusted: bool = True
+):
+    return await stock_service.get_historic_bars(
+        symbol=stock_symbol,
+        from_timestamp=from_timestamp,
+        to_timestamp=to_timestamp,
+        group_by=group_by,
+        multiplier=multiplier,
+        adjusted=adjusted
+    )
+
+
+@router.get("/{stock_symbol}/indicators", response_model=IndicatorsResponse)
+@inject
+async def get_stock_indicators(
+    stock_symbol: str,
+    from_timestamp: int,
+    to_timestamp: int,
+    group_by: str,
+    stock_service: Annotated[
+        StockService, Depends(Provide[AplicationContainer.stock_service])
+    ],
+    multiplier: Annotated[int, Query(ge=1)] = 1,
+    indicators: Annotated[str | None, Query(description="Comma separated indicators, all by default")] = None,
+    sma_period: Annotated[int, Query(ge=1)] = 20,
+    ema_period: Annotated[int, Query(ge=1)] = 20,
+    rsi_period: Annotated[int, Query(ge=1)] = 14,
+    macd_fast: Annotated[int, Query(ge=1)] = 12,
+    macd_slow: Annotated[int, Query(ge=1)] = 26,
+    macd_signal: Annotated[int, Query(ge=1)] = 9,
+    bollinger_period: Annotated[int, Query(ge=1)] = 20,
+    bollinger_width: Annotated[float, Query(gt=0)] = 2.0
+):
+    try:
+        params = IndicatorParams(
+            sma_period=sma_period,
+            ema_period=ema_period,
+            rsi_period=rsi_period,
+            macd_fast=macd_fast,
+            macd_slow=macd_slow,
+            macd_signal=macd_signal,
+            bollinger_period=bollinger_period,
+            bollinger_width=bollinger_width
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return await stock_service.get_indicators(
+        symbol=stock_symbol,
+        from_timestamp=from_timestamp,
+        to_timestamp=to_timestamp,
+        group_by=group_by,
+        params=params,
+        names=[name.strip() for name in indicators.split(",") if name.strip()] if indicators else None,
+        multiplier=multiplier
+    )
+
+
+async def _get_stock_quotes(stock_service: StockService, symbols: List[str]) -> BatchQuotesResponse:
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"Too many symbols, max {MAX_BATCH_SYMBOLS}")
+    return await stock_service.get_current_stock_prices(symbols)
@@ -1,19 +1,91 @@
-import asyncio
+import json
 from typing import Annotated
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 
-from src.auth.dependencies import get_websocket_user_session
-from src.auth.models import User
-from src.stocks.models import STOCKS_PREFIX
-from src.stocks.service import StockService
-from core.infrastructure.di.application_container import AplicationContainer
+from src.web.auth.auth_dependencies import get_websocket_user_session
+from src.domain.entities.user_entities import UserProfileEntity
+from src.web.stock.stock_constants import STOCKS_PREFIX
+from src.application.services.stock_service import StockService
+from src.infrastructure.config.application_container import AplicationContainer
+from src.infrastructure.data_sources.ws.frame_codecs import negotiate_frame_codec
+from src.infrastructure.data_sources.ws.websocket_sender import SlowClientError
 from dependency_injector.wiring import Provide, inject
-from core.infrastructure.logger.logger import setup_logger
+from src.infrastructure.utils.logger import setup_logger
 
 logger = setup_logger('stocks.ws')
 
 router = APIRouter(prefix=f'/{STOCKS_PREFIX}/ws', tags=[f'{STOCKS_PREFIX}-ws'])
 
+@router.websocket("/quotes")
+@inject
+async def quotes_websocket_endpoint(
+    *,
+    websocket: WebSocket,
+    stock_service: Annotated[
+        StockService, Depends(Provide[AplicationContainer.stock_service])
+    ],
+    session_data: Annotated[
+        UserProfileEntity, Depends(get_websocket_user_session)
+    ]
+):
+    """
+    Un solo socket para muchos símbolos. \n
+    El cliente envía `{"action": "subscribe" | "unsubscribe", "symbols": [...]}`
+    y recibe un frame `{"type": "quotes", "data": {symbol: quote}}` por tick. \n
+    Con `"indicators": true` al suscribir también recibe
+    `{"type": "indicators", "data": {symbol: {...}}}` con SMA, EMA, RSI, MACD
+    y Bollinger de la barra en curso, en cuanto se siembran con la historia
+    (VWAP no: los quotes no traen volumen). \n
+    Con el subprotocolo `stocks.msgpack` / `stocks.binary` (o `?format=`) los
+    quotes viajan como deltas compactos; los frames de control siguen en JSON.
+    Un formato desconocido o no instalado cierra con 1003 en lugar de caer a JSON.
+    """
+    codec, subprotocol = negotiate_frame_codec(websocket)
+    await websocket.accept(subprotocol=subprotocol)
+    stream = stock_service.create_price_stream(websocket, codec)
+
+    try:
+        stream.send({
+            "type": "user_info",
+            "data": session_data.model_dump()
+        })
+
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                message = None
+            action = message.get("action") if isinstance(message, dict) else None
+            symbols = message.get("symbols", []) if isinstance(message, dict) else []
+
+            if action not in ("subscribe", "unsubscribe") or not isinstance(symbols, list):
+                stream.send({
+                    "type": "error",
+                    "message": "Expected {\"action\": \"subscribe\" | \"unsubscribe\", \"symbols\": [...]}"
+                })
+                continue
+
+            rejected = []
+            if action == "subscribe":
+                rejected = await stream.subscribe(symbols, indicators=message.get("indicators") is True)
+            else:
+                await stream.unsubscribe(symbols)
+
+            stream.send({
+                "type": "subscriptions",
+                "symbols": stream.symbols,
+                "indicators": stream.indicator_symbols,
+                "rejected": rejected,
+            })
+
+    except WebSocketDisconnect:
+        logger.info("Conexión multiplexada cerrada")
+    except SlowClientError as e:
+        logger.info("Conexión multiplexada descartada: %s", e)
+    finally:
+        await stream.close()
+
+
 @router.websocket("/{stock_symbol}")
 @inject
 async def websocket_endpoint(
@@ -24,10 +96,11 @@ async def websocket_endpoint(
         StockService, Depends(Provide[AplicationContainer.stock_service])
     ],
     session_data: Annotated[
-        User, Depends(get_websocket_user_session)
+        UserProfileEntity, Depends(get_websocket_user_session)
     ]
 ):
-    await websocket.accept()
+    codec, subprotocol = negotiate_frame_codec(websocket)
+    await websocket.accept(subprotocol=subprotocol)
 
     try:
 
@@ -36,12 +109,11 @@ async def websocket_endpoint(
             "data": session_data.model_dump()
         })
 
-        # Iniciar el polling de datos
-        asyncio.create_task(
-            stock_service.start_current_stock_price_polling(
-                websocket,
-                stock_symbol
-            )
+        # Suscribir el socket al poller compartido del símbolo
+        await stock_service.start_current_stock_price_polling(
+            websocket,
+            stock_symbol,
+            codec
         )
 
         while True:
@@ -51,6 +123,7 @@ async def websocket_endpoint(
 
     except WebSocketDisconnect:
         logger.info(f"Conexión cerrada para {stock_symbol}")
-        await stock_service.stop_current_stock_price_polling()
+    except SlowClientError as e:
+        logger.info(f"Conexión descartada para {stock_symbol}: {e}")
     finally:
         await stock_service.stop_current_stock_price_polling()
\ No newline at end of file
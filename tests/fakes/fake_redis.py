@@ -0,0 +1,124 @@
+"""
+Servidor local que habla el subconjunto de Redis que usa `RedisQuoteBroker`
+(PING, AUTH, SELECT, GET, MGET, SET NX/PX, DEL, PEXPIRE, ZADD, ZREM,
+ZRANGEBYSCORE, ZREMRANGEBYSCORE, PUBLISH, SUBSCRIBE y UNSUBSCRIBE), para
+probar el broker sin un Redis real.
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.infrastructure.data_sources.broker.resp import RespError, encode_reply, read_reply
+
+
+class FakeRedis:
+    def __init__(self):
+        self._values: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self._sorted_sets: Dict[bytes, Dict[bytes, float]] = {}
+        self._channels: Dict[bytes, Set[asyncio.StreamWriter]] = {}
+
+    async def handler(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        subscriptions: Set[bytes] = set()
+        try:
+            while True:
+                command = await read_reply(reader)
+                if not isinstance(command, list) or not command:
+                    writer.write(encode_reply(RespError("ERR invalid command")))
+                    continue
+                name, args = command[0].upper(), command[1:]
+
+                if name in (b"SUBSCRIBE", b"UNSUBSCRIBE"):
+                    for channel in args:
+                        if name == b"SUBSCRIBE":
+                            subscriptions.add(channel)
+                            self._channels.setdefault(channel, set()).add(writer)
+                        else:
+                            subscriptions.discard(channel)
+                            self._channels.get(channel, set()).discard(writer)
+                        writer.write(encode_reply([name.lower(), channel, len(subscriptions)]))
+                else:
+                    writer.write(encode_reply(self._execute(name, args)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscriptions:
+                self._channels.get(channel, set()).discard(writer)
+            writer.close()
+
+    def _execute(self, name: bytes, args: List[bytes]):
+        if name == b"PING":
+            return "PONG"
+        if name in (b"AUTH", b"SELECT"):
+            return "OK"
+        if name == b"GET":
+            return self._get(args[0])
+        if name == b"MGET":
+            return [self._get(key) for key in args]
+        if name == b"SET":
+            return self._set(args)
+        if name == b"DEL":
+            return sum(
+                (self._values.pop(key, None) or self._sorted_sets.pop(key, None)) is not None
+                for key in args
+            )
+        if name == b"PEXPIRE":
+            if self._get(args[0]) is None:
+                return 0
+            self._values[args[0]] = (self._values[args[0]][0], time.monotonic() + int(args[1]) / 1000)
+            return 1
+        if name == b"ZADD":
+            members = self._sorted_sets.setdefault(args[0], {})
+            added = 0
+            for score, member in zip(args[1::2], args[2::2]):
+                added += member not in members
+                members[member] = float(score)
+            return added
+        if name == b"ZREM":
+            members = self._sorted_sets.get(args[0], {})
+            return sum(members.pop(member, None) is not None for member in args[1:])
+        if name in (b"ZRANGEBYSCORE", b"ZREMRANGEBYSCORE"):
+            members = self._sorted_sets.get(args[0], {})
+            low, high = float(args[1]), float(args[2])
+            matched = sorted(
+                (member for member, score in members.items() if low <= score <= high),
+                key=members.get
+            )
+            if name == b"ZRANGEBYSCORE":
+                return matched
+            for member in matched:
+                del members[member]
+            return len(matched)
+        if name == b"PUBLISH":
+            return self._publish(args[0], args[1])
+        return RespError(f"ERR unknown command '{name.decode()}'")
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        value = self._values.get(key)
+        if value is None:
+            return None
+        if value[1] is not None and value[1] <= time.monotonic():
+            del self._values[key]
+            return None
+        return value[0]
+
+    def _set(self, args: List[bytes]):
+        key, value, options = args[0], args[1], [arg.upper() for arg in args[2:]]
+        if b"NX" in options and self._get(key) is not None:
+            return None
+        expires_at = None
+        if b"PX" in options:
+            expires_at = time.monotonic() + int(options[options.index(b"PX") + 1]) / 1000
+        self._values[key] = (value, expires_at)
+        return "OK"
+
+    def _publish(self, channel: bytes, message: bytes) -> int:
+        subscribers = self._channels.get(channel, set())
+        for subscriber in subscribers:
+            subscriber.write(encode_reply([b"message", channel, message]))
+        return len(subscribers)
+
+
+async def serve_fake_redis(host: str = "127.0.0.1", port: int = 6390) -> asyncio.Server:
+    return await asyncio.start_server(FakeRedis().handler, host, port)
+
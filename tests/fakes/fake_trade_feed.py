@@ -0,0 +1,75 @@
+"""
+Servidor local que imita el feed de trades de Finnhub, para pruebas y
+benchmarks sin conexión.
+"""
+import asyncio
+import json
+import random
+import time
+from typing import Dict, Set
+
+from websockets.asyncio.server import Server, ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
+
+
+class FakeTradeFeed:
+    """
+    Genera trades con un random walk para cada símbolo suscrito por
+    cada conexión, `rate` trades por segundo y símbolo
+    """
+
+    def __init__(self, rate: float = 10.0, batch_size: int = 1):
+        self.rate = rate
+        self.batch_size = batch_size
+        self._prices: Dict[str, float] = {}
+
+    async def handler(self, connection: ServerConnection):
+        symbols: Set[str] = set()
+        producer = asyncio.create_task(self._produce(connection, symbols))
+        try:
+            async for raw in connection:
+                message = json.loads(raw)
+                symbol = message.get("symbol")
+                if message.get("type") == "subscribe" and symbol:
+                    symbols.add(symbol)
+                elif message.get("type") == "unsubscribe":
+                    symbols.discard(symbol)
+        except ConnectionClosed:
+            pass
+        finally:
+            producer.cancel()
+
+    async def _produce(self, connection: ServerConnection, symbols: Set[str]):
+        interval = self.batch_size / self.rate
+        while True:
+            await asyncio.sleep(interval)
+            if not symbols:
+                await connection.send(json.dumps({"type": "ping"}))
+                continue
+            data = [
+                self._trade(symbol)
+                for symbol in list(symbols)
+                for _ in range(self.batch_size)
+            ]
+            await connection.send(json.dumps({"type": "trade", "data": data}))
+
+    def _trade(self, symbol: str) -> dict:
+        price = self._prices.get(symbol, 100.0) * (1 + random.gauss(0, 0.0005))
+        self._prices[symbol] = price
+        return {
+            "s": symbol,
+            "p": round(price, 4),
+            "v": random.randint(1, 500),
+            "t": int(time.time() * 1000),
+        }
+
+
+async def serve_fake_trade_feed(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    rate: float = 10.0,
+    batch_size: int = 1
+) -> Server:
+    feed = FakeTradeFeed(rate=rate, batch_size=batch_size)
+    return await serve(feed.handler, host, port)
+
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from src.domain.entities.bar_matrix import BarMatrix
+from src.domain.entities.bar_series import BarSeries
+
+
+def series(timestamps, close) -> BarSeries:
+    return BarSeries.from_columns(timestamps, close, close, close, close, [1.0] * len(close))
+
+
+def test_align_forward_fills_on_the_union_of_timestamps():
+    matrix = BarMatrix.align({
+        "AAPL": series([1, 2, 4], [10.0, 11.0, 12.0]),
+        "MSFT": series([2, 3], [20.0, 21.0]),
+    })
+    assert matrix.timestamp.tolist() == [1, 2, 3, 4]
+    assert matrix.symbols == ["AAPL", "MSFT"]
+    np.testing.assert_array_equal(matrix.values, [
+        [10.0, np.nan],
+        [11.0, 20.0],
+        [11.0, 21.0],
+        [12.0, 21.0],
+    ])
+
+
+def test_missing_values_become_none_in_rows():
+    matrix = BarMatrix.align({"AAPL": series([1, 2], [10.0, 11.0]), "MSFT": series([2], [20.0])})
+    assert matrix.to_rows() == [[10.0, None], [11.0, 20.0]]
+
+
+def test_empty_series_keep_their_column():
+    matrix = BarMatrix.align({"AAPL": series([1], [10.0]), "EMPTY": BarSeries.empty()}, errors={"BAD": "not found"})
+    assert matrix.symbols == ["AAPL", "EMPTY"]
+    assert matrix.to_rows() == [[10.0, None]]
+    assert matrix.errors == {"BAD": "not found"}
+
+
+def test_align_other_columns():
+    volume = BarSeries.from_columns([1, 2], [1, 1], [1, 1], [1, 1], [1, 1], [5, 7])
+    assert BarMatrix.align({"AAPL": volume}, column="volume").values.ravel().tolist() == [5.0, 7.0]
+    with pytest.raises(ValueError):
+        BarMatrix.align({"AAPL": volume}, column="timestamp")
+
+
+def test_no_series_gives_an_empty_matrix():
+    matrix = BarMatrix.align({})
+    assert matrix.values.shape == (0, 0)
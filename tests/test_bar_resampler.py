@@ -0,0 +1,108 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+from src.domain.entities.bar_series import BarSeries
+from src.infrastructure.utils.bar_resampler import bucket_start, finer_timespans, resample
+
+NEW_YORK = ZoneInfo("America/New_York")
+MINUTE = 60_000
+HOUR = 60 * MINUTE
+
+
+def millis(value: datetime) -> int:
+    return int(value.timestamp() * 1000)
+
+
+def minute_bars(start: int, count: int, step: int = MINUTE) -> BarSeries:
+    close = np.arange(1, count + 1, dtype=np.float64)
+    return BarSeries.from_columns(
+        np.arange(count, dtype=np.int64) * step + start,
+        close - 0.5,
+        close + 1,
+        close - 1,
+        close,
+        np.full(count, 10.0)
+    )
+
+
+def test_intraday_buckets_aggregate_ohlcv():
+    series = minute_bars(0, 12)
+    five = resample(series, "minute", 5)
+    np.testing.assert_array_equal(five.timestamp, [0, 5 * MINUTE, 10 * MINUTE])
+    np.testing.assert_array_equal(five.open, [0.5, 5.5, 10.5])
+    np.testing.assert_array_equal(five.high, [6, 11, 13])
+    np.testing.assert_array_equal(five.low, [0, 5, 10])
+    np.testing.assert_array_equal(five.close, [5, 10, 12])
+    np.testing.assert_array_equal(five.volume, [50, 50, 20])
+
+
+def test_gaps_do_not_create_empty_buckets():
+    series = BarSeries.concat([minute_bars(0, 2), minute_bars(3 * HOUR, 2)])
+    hourly = resample(series, "hour")
+    np.testing.assert_array_equal(hourly.timestamp, [0, 3 * HOUR])
+
+
+def test_days_follow_the_exchange_calendar():
+    # 23:00 y 01:00 en Nueva York caen en días distintos aunque sean el mismo día UTC
+    late = millis(datetime(2024, 7, 2, 23, 0, tzinfo=NEW_YORK))
+    series = minute_bars(late, 3, step=HOUR)
+    daily = resample(series, "day", tz=NEW_YORK)
+    assert [datetime.fromtimestamp(ts / 1000, NEW_YORK) for ts in daily.timestamp.tolist()] == [
+        datetime(2024, 7, 2, tzinfo=NEW_YORK),
+        datetime(2024, 7, 3, tzinfo=NEW_YORK),
+    ]
+    np.testing.assert_array_equal(daily.volume, [10, 20])
+
+
+def test_day_buckets_keep_their_own_utc_offset_across_dst():
+    series = BarSeries.concat([
+        minute_bars(millis(datetime(2024, 3, 8, 12, tzinfo=NEW_YORK)), 1),
+        minute_bars(millis(datetime(2024, 3, 11, 12, tzinfo=NEW_YORK)), 1),
+    ])
+    daily = resample(series, "day", tz=NEW_YORK)
+    assert daily.timestamp.tolist() == [
+        millis(datetime(2024, 3, 8, tzinfo=NEW_YORK)),
+        millis(datetime(2024, 3, 11, tzinfo=NEW_YORK)),
+    ]
+
+
+def test_weeks_start_on_sunday_and_months_on_the_first():
+    # miércoles 3 y jueves 11 de julio de 2024
+    series = BarSeries.concat([
+        minute_bars(millis(datetime(2024, 7, 3, 12, tzinfo=timezone.utc)), 1),
+        minute_bars(millis(datetime(2024, 7, 11, 12, tzinfo=timezone.utc)), 1),
+    ])
+    weekly = resample(series, "week")
+    assert [datetime.fromtimestamp(ts / 1000, timezone.utc).date().isoformat() for ts in weekly.timestamp.tolist()] == [
+        "2024-06-30", "2024-07-07"
+    ]
+    monthly = resample(series, "month")
+    assert monthly.timestamp.tolist() == [millis(datetime(2024, 7, 1, tzinfo=timezone.utc))]
+
+
+def test_bucket_start_matches_resample():
+    timestamp = millis(datetime(2024, 7, 3, 14, 37, tzinfo=timezone.utc))
+    for timespan, multiplier in (("minute", 15), ("hour", 4), ("day", 1), ("week", 1), ("quarter", 1)):
+        resampled = resample(minute_bars(timestamp, 1), timespan, multiplier, NEW_YORK)
+        assert bucket_start(timestamp, timespan, multiplier, NEW_YORK) == resampled.timestamp[0]
+
+
+def test_finer_timespans_coarsest_first():
+    assert finer_timespans("week") == ["day", "hour", "minute"]
+    assert finer_timespans("minute") == []
+
+
+def test_unknown_timespan_is_rejected():
+    with pytest.raises(ValueError):
+        resample(minute_bars(0, 1), "fortnight")
+
+
+def test_series_round_trips_through_bars():
+    series = minute_bars(0, 5)
+    rebuilt = BarSeries.from_bars(series.to_bars())
+    for column in ("timestamp", "open", "high", "low", "close", "volume"):
+        np.testing.assert_array_equal(getattr(rebuilt, column), getattr(series, column))
+    assert series.slice(MINUTE, 3 * MINUTE).timestamp.tolist() == [MINUTE, 2 * MINUTE, 3 * MINUTE]
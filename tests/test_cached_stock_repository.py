@@ -0,0 +1,104 @@
+import asyncio
+import time
+from typing import AsyncIterator, List, Tuple
+
+import numpy as np
+import pytest
+
+from src.domain.entities.bar_series import BarSeries
+from src.infrastructure.data_sources.db.database import Database
+from src.infrastructure.data_sources.db.repositories.bar_db_repository import BarDBRepository
+from src.infrastructure.repositories.stock.cached_stock_repository import CachedStockRepository
+from src.infrastructure.utils.ttl_cache import TTLCache
+
+MINUTE = 60_000
+
+
+class FakeHistoricRepository:
+    """
+    Upstream de barras de minuto con un precio por timestamp que guarda
+    los rangos pedidos
+    """
+
+    def __init__(self, published_until: int = 2 ** 62):
+        self.published_until = published_until
+        self.calls: List[Tuple[int, int]] = []
+
+    async def stream_historic_series(
+        self,
+        symbol: str,
+        from_timestamp: int,
+        to_timestamp: int,
+        group_by: str,
+        adjusted: bool = True
+    ) -> AsyncIterator[BarSeries]:
+        self.calls.append((from_timestamp, to_timestamp))
+        first = -(-from_timestamp // MINUTE) * MINUTE
+        timestamps = list(range(first, min(to_timestamp, self.published_until) + 1, MINUTE))
+        prices = [timestamp / MINUTE for timestamp in timestamps]
+        yield BarSeries.from_columns(timestamps, prices, prices, prices, prices, [1.0] * len(timestamps))
+
+
+@pytest.fixture
+def bar_repository(tmp_path) -> BarDBRepository:
+    database = Database(f"sqlite:///{tmp_path / 'bars.db'}")
+    database.create_database()
+    return BarDBRepository(database.session)
+
+
+def collect(repository: CachedStockRepository, from_timestamp: int, to_timestamp: int) -> BarSeries:
+    async def scenario():
+        return BarSeries.concat([
+            page async for page in repository.stream_historic_series("aapl", from_timestamp, to_timestamp, "minute")
+        ])
+    return asyncio.run(scenario())
+
+
+def test_only_the_missing_part_of_a_range_goes_upstream(bar_repository):
+    upstream = FakeHistoricRepository()
+    repository = CachedStockRepository(upstream, TTLCache(ttl=5), bar_repository)
+
+    first = collect(repository, 0, 10 * MINUTE)
+    assert len(first) == 11
+    assert bar_repository.get_coverage("AAPL", "minute", True) == [(0, 10 * MINUTE)]
+
+    second = collect(repository, 5 * MINUTE, 20 * MINUTE)
+    assert upstream.calls == [(0, 10 * MINUTE), (10 * MINUTE + 1, 20 * MINUTE)]
+    np.testing.assert_array_equal(second.timestamp, np.arange(5, 21) * MINUTE)
+    np.testing.assert_array_equal(second.close, np.arange(5, 21, dtype=np.float64))
+    assert bar_repository.get_coverage("AAPL", "minute", True) == [(0, 20 * MINUTE)]
+
+
+def test_covered_range_is_read_from_the_database(bar_repository):
+    upstream = FakeHistoricRepository()
+    repository = CachedStockRepository(upstream, TTLCache(ttl=5), bar_repository)
+    repository.STORED_PAGE_SIZE = 4
+
+    collect(repository, 0, 10 * MINUTE)
+    stored = collect(repository, 2 * MINUTE, 9 * MINUTE)
+    assert len(upstream.calls) == 1
+    np.testing.assert_array_equal(stored.timestamp, np.arange(2, 10) * MINUTE)
+
+
+def test_coverage_holes_are_filled_in_between(bar_repository):
+    upstream = FakeHistoricRepository()
+    repository = CachedStockRepository(upstream, TTLCache(ttl=5), bar_repository)
+
+    collect(repository, 0, 5 * MINUTE)
+    collect(repository, 15 * MINUTE, 20 * MINUTE)
+    upstream.calls.clear()
+
+    series = collect(repository, 0, 20 * MINUTE)
+    assert upstream.calls == [(5 * MINUTE + 1, 15 * MINUTE - 1)]
+    np.testing.assert_array_equal(series.timestamp, np.arange(0, 21) * MINUTE)
+
+
+def test_recent_empty_tail_is_not_stored_as_covered(bar_repository):
+    now = int(time.time() * 1000) // MINUTE * MINUTE
+    start = now - 60 * MINUTE
+    # el upstream aún no publicó los últimos 30 minutos
+    upstream = FakeHistoricRepository(published_until=now - 30 * MINUTE)
+    repository = CachedStockRepository(upstream, TTLCache(ttl=5), bar_repository, publication_delay=3600)
+
+    collect(repository, start, now - 2 * MINUTE)
+    assert bar_repository.get_coverage("AAPL", "minute", True) == [(start, now - 30 * MINUTE)]
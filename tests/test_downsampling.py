@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from src.infrastructure.utils.downsampling import DownsampleMethod, downsample_indexes, lttb, min_max
+
+
+def reference_lttb(x, y, max_points):
+    """
+    LTTB de Steinarsson punto a punto, para comparar
+    """
+    n = len(x)
+    every = (n - 2) / (max_points - 2)
+    selected = [0]
+    a = 0
+    for bucket in range(max_points - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_start, next_end = end, min(int((bucket + 2) * every) + 1, n - 1)
+        if bucket == max_points - 3:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        else:
+            avg_x = sum(x[next_start:next_end]) / (next_end - next_start)
+            avg_y = sum(y[next_start:next_end]) / (next_end - next_start)
+        areas = [
+            abs((x[a] - avg_x) * (y[i] - y[a]) - (x[a] - x[i]) * (avg_y - y[a]))
+            for i in range(start, end)
+        ]
+        a = start + int(np.argmax(areas))
+        selected.append(a)
+    selected.append(n - 1)
+    return selected
+
+
+def signal(count: int, seed: int = 3):
+    generator = np.random.default_rng(seed)
+    timestamps = 1_700_000_000_000 + np.arange(count, dtype=np.int64) * 60_000
+    return timestamps, np.cumsum(generator.normal(0, 1, count))
+
+
+@pytest.mark.parametrize("count, max_points", [(1000, 100), (1001, 37), (250, 3)])
+def test_lttb_matches_the_reference(count, max_points):
+    timestamps, values = signal(count)
+    x = (timestamps - timestamps[0]).astype(np.float64).tolist()
+    assert lttb(timestamps, values, max_points).tolist() == reference_lttb(x, values.tolist(), max_points)
+
+
+def test_lttb_keeps_the_endpoints_and_the_budget():
+    timestamps, values = signal(5000)
+    indexes = lttb(timestamps, values, 200)
+    assert len(indexes) == 200
+    assert indexes[0] == 0 and indexes[-1] == 4999
+    assert (np.diff(indexes) > 0).all()
+
+
+def test_lttb_keeps_a_spike():
+    timestamps = np.arange(1000, dtype=np.int64)
+    values = np.zeros(1000)
+    values[537] = 50.0
+    assert 537 in lttb(timestamps, values, 20)
+
+
+def test_short_series_are_returned_whole():
+    timestamps, values = signal(10)
+    assert lttb(timestamps, values, 10).tolist() == list(range(10))
+    assert min_max(values, 50).tolist() == list(range(10))
+
+
+def test_min_max_keeps_every_bucket_extreme():
+    _, values = signal(1000)
+    indexes = min_max(values, 100)
+    assert len(indexes) <= 100
+    assert (np.diff(indexes) > 0).all()
+    assert values.argmin() in indexes and values.argmax() in indexes
+    for bucket in np.array_split(np.arange(1000), 50):
+        assert bucket[values[bucket].argmin()] in indexes
+        assert bucket[values[bucket].argmax()] in indexes
+
+
+def test_method_dispatch():
+    timestamps, values = signal(500)
+    assert downsample_indexes(timestamps, values, 50).tolist() == lttb(timestamps, values, 50).tolist()
+    assert downsample_indexes(timestamps, values, 50, DownsampleMethod.MIN_MAX).tolist() == min_max(values, 50).tolist()
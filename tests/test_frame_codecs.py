@@ -0,0 +1,130 @@
+import json
+from datetime import datetime, timezone
+from typing import Dict, Tuple
+
+import msgpack
+import pytest
+from fastapi import WebSocketException, status
+
+from src.domain.entities.stock_entities import StockQuote
+from src.infrastructure.data_sources.ws import frame_codecs
+from src.infrastructure.data_sources.ws.frame_codecs import (
+    _COUNT, _ENTRY, _HEADER, _SYMBOL, PRICE_SCALE, QUOTES_FRAME, BinaryFrameCodec, FrameCodec, MsgpackFrameCodec,
+    negotiate_frame_codec
+)
+
+
+def quote(price: float, millis: int) -> StockQuote:
+    return StockQuote(price=price, timestamp=datetime.fromtimestamp(millis / 1000, tz=timezone.utc))
+
+
+def frames():
+    return [
+        {"type": "quotes", "data": {"AAPL": quote(190.12, 1_700_000_000_000), "MSFT": quote(370.5, 1_700_000_000_000)}},
+        {"type": "quotes", "data": {"AAPL": quote(190.15, 1_700_000_001_000)}},
+        {"symbol": "MSFT", "data": quote(369.99, 1_700_000_002_500)},
+    ]
+
+
+class BinaryDecoder:
+    """
+    Lado cliente del layout de `BinaryFrameCodec`
+    """
+
+    def __init__(self):
+        self.symbols: Dict[int, str] = {}
+        self.last: Dict[str, Tuple[int, int]] = {}
+
+    def decode(self, data: bytes) -> Dict[str, Tuple[float, int]]:
+        kind, new_symbols = _HEADER.unpack_from(data)
+        assert kind == QUOTES_FRAME
+        offset = _HEADER.size
+        for _ in range(new_symbols):
+            symbol_id, length = _SYMBOL.unpack_from(data, offset)
+            offset += _SYMBOL.size
+            self.symbols[symbol_id] = data[offset:offset + length].decode()
+            offset += length
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        quotes = {}
+        for _ in range(count):
+            symbol_id, price, millis = _ENTRY.unpack_from(data, offset)
+            offset += _ENTRY.size
+            symbol = self.symbols[symbol_id]
+            last_price, last_millis = self.last.get(symbol, (0, 0))
+            self.last[symbol] = (last_price + price, last_millis + millis)
+            quotes[symbol] = (self.last[symbol][0] / PRICE_SCALE, self.last[symbol][1])
+        assert offset == len(data)
+        return quotes
+
+
+def test_json_codec_keeps_the_quote_schema():
+    encoded = json.loads(FrameCodec().encode(frames()[0]))
+    assert encoded["data"]["AAPL"]["price"] == 190.12
+
+
+def test_binary_codec_round_trip():
+    codec, decoder = BinaryFrameCodec(), BinaryDecoder()
+    decoded = [decoder.decode(codec.encode(frame)) for frame in frames()]
+    assert decoded == [
+        {"AAPL": (190.12, 1_700_000_000_000), "MSFT": (370.5, 1_700_000_000_000)},
+        {"AAPL": (190.15, 1_700_000_001_000)},
+        {"MSFT": (369.99, 1_700_000_002_500)},
+    ]
+
+
+def test_binary_codec_defines_each_symbol_once():
+    codec = BinaryFrameCodec()
+    first, second = (codec.encode(frame) for frame in frames()[:2])
+    assert _HEADER.unpack_from(first)[1] == 2
+    assert _HEADER.unpack_from(second)[1] == 0
+    assert len(second) == _HEADER.size + _COUNT.size + _ENTRY.size
+
+
+def test_msgpack_codec_sends_deltas():
+    codec = MsgpackFrameCodec()
+    decoded = [msgpack.unpackb(codec.encode(frame)) for frame in frames()]
+    assert decoded[0] == {"t": "q", "d": {"AAPL": [1_901_200, 1_700_000_000_000], "MSFT": [3_705_000, 1_700_000_000_000]}}
+    assert decoded[1] == {"t": "q", "d": {"AAPL": [300, 1000]}}
+    assert decoded[2] == {"t": "q", "d": {"MSFT": [-5_100, 2500]}}
+
+
+@pytest.mark.parametrize("codec_class", [BinaryFrameCodec, MsgpackFrameCodec])
+def test_control_frames_stay_json(codec_class):
+    frame = {"type": "error", "message": "unknown symbol"}
+    assert json.loads(codec_class().encode(frame)) == frame
+
+
+class FakeWebSocket:
+    def __init__(self, subprotocols=(), **query_params):
+        self.scope = {"subprotocols": list(subprotocols)}
+        self.query_params = query_params
+
+
+@pytest.mark.parametrize("websocket, codec_class, subprotocol", [
+    (FakeWebSocket(), FrameCodec, None),
+    (FakeWebSocket(["chat", "stocks.binary"]), BinaryFrameCodec, "stocks.binary"),
+    (FakeWebSocket(["stocks.avro", "stocks.msgpack"]), MsgpackFrameCodec, "stocks.msgpack"),
+    (FakeWebSocket(format="MSGPACK"), MsgpackFrameCodec, None),
+    (FakeWebSocket(["chat"]), FrameCodec, None),
+])
+def test_negotiates_the_requested_codec(websocket, codec_class, subprotocol):
+    codec, accepted = negotiate_frame_codec(websocket)
+    assert type(codec) is codec_class
+    assert accepted == subprotocol
+
+
+@pytest.mark.parametrize("websocket", [
+    FakeWebSocket(format="msgpak"),
+    FakeWebSocket(["stocks.avro"]),
+])
+def test_rejects_unknown_formats_instead_of_serving_json(websocket):
+    with pytest.raises(WebSocketException) as error:
+        negotiate_frame_codec(websocket)
+    assert error.value.code == status.WS_1003_UNSUPPORTED_DATA
+
+
+def test_rejects_msgpack_when_it_is_not_installed(monkeypatch):
+    monkeypatch.delitem(frame_codecs.FRAME_CODECS, "msgpack")
+    with pytest.raises(WebSocketException):
+        negotiate_frame_codec(FakeWebSocket(format="msgpack"))
@@ -0,0 +1,50 @@
+import asyncio
+import json
+from typing import AsyncIterator, List
+
+import numpy as np
+import pyarrow as pa
+
+from src.domain.entities.bar_series import BarSeries
+from src.web.stock.historic_formats import _arrow_chunks, _ndjson_chunks
+
+
+def pages() -> List[BarSeries]:
+    return [
+        BarSeries.from_columns([0, 60_000], [1, 2], [1, 2], [1, 2], [1.5, 2.5], [10, 20]),
+        BarSeries.from_columns([120_000], [3], [3], [3], [3.5], [30]),
+    ]
+
+
+async def iterate(items: List[BarSeries]) -> AsyncIterator[BarSeries]:
+    for item in items:
+        yield item
+
+
+def encode(encoder, items: List[BarSeries]) -> List[bytes]:
+    async def scenario():
+        return [chunk async for chunk in encoder(iterate(items))]
+    return asyncio.run(scenario())
+
+
+def test_ndjson_writes_one_quote_per_line():
+    chunks = encode(_ndjson_chunks, pages())
+    assert len(chunks) == 2
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line)["price"] for line in lines] == [1.5, 2.5, 3.5]
+
+
+def test_arrow_stream_round_trip():
+    chunks = encode(_arrow_chunks, pages())
+    # un chunk por página más el cierre del stream
+    assert len(chunks) == 3
+
+    table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+    assert table.schema.field("timestamp").type == pa.timestamp("ms", tz="UTC")
+    np.testing.assert_array_equal(table.column("timestamp").cast(pa.int64()).to_numpy(), [0, 60_000, 120_000])
+    np.testing.assert_array_equal(table.column("price").to_numpy(), [1.5, 2.5, 3.5])
+
+
+def test_arrow_stream_without_pages_is_a_valid_empty_stream():
+    table = pa.ipc.open_stream(b"".join(encode(_arrow_chunks, []))).read_all()
+    assert table.num_rows == 0
@@ -0,0 +1,150 @@
+import asyncio
+from typing import Callable, List
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.infrastructure.data_sources.http.circuit_breaker import CircuitState
+from src.infrastructure.data_sources.http.http_client import HTTPClient
+
+BASE_URL = "http://upstream.test"
+
+
+def make_client(handler: Callable, **kwargs) -> HTTPClient:
+    kwargs.setdefault("retry_backoff_base", 0.0)
+    client = HTTPClient(BASE_URL, **kwargs)
+    # el transporte stub sustituye a la red
+    client._client = httpx.AsyncClient(base_url=BASE_URL, transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_retries_idempotent_requests_on_5xx():
+    statuses = [503, 502, 200]
+    calls: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        status = statuses.pop(0)
+        return httpx.Response(status, json={"ok": status == 200})
+
+    client = make_client(handler, retries=2)
+    assert asyncio.run(client.get("/quote", coalesce=False)) == {"ok": True}
+    assert len(calls) == 3
+    assert client.retried == 2
+
+
+def test_gives_up_after_the_retry_budget():
+    calls: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(503)
+
+    client = make_client(handler, retries=1)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(client.get("/quote", coalesce=False))
+    assert error.value.status_code == 503
+    assert len(calls) == 2
+
+
+def test_does_not_retry_non_idempotent_requests():
+    calls: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(503)
+
+    client = make_client(handler, retries=3)
+    with pytest.raises(HTTPException):
+        asyncio.run(client.post("/orders", body={"qty": 1}))
+    assert calls == ["POST"]
+
+
+def test_retries_transport_errors():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json={"c": 1})
+
+    client = make_client(handler, retries=1)
+    assert asyncio.run(client.get("/quote", coalesce=False)) == {"c": 1}
+    assert len(attempts) == 2
+
+
+def test_circuit_opens_and_rejects_without_calling_upstream():
+    calls: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(500)
+
+    client = make_client(handler, retries=0, circuit_failure_threshold=2, circuit_recovery_timeout=60)
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await client.get("/quote", coalesce=False)
+        with pytest.raises(HTTPException) as error:
+            await client.get("/quote", coalesce=False)
+        return error.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 503
+    assert len(calls) == 2
+    assert client._circuit_breaker.state == CircuitState.OPEN
+    assert client._circuit_breaker.rejected == 1
+
+
+def test_half_open_probe_closes_the_circuit():
+    statuses = [500, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(statuses.pop(0), json={})
+
+    client = make_client(handler, retries=0, circuit_failure_threshold=1, circuit_recovery_timeout=0)
+
+    async def scenario():
+        with pytest.raises(HTTPException):
+            await client.get("/quote", coalesce=False)
+        assert client._circuit_breaker.state == CircuitState.HALF_OPEN
+        await client.get("/quote", coalesce=False)
+
+    asyncio.run(scenario())
+    assert client._circuit_breaker.state == CircuitState.CLOSED
+
+
+def test_hedged_request_wins_over_a_slow_one():
+    calls: List[int] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        # la primera petición se cuelga, la copia responde enseguida
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json={"call": len(calls)})
+
+    client = make_client(handler, hedge=True, hedge_percentile=0.5)
+    for _ in range(client._latency.min_samples):
+        client._latency.record(0.01)
+
+    result = asyncio.run(asyncio.wait_for(client.get("/quote", coalesce=False), timeout=2))
+    assert result == {"call": 2}
+    assert client.hedged == 1
+    assert client.hedge_wins == 1
+
+
+def test_no_hedge_without_latency_samples():
+    calls: List[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        return httpx.Response(200, json={})
+
+    client = make_client(handler, hedge=True)
+    asyncio.run(client.get("/quote", coalesce=False))
+    assert len(calls) == 1
+    assert client.hedged == 0
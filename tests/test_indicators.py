@@ -0,0 +1,125 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.domain.entities.bar_series import BarSeries
+from src.infrastructure.utils.indicators import (
+    INDICATOR_NAMES, IncrementalIndicators, IndicatorParams, bollinger, compute_indicators, ema, macd, rsi, sma, vwap
+)
+
+MINUTE = 60_000
+PARAMS = IndicatorParams(
+    sma_period=5, ema_period=4, rsi_period=3, macd_fast=3, macd_slow=6, macd_signal=3, bollinger_period=5
+)
+
+
+def random_walk(count: int, seed: int = 1) -> BarSeries:
+    generator = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(generator.normal(0, 0.01, count)))
+    volume = generator.integers(1, 1000, count).astype(np.float64)
+    # un tick por barra: high, low y close coinciden con el precio del tick
+    return BarSeries.from_columns(np.arange(count) * MINUTE, close, close, close, close, volume)
+
+
+def expected_row(series: BarSeries, index: int):
+    vectorized = compute_indicators(series.slice(0, index * MINUTE), PARAMS)
+    return {name: None if math.isnan(values[-1]) else float(values[-1]) for name, values in vectorized.items()}
+
+
+def assert_same(actual, expected):
+    for name in INDICATOR_NAMES:
+        if expected[name] is None:
+            assert actual[name] is None, name
+        else:
+            assert actual[name] == pytest.approx(expected[name], rel=1e-9), name
+
+
+def test_known_values():
+    values = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    np.testing.assert_allclose(sma(values, 3), [np.nan, np.nan, 2, 3, 4])
+    np.testing.assert_allclose(ema(values, 3), [np.nan, np.nan, 2, 3, 4])
+    np.testing.assert_allclose(ema(np.array([2.0, 4.0, 6.0, 2.0]), 2), [np.nan, 3, 5, 3])
+    np.testing.assert_allclose(rsi(values, 3), [np.nan, np.nan, np.nan, 100, 100])
+    np.testing.assert_allclose(rsi(np.array([1.0, 2.0, 1.0, 2.0]), 2), [np.nan, np.nan, 50, 75])
+
+    middle, upper, lower = bollinger(values, 3, 2.0)
+    deviation = math.sqrt(2 / 3)
+    np.testing.assert_allclose(middle, [np.nan, np.nan, 2, 3, 4])
+    np.testing.assert_allclose(upper - middle, [np.nan, np.nan] + [2 * deviation] * 3)
+    np.testing.assert_allclose(middle - lower, [np.nan, np.nan] + [2 * deviation] * 3)
+
+    np.testing.assert_allclose(
+        vwap(np.array([3.0, 6.0]), np.array([1.0, 2.0]), np.array([2.0, 4.0]), np.array([1.0, 3.0])),
+        [2, 3.5]
+    )
+    np.testing.assert_allclose(vwap(np.zeros(2), np.zeros(2), np.zeros(2), np.zeros(2)), [np.nan, np.nan])
+
+
+def test_macd_is_the_difference_of_emas():
+    close = random_walk(40).close
+    line, signal, histogram = macd(close, 3, 6, 3)
+    np.testing.assert_allclose(line, ema(close, 3) - ema(close, 6))
+    np.testing.assert_allclose(signal, ema(line, 3))
+    np.testing.assert_allclose(histogram, line - signal)
+    assert np.isnan(signal[:7]).all() and not np.isnan(signal[7:]).any()
+
+
+def test_long_ema_stays_finite():
+    values = random_walk(5000).close
+    out = ema(values, 2)
+    assert np.isfinite(out[1:]).all()
+    assert out[-1] == pytest.approx(values[-3:].mean(), rel=0.05)
+
+
+def test_warmup_is_the_first_bar_with_every_indicator():
+    series = random_walk(30)
+    indicators = compute_indicators(series, PARAMS)
+    first_complete = max(int(np.flatnonzero(~np.isnan(values))[0]) for values in indicators.values())
+    assert first_complete + 1 == PARAMS.warmup
+
+
+@pytest.mark.parametrize("seeded", [0, 1, 4, 12])
+def test_incremental_matches_vectorized_bar_by_bar(seeded):
+    series = random_walk(40)
+    tracker = IncrementalIndicators.from_series(series.slice(0, (seeded - 1) * MINUTE), PARAMS)
+
+    for index in range(seeded, len(series)):
+        actual = tracker.update(int(series.timestamp[index]), float(series.close[index]), float(series.volume[index]))
+        assert actual["timestamp"] == series.timestamp[index]
+        assert_same(actual, expected_row(series, index))
+
+
+def test_ticks_inside_a_bar_update_the_bar_in_progress():
+    series = random_walk(20)
+    tracker = IncrementalIndicators.from_series(series, PARAMS)
+    last = int(series.timestamp[-1])
+
+    # dos ticks más en la misma barra: el close es el último y el volumen se suma
+    tracker.update(last + 1000, 50.0, 10.0)
+    actual = tracker.update(last + 2000, float(series.close[-1]), 5.0)
+
+    volume = series.volume.copy()
+    volume[-1] += 15.0
+    high = series.high.copy()
+    low = series.low.copy()
+    low[-1] = 50.0
+    expected = compute_indicators(
+        BarSeries(series.timestamp, series.open, high, low, series.close, volume), PARAMS
+    )
+    for name in INDICATOR_NAMES:
+        assert actual[name] == pytest.approx(float(expected[name][-1]), rel=1e-9), name
+
+
+def test_stale_ticks_are_ignored():
+    series = random_walk(20)
+    tracker = IncrementalIndicators.from_series(series, PARAMS)
+    before = tracker.values()
+    assert tracker.update(int(series.timestamp[-2]), 1.0, 100.0) == before
+
+
+def test_invalid_params_are_rejected():
+    with pytest.raises(ValueError):
+        IndicatorParams(macd_fast=26, macd_slow=12)
+    with pytest.raises(ValueError):
+        IndicatorParams(sma_period=0)
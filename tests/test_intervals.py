@@ -0,0 +1,29 @@
+from src.infrastructure.utils.intervals import merge_intervals, split_interval, subtract_intervals
+
+
+def test_merge_joins_overlapping_and_adjacent_intervals():
+    assert merge_intervals([(5, 8), (0, 2), (3, 4), (10, 12)]) == [(0, 8), (10, 12)]
+
+
+def test_subtract_returns_the_gaps():
+    assert subtract_intervals((0, 100), [(10, 20), (15, 30), (90, 200)]) == [(0, 9), (31, 89)]
+    assert subtract_intervals((0, 10), []) == [(0, 10)]
+    assert subtract_intervals((0, 10), [(0, 10)]) == []
+
+
+def test_split_alternates_covered_and_missing_segments():
+    assert split_interval((0, 100), [(10, 20), (50, 60)]) == [
+        (0, 9, False),
+        (10, 20, True),
+        (21, 49, False),
+        (50, 60, True),
+        (61, 100, False),
+    ]
+
+
+def test_split_clips_coverage_to_the_interval():
+    assert split_interval((10, 20), [(0, 12), (18, 40)]) == [
+        (10, 12, True),
+        (13, 17, False),
+        (18, 20, True),
+    ]
@@ -0,0 +1,55 @@
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from src.infrastructure.utils.market_calendar import MarketCalendar, MarketSession
+
+NEW_YORK = ZoneInfo("America/New_York")
+INDEPENDENCE_DAY = date(2024, 7, 4)
+
+
+def at(day: int, hour: int, minute: int = 0, month: int = 7) -> datetime:
+    return datetime(2024, month, day, hour, minute, tzinfo=NEW_YORK)
+
+
+@pytest.fixture
+def calendar() -> MarketCalendar:
+    return MarketCalendar(holidays=[INDEPENDENCE_DAY])
+
+
+@pytest.mark.parametrize("now, session", [
+    (at(3, 3, 59), MarketSession.CLOSED),
+    (at(3, 4, 0), MarketSession.PRE_MARKET),
+    (at(3, 9, 29), MarketSession.PRE_MARKET),
+    (at(3, 9, 30), MarketSession.REGULAR),
+    (at(3, 15, 59), MarketSession.REGULAR),
+    (at(3, 16, 0), MarketSession.AFTER_HOURS),
+    (at(3, 20, 0), MarketSession.CLOSED),
+    (at(4, 11), MarketSession.CLOSED),
+    (at(6, 11), MarketSession.CLOSED),
+])
+def test_sessions(calendar, now, session):
+    assert calendar.session(now) is session
+
+
+def test_session_is_evaluated_in_exchange_time(calendar):
+    # 13:30 UTC en julio son las 9:30 en Nueva York
+    assert calendar.session(datetime.fromisoformat("2024-07-03T13:30:00+00:00")) is MarketSession.REGULAR
+    # en enero no hay horario de verano: 13:30 UTC son las 8:30
+    assert calendar.session(datetime.fromisoformat("2024-01-03T13:30:00+00:00")) is MarketSession.PRE_MARKET
+
+
+@pytest.mark.parametrize("now, next_open", [
+    (at(3, 2), at(3, 4)),
+    (at(3, 10), at(5, 4)),
+    (at(5, 21), at(8, 4)),
+    (at(6, 12), at(8, 4)),
+])
+def test_next_open_skips_weekends_and_holidays(calendar, now, next_open):
+    assert calendar.next_open(now) == next_open
+
+
+def test_holidays_from_settings():
+    calendar = MarketCalendar.from_settings("America/New_York", "2024-07-04, 2024-12-25,")
+    assert calendar.holidays == {INDEPENDENCE_DAY, date(2024, 12, 25)}
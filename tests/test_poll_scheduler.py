@@ -0,0 +1,61 @@
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from src.application.services.poll_scheduler import PollScheduler
+from src.infrastructure.utils.market_calendar import MarketCalendar
+
+NEW_YORK = ZoneInfo("America/New_York")
+REGULAR = datetime(2024, 7, 3, 11, 0, tzinfo=NEW_YORK)
+AFTER_HOURS = datetime(2024, 7, 3, 17, 0, tzinfo=NEW_YORK)
+
+
+def make_scheduler(**kwargs) -> PollScheduler:
+    kwargs.setdefault("base_interval", 30.0)
+    kwargs.setdefault("min_interval", 5.0)
+    kwargs.setdefault("max_interval", 120.0)
+    kwargs.setdefault("closed_interval", 900.0)
+    return PollScheduler(MarketCalendar(holidays=[date(2024, 7, 4)]), **kwargs)
+
+
+def test_regular_session_uses_the_base_interval():
+    assert make_scheduler().interval("AAPL", REGULAR) == 30.0
+
+
+def test_extended_hours_poll_less_often():
+    assert make_scheduler().interval("AAPL", AFTER_HOURS) == 60.0
+
+
+def test_more_subscribers_poll_more_often():
+    scheduler = make_scheduler()
+    scheduler.set_subscribers("AAPL", 10)
+    assert scheduler.interval("AAPL", REGULAR) == pytest.approx(15.0)
+    scheduler.set_subscribers("AAPL", 10 ** 6)
+    assert scheduler.interval("AAPL", REGULAR) == 5.0
+
+
+def test_volatility_shortens_and_calm_lengthens_the_interval():
+    volatile, calm = make_scheduler(), make_scheduler()
+    for price in (100.0, 101.0, 100.0, 101.0):
+        volatile.observe("AAPL", price)
+    for price in (100.0, 100.0, 100.0):
+        calm.observe("AAPL", price)
+    assert volatile.interval("AAPL", REGULAR) == 15.0
+    # sin movimiento no hay estimación: se queda en el intervalo base
+    assert calm.interval("AAPL", REGULAR) == 30.0
+
+    calm.observe("AAPL", 100.001)
+    assert calm.interval("AAPL", REGULAR) == 60.0
+
+
+def test_closed_market_uses_the_closed_interval():
+    saturday = datetime(2024, 7, 6, 12, 0, tzinfo=NEW_YORK)
+    assert make_scheduler().interval("AAPL", saturday) == 900.0
+
+
+@pytest.mark.parametrize("minutes_to_open", [5, 0.5])
+def test_closed_interval_stops_at_the_next_open(minutes_to_open):
+    pre_market_open = datetime(2024, 7, 5, 4, 0, tzinfo=NEW_YORK)
+    now = pre_market_open - timedelta(minutes=minutes_to_open)
+    assert make_scheduler().interval("AAPL", now) == pytest.approx(minutes_to_open * 60)
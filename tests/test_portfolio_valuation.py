@@ -0,0 +1,87 @@
+import random
+from typing import Dict, List
+
+import numpy as np
+import pytest
+
+from src.domain.entities.bar_matrix import BarMatrix
+from src.domain.entities.portfolio_entities import LedgerPosition, Transaction, TransactionType
+from src.infrastructure.utils.portfolio_valuation import apply_transactions, value_portfolio
+
+DAY = 86_400_000
+
+
+def transaction(symbol: str, type: TransactionType, day: int, quantity: float, price: float = 0.0, fee: float = 0.0):
+    return Transaction(symbol=symbol, type=type, timestamp=day * DAY, quantity=quantity, price=price, fee=fee)
+
+
+def random_ledger(seed: int, symbols: List[str], days: int) -> List[Transaction]:
+    generator = random.Random(seed)
+    kinds = [TransactionType.BUY] * 5 + [TransactionType.SELL] * 3 + [TransactionType.DIVIDEND, TransactionType.SPLIT]
+    transactions = []
+    for day in sorted(generator.randrange(days) for _ in range(60)):
+        kind = generator.choice(kinds)
+        quantity = generator.choice([2, 3]) if kind is TransactionType.SPLIT else generator.uniform(1, 50)
+        transactions.append(transaction(
+            generator.choice(symbols), kind, day, quantity,
+            price=generator.uniform(10, 200), fee=generator.uniform(0, 2)
+        ))
+    return transactions
+
+
+def test_average_cost_split_and_oversell():
+    transactions = [
+        transaction("aapl", TransactionType.BUY, 0, 10, price=100, fee=1),
+        transaction("aapl", TransactionType.BUY, 1, 10, price=110, fee=1),
+        transaction("aapl", TransactionType.SPLIT, 2, 2),
+        transaction("aapl", TransactionType.SELL, 3, 10, price=60, fee=1),
+        transaction("aapl", TransactionType.DIVIDEND, 4, 30, price=0.5),
+        transaction("aapl", TransactionType.SELL, 5, 100, price=50),
+    ]
+    positions: Dict[str, LedgerPosition] = {}
+    apply_transactions(positions, transactions[:4])
+    assert positions["AAPL"].quantity == pytest.approx(30)
+    assert positions["AAPL"].cost_basis == pytest.approx(2102 * 30 / 40)
+    assert positions["AAPL"].realized_pnl == pytest.approx(599 - 2102 / 4)
+
+    # vender de más solo cierra la posición y cobra las 30 acciones vendidas
+    apply_transactions(positions, transactions[4:])
+    assert positions["AAPL"].quantity == 0
+    assert positions["AAPL"].cost_basis == 0
+    assert positions["AAPL"].realized_pnl == pytest.approx(599 + 15 + 1500 - 2102)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ledger_replay_matches_the_vectorized_valuation(seed):
+    symbols = ["AAPL", "MSFT", "NVDA"]
+    transactions = random_ledger(seed, symbols, days=30)
+    prices = BarMatrix(
+        timestamp=np.arange(31, dtype=np.int64) * DAY,
+        symbols=symbols,
+        values=np.random.default_rng(seed).uniform(50, 150, size=(31, len(symbols)))
+    )
+
+    valuation = value_portfolio(transactions, prices)
+    positions: Dict[str, LedgerPosition] = {}
+    apply_transactions(positions, transactions)
+
+    for position in valuation.positions:
+        replayed = positions.get(position.symbol, LedgerPosition(symbol=position.symbol))
+        assert position.quantity == pytest.approx(replayed.quantity, abs=1e-6)
+        assert position.cost_basis == pytest.approx(replayed.cost_basis, abs=1e-6)
+        assert position.realized_pnl == pytest.approx(replayed.realized_pnl, abs=1e-6)
+
+
+def test_replay_from_a_snapshot_equals_a_full_replay():
+    transactions = random_ledger(7, ["AAPL", "MSFT"], days=30)
+    full: Dict[str, LedgerPosition] = {}
+    apply_transactions(full, transactions)
+
+    snapshot: Dict[str, LedgerPosition] = {}
+    apply_transactions(snapshot, transactions[:25])
+    resumed = {symbol: position.model_copy() for symbol, position in snapshot.items()}
+    apply_transactions(resumed, transactions[25:])
+
+    assert resumed.keys() == full.keys()
+    for symbol, position in full.items():
+        assert resumed[symbol].model_dump() == pytest.approx(position.model_dump())
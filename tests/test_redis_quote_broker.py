@@ -0,0 +1,159 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, List
+
+import pytest
+
+from src.domain.entities.stock_entities import StockQuote
+from src.infrastructure.data_sources.broker.redis_quote_broker import RedisQuoteBroker
+from src.infrastructure.data_sources.broker.resp import RespError, encode_command, encode_reply, read_reply
+from tests.fakes.fake_redis import FakeRedis
+
+
+def parse(data: bytes):
+    async def scenario():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await read_reply(reader)
+    return asyncio.run(scenario())
+
+
+@asynccontextmanager
+async def fake_redis() -> AsyncIterator[str]:
+    server = await asyncio.start_server(FakeRedis().handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        yield f"redis://127.0.0.1:{port}/0"
+    finally:
+        server.close()
+
+
+def test_encode_command_as_bulk_strings():
+    assert encode_command("SET", b"k", 10) == b"*3\r\n$3\r\nSET\r\n$1\r\nk\r\n$2\r\n10\r\n"
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("OK", "OK"),
+    (42, 42),
+    (b"bulk", b"bulk"),
+    (None, None),
+    ([b"message", b"quotes:AAPL", [1, None]], [b"message", b"quotes:AAPL", [1, None]]),
+])
+def test_reply_round_trip(value, expected):
+    assert parse(encode_reply(value)) == expected
+
+
+def test_error_replies_are_returned_not_raised():
+    reply = parse(b"-ERR wrong type\r\n")
+    assert isinstance(reply, RespError)
+    assert str(reply) == "ERR wrong type"
+
+
+def test_bulk_strings_may_contain_crlf():
+    assert parse(b"$4\r\na\r\nb\r\n") == b"a\r\nb"
+
+
+def test_closed_connection_raises():
+    with pytest.raises(ConnectionError):
+        parse(b"")
+
+
+def test_only_one_node_holds_the_producer_lease():
+    async def scenario():
+        async with fake_redis() as url:
+            first = RedisQuoteBroker(url, node_id="a")
+            second = RedisQuoteBroker(url, node_id="b")
+            assert await first.acquire_producer("AAPL", lease=5)
+            assert not await second.acquire_producer("AAPL", lease=5)
+            # el dueño renueva su propio lease
+            assert await first.acquire_producer("AAPL", lease=5)
+
+            await first.release_producer("AAPL")
+            assert await second.acquire_producer("AAPL", lease=5)
+            await first.stop()
+            await second.stop()
+
+    asyncio.run(scenario())
+
+
+def test_expired_lease_moves_to_another_node():
+    async def scenario():
+        async with fake_redis() as url:
+            first = RedisQuoteBroker(url, node_id="a")
+            second = RedisQuoteBroker(url, node_id="b")
+            assert await first.acquire_producer("AAPL", lease=0.05)
+            await asyncio.sleep(0.1)
+            assert await second.acquire_producer("AAPL", lease=5)
+            # el nodo viejo no borra un lease que ya no es suyo
+            await first.release_producer("AAPL")
+            assert await second._command("GET", second._lease_key("AAPL")) == b"b"
+            await first.stop()
+            await second.stop()
+
+    asyncio.run(scenario())
+
+
+def test_unreachable_redis_produces_locally():
+    async def scenario():
+        async with fake_redis() as url:
+            pass
+        # el servidor ya está cerrado
+        broker = RedisQuoteBroker(url, node_id="a")
+        return await broker.acquire_producer("AAPL", lease=5)
+
+    assert asyncio.run(scenario())
+
+
+def test_cancelled_command_does_not_leak_its_reply():
+    async def scenario():
+        async with fake_redis() as url:
+            broker = RedisQuoteBroker(url, node_id="a")
+            await broker._command("SET", "first", "1")
+            broker._close_command_connection()
+
+            pending = asyncio.create_task(broker._command("GET", "first"))
+            while broker._command_connection is None:
+                await asyncio.sleep(0)
+            # la orden ya se escribió y su respuesta está en vuelo
+            pending.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await pending
+
+            await broker._command("SET", "second", "2")
+            value = await broker._command("GET", "second")
+            await broker.stop()
+            return value
+
+    assert asyncio.run(scenario()) == b"2"
+
+
+def test_quotes_are_delivered_across_nodes():
+    async def scenario():
+        async with fake_redis() as url:
+            producer = RedisQuoteBroker(url, node_id="a")
+            consumer = RedisQuoteBroker(url, node_id="b")
+            received: List[StockQuote] = []
+            delivered = asyncio.Event()
+
+            async def handler(symbol: str, quote: StockQuote):
+                received.append(quote)
+                delivered.set()
+
+            # la suscripción previa a la conexión se envía al conectar
+            await consumer.subscribe("AAPL", handler)
+            await consumer.start()
+            # un mensaje inválido se descarta, solo sirve para esperar al SUBSCRIBE
+            while not await producer._command("PUBLISH", consumer._channel("AAPL"), "{}"):
+                await asyncio.sleep(0.01)
+
+            await producer.publish("AAPL", StockQuote(price=123.45, timestamp=datetime(2024, 1, 2, 15, 30)))
+            await asyncio.wait_for(delivered.wait(), timeout=2)
+            await producer.stop()
+            await consumer.stop()
+            return received
+
+    received = asyncio.run(scenario())
+    assert [quote.price for quote in received] == [123.45]
+    assert received[0].timestamp == datetime(2024, 1, 2, 15, 30)
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from src.application.services.stock_price_hub import StockPriceHub
+from src.infrastructure.data_sources.broker.in_process_quote_broker import InProcessQuoteBroker
+
+
+class FixedIntervalScheduler:
+    def __init__(self, interval: float):
+        self.seconds = interval
+
+    def set_handler(self, handler):
+        pass
+
+    def interval(self, symbol: str) -> float:
+        return self.seconds
+
+
+class RecordingBroker(InProcessQuoteBroker):
+    def __init__(self):
+        super().__init__()
+        self.leases = []
+
+    async def acquire_producer(self, symbol: str, lease: float) -> bool:
+        self.leases.append(lease)
+        return await super().acquire_producer(symbol, lease)
+
+
+def lease_for(interval: float, **kwargs) -> float:
+    broker = RecordingBroker()
+    hub = StockPriceHub(None, quote_broker=broker, poll_scheduler=FixedIntervalScheduler(interval), **kwargs)
+    assert asyncio.run(hub._is_producer("AAPL"))
+    return broker.leases[-1]
+
+
+@pytest.mark.parametrize("interval, lease", [
+    (30.0, 90.0),
+    # a un milisegundo de la apertura
+    (0.001, 15.0),
+    # mercado cerrado
+    (900.0, 120.0),
+])
+def test_derived_lease_is_clamped(interval, lease):
+    assert lease_for(interval) == lease
+
+
+def test_clamp_is_configurable():
+    assert lease_for(0.001, producer_lease_min=5.0) == 5.0
+    assert lease_for(900.0, producer_lease_max=600.0) == 600.0
+
+
+def test_fixed_lease_wins_over_the_interval():
+    assert lease_for(0.001, producer_lease=45.0) == 45.0
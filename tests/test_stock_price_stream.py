@@ -0,0 +1,139 @@
+import asyncio
+from datetime import datetime, timezone
+
+import numpy as np
+
+from src.application.services.stock_price_stream import StockPriceStream
+from src.domain.entities.bar_series import BarSeries
+from src.domain.entities.stock_entities import StockQuote
+from src.infrastructure.utils.indicators import IncrementalIndicators, IndicatorParams
+
+MINUTE = 60_000
+
+
+class FakeHub:
+    def __init__(self):
+        self.subscribers = {}
+
+    async def subscribe(self, symbol, subscriber):
+        self.subscribers[symbol] = subscriber
+
+    async def unsubscribe(self, symbol, subscriber):
+        self.subscribers.pop(symbol, None)
+
+
+class FakeSender:
+    def __init__(self):
+        self.frames = []
+
+    def offer(self, frame, key=None):
+        self.frames.append(frame)
+
+    async def drained(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+def seeded_tracker() -> IncrementalIndicators:
+    close = np.linspace(100.0, 110.0, 60)
+    series = BarSeries.from_columns(np.arange(60) * MINUTE, close, close, close, close, np.full(60, 10.0))
+    return IncrementalIndicators.from_series(series, IndicatorParams())
+
+
+def quote(price: float, millis: int) -> StockQuote:
+    return StockQuote(price=price, timestamp=datetime.fromtimestamp(millis / 1000, tz=timezone.utc))
+
+
+def indicator_frames(sender: FakeSender):
+    return [frame["data"] for frame in sender.frames if frame.get("type") == "indicators"]
+
+
+def test_seeding_does_not_block_subscribe():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def loader(symbol):
+            await release.wait()
+            return seeded_tracker()
+
+        sender = FakeSender()
+        stream = StockPriceStream(sender, FakeHub(), batch_interval=0, indicator_loader=loader)
+        assert await asyncio.wait_for(stream.subscribe(["aapl"], indicators=True), 1) == []
+        assert stream.indicator_symbols == ["AAPL"]
+        await asyncio.sleep(0.01)
+        assert indicator_frames(sender) == []
+
+        release.set()
+        await asyncio.sleep(0.01)
+        frames = indicator_frames(sender)
+        await stream.close()
+        return frames
+
+    frames = asyncio.run(scenario())
+    assert len(frames) == 1
+    assert frames[0]["AAPL"]["sma"] is not None
+
+
+def test_live_frames_leave_out_vwap():
+    async def scenario():
+        async def loader(symbol):
+            return seeded_tracker()
+
+        sender = FakeSender()
+        hub = FakeHub()
+        stream = StockPriceStream(sender, hub, batch_interval=0, indicator_loader=loader)
+        await stream.subscribe(["AAPL"], indicators=True)
+        await asyncio.sleep(0.01)
+        await hub.subscribers["AAPL"]("AAPL", quote(111.0, 60 * MINUTE))
+        await asyncio.sleep(0.01)
+        frames = indicator_frames(sender)
+        await stream.close()
+        return frames
+
+    frames = asyncio.run(scenario())
+    assert len(frames) == 2
+    for frame in frames:
+        assert "vwap" not in frame["AAPL"]
+    assert frames[1]["AAPL"]["timestamp"] == 60 * MINUTE
+
+
+def test_unsubscribe_cancels_seeding():
+    async def scenario():
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def loader(symbol):
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        stream = StockPriceStream(FakeSender(), FakeHub(), batch_interval=0, indicator_loader=loader)
+        await stream.subscribe(["AAPL"], indicators=True)
+        await started.wait()
+        await stream.unsubscribe(["AAPL"])
+        await asyncio.sleep(0)
+        symbols = stream.indicator_symbols
+        await stream.close()
+        return cancelled.is_set(), symbols
+
+    assert asyncio.run(scenario()) == (True, [])
+
+
+def test_failed_seeding_drops_the_indicators_only():
+    async def scenario():
+        async def loader(symbol):
+            raise ConnectionError("upstream down")
+
+        stream = StockPriceStream(FakeSender(), FakeHub(), batch_interval=0, indicator_loader=loader)
+        await stream.subscribe(["AAPL"], indicators=True)
+        await asyncio.sleep(0.01)
+        result = stream.symbols, stream.indicator_symbols
+        await stream.close()
+        return result
+
+    assert asyncio.run(scenario()) == (["AAPL"], [])
@@ -0,0 +1,84 @@
+import asyncio
+import re
+from collections import Counter
+from typing import Set
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.infrastructure.data_sources.http.http_client import HTTPClient
+from src.infrastructure.repositories.stock.stock_repository import StockRepository
+
+BASE_URL = "http://historic.test"
+MINUTE = 60_000
+RANGE_PATH = re.compile(r"/range/\d+/minute/(\d+)/(\d+)$")
+
+
+class HistoricHandler:
+    """
+    Upstream de agregados con una barra por minuto que falla con 503 las
+    primeras `failures` veces que se pide cada tramo de `failing`
+    """
+
+    def __init__(self, failing: Set[int] = frozenset(), failures: int = 1):
+        self.failing = failing
+        self.failures = failures
+        self.calls: Counter = Counter()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        from_timestamp, to_timestamp = map(int, RANGE_PATH.search(request.url.path).groups())
+        self.calls[from_timestamp] += 1
+        if from_timestamp in self.failing and self.calls[from_timestamp] <= self.failures:
+            return httpx.Response(503)
+        first = -(-from_timestamp // MINUTE) * MINUTE
+        return httpx.Response(200, json={"results": [
+            {"t": timestamp, "o": 1, "h": 1, "l": 1, "c": timestamp / MINUTE, "v": 1}
+            for timestamp in range(first, to_timestamp + 1, MINUTE)
+        ]})
+
+
+def make_repository(handler: HistoricHandler, retries: int = 2) -> StockRepository:
+    client = HTTPClient(BASE_URL, retries=retries, retry_backoff_base=0.0)
+    client._client = httpx.AsyncClient(base_url=BASE_URL, transport=httpx.MockTransport(handler))
+    repository = StockRepository(None, client, historic_concurrency=2)
+    repository.HISTORIC_PAGE_LIMIT = 10
+    return repository
+
+
+def fetch(repository: StockRepository, from_timestamp: int, to_timestamp: int):
+    return asyncio.run(repository.get_historic_bars("AAPL", from_timestamp, to_timestamp, "minute"))
+
+
+def test_wide_ranges_are_split_in_page_sized_chunks():
+    repository = make_repository(HistoricHandler())
+    assert repository._split_range(0, 35 * MINUTE, "minute", 1) == [
+        (0, 10 * MINUTE - 1),
+        (10 * MINUTE, 20 * MINUTE - 1),
+        (20 * MINUTE, 30 * MINUTE - 1),
+        (30 * MINUTE, 35 * MINUTE),
+    ]
+    assert repository._split_range(0, 35 * MINUTE, "unknown", 1) == [(0, 35 * MINUTE)]
+
+
+def test_chunks_come_back_in_order():
+    handler = HistoricHandler()
+    bars = fetch(make_repository(handler), 0, 35 * MINUTE)
+    assert [bar.timestamp for bar in bars] == [minute * MINUTE for minute in range(36)]
+    assert sum(handler.calls.values()) == 4
+
+
+def test_a_failing_chunk_is_retried_only_by_the_client():
+    handler = HistoricHandler(failing={10 * MINUTE})
+    bars = fetch(make_repository(handler), 0, 35 * MINUTE)
+    assert len(bars) == 36
+    assert handler.calls[10 * MINUTE] == 2
+    assert sum(handler.calls.values()) == 5
+
+
+def test_a_chunk_failing_every_retry_fails_the_range():
+    handler = HistoricHandler(failing={20 * MINUTE}, failures=100)
+    with pytest.raises(HTTPException):
+        fetch(make_repository(handler, retries=2), 0, 35 * MINUTE)
+    # los reintentos del cliente no se multiplican por los del tramo
+    assert handler.calls[20 * MINUTE] == 3
@@ -0,0 +1,51 @@
+import asyncio
+
+import numpy as np
+
+from src.application.services.stock_service import INDICATOR_MAX_LOOKBACK_BARS, INDICATOR_MIN_LOOKBACK, StockService
+from src.domain.entities.bar_series import BarSeries
+from src.domain.entities.stock_entities import TIMESPAN_MILLISECONDS
+from src.infrastructure.utils.indicators import IndicatorParams
+
+HOUR = TIMESPAN_MILLISECONDS["hour"]
+NOW = 1_700_000_000_000 // HOUR * HOUR
+
+
+class RecentBarsRepository:
+    """
+    Símbolo recién listado: solo tiene las últimas `count` barras
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+        self.calls = []
+
+    async def get_historic_series(self, symbol, from_timestamp, to_timestamp, group_by, adjusted=True, multiplier=1):
+        self.calls.append((from_timestamp, to_timestamp))
+        timestamps = NOW - HOUR * np.arange(self.count, 0, -1)
+        timestamps = timestamps[(timestamps >= from_timestamp) & (timestamps <= to_timestamp)]
+        close = np.full(len(timestamps), 100.0)
+        return BarSeries.from_columns(timestamps, close, close, close, close, close)
+
+
+def test_warmup_probe_is_capped_by_bar_count():
+    params = IndicatorParams()
+    repository = RecentBarsRepository(3)
+    service = StockService(repository, None)
+    response = asyncio.run(service.get_indicators("AAPL", NOW - 2 * HOUR, NOW, "hour", params))
+
+    limit = max(params.warmup * HOUR * INDICATOR_MAX_LOOKBACK_BARS, INDICATOR_MIN_LOOKBACK)
+    assert min(start for start, _ in repository.calls) == NOW - 2 * HOUR - limit
+    assert len(repository.calls) <= 6
+    # sembrado con lo que hay: sin calentar, los indicadores quedan en None
+    assert response.timestamp == [NOW - 2 * HOUR, NOW - HOUR]
+    assert response.indicators["sma"] == [None, None]
+
+
+def test_warmup_probe_stops_once_enough_bars():
+    params = IndicatorParams()
+    repository = RecentBarsRepository(10_000)
+    service = StockService(repository, None)
+    asyncio.run(service.get_indicators("AAPL", NOW - 2 * HOUR, NOW, "hour", params))
+    # la primera ventana (5 días de barras horarias) ya cubre el calentamiento
+    assert len(repository.calls) == 2
@@ -0,0 +1,68 @@
+import asyncio
+from typing import List, Tuple
+
+from src.infrastructure.data_sources.ws.trade_feed_client import TradeFeedClient
+from tests.fakes.fake_trade_feed import serve_fake_trade_feed
+
+
+def test_receives_trades_of_subscribed_symbols():
+    async def scenario():
+        server = await serve_fake_trade_feed(port=0, rate=200)
+        port = server.sockets[0].getsockname()[1]
+        client = TradeFeedClient(f"ws://127.0.0.1:{port}")
+        trades: List[Tuple[str, float]] = []
+        received = asyncio.Event()
+
+        async def on_trade(symbol: str, price: float, volume: float, timestamp: int):
+            trades.append((symbol, price))
+            if len(trades) >= 5:
+                received.set()
+
+        client.set_trade_handler(on_trade)
+        # suscrito antes de conectar: se envía al abrir la conexión
+        await client.subscribe("AAPL")
+        await client.start()
+        try:
+            await asyncio.wait_for(received.wait(), timeout=5)
+        finally:
+            await client.stop()
+            server.close()
+        return client, trades
+
+    client, trades = asyncio.run(scenario())
+    assert {symbol for symbol, _ in trades} == {"AAPL"}
+    assert client.connects == 1
+    assert client.trades >= 5
+
+
+def test_reconnects_and_resubscribes():
+    async def scenario():
+        server = await serve_fake_trade_feed(port=0, rate=200)
+        port = server.sockets[0].getsockname()[1]
+        client = TradeFeedClient(f"ws://127.0.0.1:{port}", reconnect_backoff_base=0.01, reconnect_backoff_max=0.05)
+        symbols: List[str] = []
+        resumed = asyncio.Event()
+
+        async def on_trade(symbol: str, price: float, volume: float, timestamp: int):
+            symbols.append(symbol)
+            if client.connects > 1:
+                resumed.set()
+
+        client.set_trade_handler(on_trade)
+        await client.start()
+        await client.subscribe("MSFT")
+        try:
+            while not symbols:
+                await asyncio.sleep(0.01)
+            # corta las conexiones abiertas sin parar el servidor
+            for connection in list(server.connections):
+                await connection.close()
+            await asyncio.wait_for(resumed.wait(), timeout=5)
+        finally:
+            await client.stop()
+            server.close()
+        return client, symbols
+
+    client, symbols = asyncio.run(scenario())
+    assert client.connects >= 2
+    assert set(symbols) == {"MSFT"}
@@ -0,0 +1,117 @@
+import asyncio
+
+from src.domain.entities.stock_entities import StockQuote
+from src.infrastructure.utils.ttl_cache import TTLCache, estimate_size
+
+
+class Loader:
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return self.calls
+
+
+def expire(cache: TTLCache, key, seconds: float):
+    # envejece la entrada sin esperar en tiempo real
+    cache._entries[key].stored_at -= seconds
+
+
+def test_fresh_entries_are_served_from_cache():
+    cache = TTLCache(ttl=10)
+    loader = Loader()
+
+    async def scenario():
+        return [await cache.get_or_load("a", loader) for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [1, 1, 1]
+    assert loader.calls == 1
+    assert cache.hits == 2 and cache.misses == 1
+
+
+def test_stale_entry_is_served_while_it_refreshes():
+    cache = TTLCache(ttl=1, stale_ttl=10)
+    loader = Loader()
+
+    async def scenario():
+        await cache.get_or_load("a", loader)
+        expire(cache, "a", 2)
+        stale = await cache.get_or_load("a", loader)
+        await asyncio.gather(*cache._refresh_tasks)
+        return stale, await cache.get_or_load("a", loader)
+
+    assert asyncio.run(scenario()) == (1, 2)
+    assert cache.stale_serves == 1
+    assert loader.calls == 2
+
+
+def test_expired_beyond_stale_window_loads_inline():
+    cache = TTLCache(ttl=1, stale_ttl=1)
+    loader = Loader()
+
+    async def scenario():
+        await cache.get_or_load("a", loader)
+        expire(cache, "a", 5)
+        return await cache.get_or_load("a", loader)
+
+    assert asyncio.run(scenario()) == 2
+    assert cache.stale_serves == 0 and cache.misses == 2
+
+
+def test_failed_background_refresh_keeps_the_stale_value():
+    cache = TTLCache(ttl=1, stale_ttl=10)
+
+    async def scenario():
+        await cache.get_or_load("a", Loader())
+        expire(cache, "a", 2)
+        value = await cache.get_or_load("a", Loader(fail=True))
+        await asyncio.gather(*cache._refresh_tasks)
+        return value
+
+    assert asyncio.run(scenario()) == 1
+    assert cache.refresh_errors == 1
+    assert "a" in cache._entries
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache(ttl=10)
+    loader = Loader()
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_load("a", loader) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == [1] * 5
+    assert loader.calls == 1
+
+
+def test_refresh_bypasses_a_fresh_entry():
+    cache = TTLCache(ttl=10)
+    loader = Loader()
+
+    async def scenario():
+        await cache.get_or_load("a", loader)
+        return await cache.refresh("a", loader)
+
+    assert asyncio.run(scenario()) == 2
+    assert cache.get("a") == 2
+
+
+def test_evicts_least_recently_used_by_bytes():
+    cache = TTLCache(ttl=10, max_entries=0, max_bytes=10)
+    cache.set("a", b"12345")
+    cache.set("b", b"12345")
+    cache.get("a")
+    cache.set("c", b"12345")
+    assert cache.get("a") == b"12345"
+    assert cache.get("b") is None
+    assert cache.evictions == 1
+
+
+def test_models_are_sized_by_their_serialized_form():
+    quote = StockQuote(price=1.5, timestamp=0)
+    assert estimate_size(quote) == len(quote.model_dump_json())